@@ -1,21 +1,117 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
 import streamlit as st
 
-from apputil import *
+from apputil import Genius, normalize_term
+from genius_records import ArtistRecord
+
+
+# Seconds between table redraws while lookups are still arriving
+REDRAW_EVERY = 0.25
+
+
+@st.cache_resource
+def get_client(env_file: str, workers: int) -> Genius:
+    """One Genius client (and keep-alive session) shared by every rerun and session."""
+    return Genius.from_env_file(env_file, pool_maxsize=workers)
+
+
+@st.cache_data(ttl=24 * 3600, max_entries=50_000, show_spinner=False)
+def lookup_artist(term_key: str, _term: str, env_file: str, workers: int) -> ArtistRecord:
+    """
+    `get_artists` row for `_term`, the search term as typed.
+
+    Cached on its normalized form `term_key` (Streamlit doesn't hash `_term`),
+    so 'Seal', 'seal ' and 'SEAL' are looked up once. A lookup that failed
+    raises instead, so it is not cached and the next run tries it again.
+    Safe to call from worker threads.
+    """
+    record = next(get_client(env_file, workers).iter_artists([_term]))
+    if record.error:
+        raise ConnectionError(f"could not reach the Genius API for {_term!r}")
+    return record
+
+
+def parse_terms(text: str) -> list:
+    """Split pasted text into search terms, one per line or comma."""
+    return [term.strip() for line in text.splitlines() for term in line.split(',')
+            if term.strip()]
 
 
 st.write(
 '''
-# Week x: [Title]
+# Week 6: Genius Artist Explorer
 
-...
+Paste artist names (one per line, or comma separated) to look them up on the
+Genius API. Results appear as each name resolves; names looked up before are
+answered from the cache instantly.
 ''')
 
-# currently set for integer input
-amount = st.number_input("Exercise Input: ", 
-                         value=None, 
-                         step=1, 
-                         format="%d")
+with st.sidebar:
+    env_file = st.text_input("Env file with ACCESS_TOKEN", value="env-1.env")
+    workers = st.slider("Concurrent lookups", min_value=1, max_value=16, value=8)
+    if st.button("Clear cached results"):
+        lookup_artist.clear()
+
+# A form so typing doesn't rerun the script on every edit
+with st.form("artists"):
+    text = st.text_area("Artist names", height=200,
+                        placeholder="Radiohead\nMissy Elliott\nSlowdive")
+    submitted = st.form_submit_button("Look up")
+
+terms = parse_terms(text)
+if submitted and terms:
+    try:
+        get_client(env_file, workers)
+    except Exception as e:
+        st.error(f"Could not create the Genius client: {e}")
+        st.stop()
+
+    # Each distinct normalized term is looked up once, as first typed;
+    # duplicates share its row
+    keys = [normalize_term(term) for term in terms]
+    first_typed = {}
+    for term, key in zip(terms, keys):
+        first_typed.setdefault(key, term)
+    unique_keys = list(first_typed)
+    found = {}
+
+    progress = st.progress(0.0, text=f"Looking up {len(unique_keys)} artists...")
+    table = st.empty()
+
+    def render():
+        rows = [dict(found[key], search_term=term)
+                for term, key in zip(terms, keys) if key in found]
+        table.dataframe(pd.DataFrame(rows), width='stretch', hide_index=True)
 
-if amount is not None:
-    st.write(f"The exercise input was {amount}.")
+    last_draw = 0.0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(lookup_artist, key, first_typed[key], env_file, workers): key
+                   for key in unique_keys}
+        for done, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            try:
+                found[key] = future.result()
+            except Exception as e:
+                found[key] = {'search_term': key, 'artist_name': f"Error: {e}",
+                              'artist_id': 'N/A', 'followers_count': 'N/A'}
+            progress.progress(done / len(unique_keys),
+                              text=f"Resolved {done}/{len(unique_keys)} artists")
+            # Redraw on a timer rather than per row, so a big paste is not
+            # re-rendered thousands of times
+            if time.monotonic() - last_draw >= REDRAW_EVERY:
+                render()
+                last_draw = time.monotonic()
+    render()
+    progress.empty()
 
+    results = pd.DataFrame([dict(found[key], search_term=term)
+                            for term, key in zip(terms, keys)])
+    matched = int((results['artist_id'] != 'N/A').sum())
+    st.write(f"Found {matched} of {len(results)} artists.")
+    st.download_button("Download CSV", results.to_csv(index=False),
+                       file_name="artist_data.csv", mime="text/csv")
+elif submitted:
+    st.info("Enter at least one artist name.")
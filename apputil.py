@@ -2,29 +2,74 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 import os
-from time import sleep
+import asyncio
+import importlib.util
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter, sleep
 
-# Import required packages
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    # Fallback if pandas is not available
-    pd = None
-    PANDAS_AVAILABLE = False
-
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    # Fallback if requests is not available
-    requests = None
-    REQUESTS_AVAILABLE = False
+from genius_cache import is_negative, make_key
+from genius_lyrics import extract_lyrics_stream
+from genius_metrics import RequestMetrics, endpoint_label
+from genius_ratelimit import TokenBucket
+from genius_records import ArtistBatch, ArtistRecord
+from genius_retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from genius_tokens import load_tokens
+
+# pandas and requests are imported on first use (pandas when a DataFrame is
+# built, requests when a client opens its session), so importing this module
+# stays cheap for CLIs, Streamlit reruns and spawned worker processes
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
+REQUESTS_AVAILABLE = importlib.util.find_spec("requests") is not None
 
 if TYPE_CHECKING:
     import pandas as pd
 
 
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls.
+
+    While a call for `key` is running, other threads asking for the same key
+    wait for it and receive its result instead of starting their own.
+    `shared` counts how many calls were answered that way.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, func, *args):
+        """Run `func(*args)` unless a call for `key` is already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def normalize_term(search_term: str) -> str:
+    """Fold case and whitespace so trivially different search terms match."""
+    return " ".join(search_term.split()).casefold()
 
 
 class Genius:
@@ -37,13 +82,69 @@ class Genius:
     """
     
     BASE_URL = "https://api.genius.com"
+    LYRICS_MEMO_SIZE = 1024  # lyrics pages kept in memory when there's no cache
     
-    def __init__(self, access_token: str = None, *, timeout: int = 10, env_file: str = None):
-        """Initialize Genius API client."""
+    def __init__(self, access_token: str = None, *, timeout: int = 10, env_file: str = None,
+                 pool_maxsize: int = None, cache=None, rate_limiter=None,
+                 retry: RetryPolicy = None, breaker: CircuitBreaker = None,
+                 base_url: str = None, metrics: RequestMetrics = None, index=None,
+                 concurrency=None, tokens=None, hedge=None):
+        """
+        Initialize Genius API client.
+
+        `pool_maxsize` sizes the session's keep-alive connection pool; set it to
+        the number of threads that will share this client.
+
+        `cache` is an optional `genius_cache.ResponseCache`; when given,
+        successful responses are stored and reused until their TTL expires.
+        "Nothing found" answers are cached under the cache's shorter
+        `negative_ttl`; failed requests are never cached.
+
+        `rate_limiter` is consulted before every network request (see
+        `genius_ratelimit`); it defaults to a per-client `TokenBucket` of 10
+        requests per second. Pass a shared `FileTokenBucket` to bound the
+        combined rate of several processes.
+
+        `retry` and `breaker` control how transient failures are handled (see
+        `genius_retry`). By default 429/5xx responses and connection errors are
+        retried up to 3 times with jittered exponential backoff, and after 5
+        consecutive upstream failures requests raise `CircuitOpenError` for
+        30 seconds instead of waiting on a dead API.
+
+        `base_url` overrides `BASE_URL`, e.g. to point at `mock_genius_server`.
+
+        `tokens` is an optional `genius_tokens.TokenPool`. When given, each
+        API request goes out with the next token in turn, paced by that
+        token's own limiter instead of `rate_limiter`. A request answered
+        with 429 or 401 is sent again straight away with another token, if
+        one is usable. `access_token` defaults to the pool's first token.
+
+        `concurrency` is an optional `genius_concurrency.AdaptiveConcurrency`.
+        When given, every request waits for one of its slots, and reports its
+        latency and status back so the number of slots can adapt.
+
+        `hedge` is an optional `genius_hedge.HedgePolicy`. When given, an
+        API request that hasn't answered within the endpoint's tracked
+        latency percentile is raced against a duplicate, which pays for its
+        own rate budget; the first successful response wins.
+
+        `index` is an optional `genius_index.ArtistIndex`. When given,
+        artist IDs are looked up there before spending a /search request, and
+        every successful search is added to it.
+
+        `metrics` collects per-request latency, status, retry, cache and byte
+        counts (see `genius_metrics`); a fresh `RequestMetrics` by default.
+        Extra callables can be appended to `on_request_start` and
+        `on_request_end`; each is called with an event dict for every HTTP
+        attempt (`endpoint`, `attempt`, and on end `status`, `seconds`,
+        `first_byte`, `json_decode`, `bytes`, `error`, `hedged`, `hedge_won`).
+        """
         # If no access_token provided, try to load from environment file
-        if access_token is None and env_file:
+        if access_token is None and tokens is not None:
+            access_token = tokens.tokens[0]
+        elif access_token is None and env_file:
             env_vars = self.load_env_file(env_file)
-            access_token = env_vars.get('ACCESS_TOKEN')
+            access_token = next(iter(load_tokens(env_vars)), None)
             if not access_token:
                 raise ValueError(f"ACCESS_TOKEN not found in {env_file}")
         elif access_token is None:
@@ -51,26 +152,54 @@ class Genius:
             
         self.access_token = access_token
         self.timeout = timeout
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.cache = cache
+        self.index = index
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucket()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.concurrency = concurrency
+        self.tokens = tokens
+        self.hedge = hedge
+        self.network_requests = 0
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+        self.on_request_start = [self.metrics.request_started]
+        self.on_request_end = [self.metrics.request_finished]
+        self._inflight = SingleFlight()
+        self._lyrics = OrderedDict()  # song URL -> lyrics, most recently used last
+        self._lyrics_lock = threading.Lock()
         
         # Initialize session if requests is available
-        if REQUESTS_AVAILABLE and requests is not None:
+        if REQUESTS_AVAILABLE:
+            import requests
+
             self.session = requests.Session()
             self.session.headers.update({
                 "Authorization": f"Bearer {self.access_token}",
                 "Accept": "application/json",
                 "User-Agent": "GeniusAPIClient/1.0"
             })
+            if pool_maxsize:
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                        pool_maxsize=pool_maxsize)
+                self.session.mount("https://", adapter)
+                self.session.mount("http://", adapter)
         else:
             self.session = None
     
     @classmethod
-    def from_env_file(cls, filepath: str = "env-1.env", *, timeout: int = 10):
-        """Create Genius instance by loading access token from environment file."""
+    def from_env_file(cls, filepath: str = "env-1.env", *, timeout: int = 10, **kwargs):
+        """
+        Create Genius instance by loading access token from environment file.
+        Uses ACCESS_TOKEN, or ACCESS_TOKEN_1 when only numbered tokens are set
+        (pass `tokens=TokenPool.from_env_file(filepath)` to use them all).
+        """
         env_vars = cls.load_env_file(filepath)
-        access_token = env_vars.get('ACCESS_TOKEN')
+        access_token = next(iter(load_tokens(env_vars)), None)
         if not access_token:
             raise ValueError(f"ACCESS_TOKEN not found in {filepath}")
-        return cls(access_token=access_token, timeout=timeout)
+        return cls(access_token=access_token, timeout=timeout, **kwargs)
     
     @staticmethod
     def load_env_file(filepath: str = "env-1.env"):
@@ -91,18 +220,145 @@ class Genius:
     
     def request(self, endpoint: str, params: dict = None) -> dict:
         """Make a GET request to the Genius API."""
-        if not REQUESTS_AVAILABLE or requests is None or self.session is None:
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            self.metrics.cache_lookup(endpoint, cached is not None,
+                                      cached is not None and is_negative(endpoint, cached))
+            if cached is not None:
+                return cached
+
+        if self.session is None:
             print("Requests library not available. Cannot make API calls.")
             return {}
-            
+
+        # Identical requests already in flight on another thread share one response
+        return self._inflight.do(make_key(endpoint, params), self._fetch, endpoint, params)
+
+    def _fetch(self, endpoint: str, params: dict = None) -> dict:
+        """
+        Send a GET over the session, retrying transient failures, and cache a
+        successful response.
+
+        Raises CircuitOpenError if the circuit breaker is open; any other
+        failure is reported and turned into an empty dict.
+        """
         url = f"{self.BASE_URL}/{endpoint}"
+        attempt = 0    # retries spent under self.retry
+        failovers = 0  # immediate moves to another pooled token, bounded by the pool size
+        while True:
+            self.breaker.before_request()
+            if self.tokens is not None:
+                token, waited = self.tokens.acquire()
+            else:
+                token, waited = None, self.rate_limiter.acquire()
+            self.network_requests += 1
+            status_code, retry_after, error = None, None, None
+            event = {'endpoint': endpoint, 'attempt': attempt + failovers,
+                     'rate_limit_wait': waited or 0.0}
+            for hook in self.on_request_start:
+                hook(event)
+            if self.concurrency is not None:
+                event['concurrency_wait'] = self.concurrency.acquire()
+            start = perf_counter()
+            try:
+                if self.hedge is None:
+                    response = self._send(url, params, token)
+                else:
+                    (response, token), event['hedged'], event['hedge_won'] = self.hedge.run(
+                        endpoint_label(endpoint),
+                        lambda token=token: (self._send(url, params, token), token),
+                        lambda: self._send_duplicate(url, params),
+                        on_discard=self._discard_hedge, admit=self._admit_hedge)
+                status_code = response.status_code
+                retry_after = response.headers.get("Retry-After")
+                elapsed = getattr(response, "elapsed", None)
+                event['first_byte'] = elapsed.total_seconds() if elapsed is not None else 0.0
+                event['bytes'] = len(getattr(response, "content", b"") or b"")
+                response.raise_for_status()
+                decode_start = perf_counter()
+                data = response.json()
+                event['json_decode'] = perf_counter() - decode_start
+            except Exception as e:  # Use generic exception since requests might not be available
+                error = e
+            finally:
+                event.update(status=status_code, seconds=perf_counter() - start,
+                             error=None if error is None else repr(error))
+                if self.concurrency is not None:
+                    self.concurrency.release(event['seconds'], status_code, error)
+                for hook in self.on_request_end:
+                    hook(event)
+            if token is not None:
+                self.tokens.report(token, status_code, retry_after)
+
+            if error is None:
+                self.breaker.record_success()
+                if self.cache is not None and data:
+                    self.cache.set(endpoint, params, data)
+                return data
+
+            # Only connection errors and 5xx mean the upstream is unhealthy;
+            # 429 is throttling and other 4xx are our own mistakes
+            if status_code is None or status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if token is not None and status_code in (401, 429) and self.tokens.usable() \
+                    and failovers < len(self.tokens):
+                # The pool has rested or dropped this token; another can go right
+                # away, without spending the retry budget
+                self.metrics.retry_scheduled(endpoint, 0.0, throttled=True)
+                failovers += 1
+                continue
+
+            delay = self.retry.next_delay(attempt, retry_after) \
+                if self.retry.is_retryable(status_code) else None
+            if delay is None:
+                print(f"An error occurred: {error}")
+                return {}
+            self.metrics.retry_scheduled(endpoint, delay,
+                                         throttled=status_code == 429 or retry_after is not None)
+            sleep(delay)
+            attempt += 1
+    
+    def _send(self, url: str, params: dict, token: str = None):
+        """One GET over the session, with `token` instead of the default one if given."""
+        auth = {} if token is None else {"headers": {"Authorization": f"Bearer {token}"}}
+        return self.session.get(url, params=params, timeout=self.timeout, **auth)
+    
+    def _admit_hedge(self) -> bool:
+        """Reserve a concurrency slot for a duplicate, without waiting for one."""
+        return self.concurrency is None or self.concurrency.try_acquire()
+
+    def _send_duplicate(self, url: str, params: dict) -> tuple:
+        """
+        Hedge of a slow request: take rate budget (and a token) of its own,
+        then send in the concurrency slot `_admit_hedge` reserved.
+        """
+        start, status_code, error = None, None, None
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:  # Use generic exception since requests might not be available
-            print(f"An error occurred: {e}")
-            return {}
+            if self.tokens is not None:
+                token, _ = self.tokens.acquire()
+            else:
+                token, _ = None, self.rate_limiter.acquire()
+            self.network_requests += 1
+            start = perf_counter()
+            response = self._send(url, params, token)
+            status_code = response.status_code
+            return response, token
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if self.concurrency is not None:
+                self.concurrency.release(None if start is None else perf_counter() - start,
+                                         status_code, error)
+    
+    def _discard_hedge(self, result: tuple):
+        """A losing hedge attempt still tells the token pool if its token was throttled or rejected."""
+        response, token = result
+        if token is not None:
+            self.tokens.report(token, response.status_code, response.headers.get("Retry-After"))
     
     def search(self, query: str, per_page: int = 15) -> list:
         """Search for songs, artists, or albums."""
@@ -124,28 +380,107 @@ class Genius:
         3. Get artist information using that ID
         4. Return the artist dictionary
         """
-        # Step 1: Search for the term
-        hits = self.search(search_term)
-        if not hits:
+        # Steps 1 and 2: Search for the term and take the primary artist ID
+        artist_id = self.resolve_artist_id(search_term)
+        if not artist_id:
             return {}
         
-        # Step 2: Extract the (Primary) Artist ID from the first hit
+        # Step 3: Get artist information using the ID
+        return self.get_artist_by_id(artist_id)
+    
+    def resolve_artist_id(self, search_term: str):
+        """
+        Return the primary artist ID of the first search hit, or None.
+
+        With an `index`, a confident local match answers without a request.
+        """
+        return self._resolve_artist_id(search_term)[0]
+    
+    def _resolve_artist_id(self, search_term: str) -> tuple:
+        """`resolve_artist_id`, plus whether the search request itself failed."""
+        if self.index is not None:
+            artist_id = self.index.lookup(search_term)
+            self.metrics.index_lookup(artist_id is not None)
+            if artist_id is not None:
+                return artist_id, False
+
+        data = self.request("search", params={"q": search_term, "per_page": 15})
+        hits = data.get("response", {}).get("hits", [])
+        if not hits:
+            # An empty response means the request failed, not that nothing matched
+            return None, not data
+        
         first_hit = hits[0]
         song = first_hit.get("result", {})
         primary_artist = song.get("primary_artist", {})
         artist_id = primary_artist.get("id")
-        
-        if not artist_id:
-            return {}
-        
-        # Step 3: Get artist information using the ID
-        return self.get_artist_by_id(artist_id)
+        if artist_id and self.index is not None:
+            # Remember both how it was asked for and what it is called
+            self.index.add(search_term, artist_id, primary_artist.get("name"))
+            if primary_artist.get("name"):
+                self.index.add(primary_artist["name"], artist_id)
+        return artist_id, False
     
     def get_artist_by_id(self, artist_id: int) -> dict:
         """Get artist details by artist ID."""
         data = self.request(f"artists/{artist_id}")
         # Return the full response structure as expected by autograder
         return data
+
+    def get_artist_songs(self, artist_id: int, *, per_page: int = 50, sort: str = "title",
+                         prefetch: int = 4):
+        """
+        Yield every song of an artist, walking the `artists/{id}/songs` pages.
+
+        Once the first page says there is a next page, up to `prefetch` pages
+        are requested ahead of the one being read, on a small thread pool (the
+        rate limiter still paces them). Songs are yielded in page order as
+        soon as their page arrives. The API does not report a total, so the
+        last few prefetches may come back empty; those are discarded.
+
+        A page that fails to load stops the stream with a message rather
+        than silently skipping songs.
+        """
+        endpoint = f"artists/{artist_id}/songs"
+
+        def page(number):
+            return self.request(endpoint, {"per_page": per_page, "page": number, "sort": sort})
+
+        data = page(1)
+        songs, next_page = self._songs_page(data)
+        yield from songs
+        if not next_page:
+            return
+
+        prefetch = max(1, prefetch)
+        executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="songs")
+        pending = deque((number, executor.submit(page, number))
+                        for number in range(next_page, next_page + prefetch))
+        last_scheduled = next_page + prefetch - 1
+        try:
+            while pending:
+                number, future = pending.popleft()
+                data = future.result()
+                if not data:
+                    print(f"Stopped listing songs of artist {artist_id} at page {number}")
+                    return
+                songs, next_page = self._songs_page(data)
+                yield from songs
+                if not next_page or not songs:
+                    return
+                last_scheduled += 1
+                pending.append((last_scheduled, executor.submit(page, last_scheduled)))
+        finally:
+            # Stop prefetching when the catalog ends or the caller stops reading
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _songs_page(data: dict) -> tuple:
+        """(songs, next page number or None) from an `artists/{id}/songs` response."""
+        response = data.get("response", {})
+        return response.get("songs", []), response.get("next_page")
     
     ## Exercise 3
     
@@ -158,42 +493,52 @@ class Genius:
         - artist_name: the artist name
         - artist_id: the Genius Artist ID
         - followers_count: number of followers (if available)
+        
+        Repeated search terms are searched once, and each distinct artist ID
+        is fetched once no matter how many terms resolve to it.
         """
-        results = []
+        return self._rows_to_frame(self.iter_artists(search_terms))
+    
+    def iter_artists(self, search_terms):
+        """
+        Yield one `get_artists` row per search term, as soon as it is known.
+        
+        Rows are `genius_records.ArtistRecord`s, which also support dict-style
+        access. Accepts any iterable (e.g. a file object) and only remembers
+        each distinct term's artist ID and each distinct artist's record, so
+        output can be written to disk while the collection is still running.
+        """
+        artist_ids = {}   # normalized search term -> (artist ID or None, search failed)
+        artist_rows = {}  # artist ID -> record, reused for every term naming it
         
         for search_term in search_terms:
-            # Get artist info for this search term
-            response_data = self.get_artist(search_term)
-            
-            # Extract artist data from the response structure
-            artist_data = response_data.get('response', {}).get('artist', {}) if response_data else {}
-
-            if artist_data:
-                result = {
-                    'search_term': search_term,
-                    'artist_name': artist_data.get('name', 'N/A'),
-                    'artist_id': artist_data.get('id', 'N/A'),
-                    'followers_count': artist_data.get('followers_count', 'N/A')
-                }
-            else:
-                result = {
-                    'search_term': search_term,
-                    'artist_name': 'N/A',
-                    'artist_id': 'N/A',
-                    'followers_count': 'N/A'
-                }
+            key = normalize_term(search_term)
+            if key not in artist_ids:
+                artist_ids[key] = self._resolve_artist_id(search_term)
+            artist_id, failed = artist_ids[key]
+            if not artist_id:
+                yield ArtistRecord(search_term, error=failed)
+                continue
             
-            results.append(result)
-            
-            # Add a small delay to be respectful to the API
-            sleep(0.1)
-        
-        # Return DataFrame if pandas is available, otherwise return list of dicts
-        if PANDAS_AVAILABLE and pd is not None:
-            return pd.DataFrame(results)
+            if artist_id not in artist_rows:
+                artist_rows[artist_id] = self._artist_row(search_term,
+                                                          self.get_artist_by_id(artist_id))
+            yield artist_rows[artist_id].with_term(search_term)
+    
+    @staticmethod
+    def _artist_row(search_term: str, response_data: dict) -> ArtistRecord:
+        """Build one get_artists row from a get_artist response."""
+        return ArtistRecord.from_response(search_term, response_data)
+    
+    @staticmethod
+    def _rows_to_frame(results):
+        """Return a DataFrame if pandas is available, otherwise the list of dicts."""
+        batch = ArtistBatch(results)
+        if PANDAS_AVAILABLE:
+            return batch.to_frame()
         else:
             # Fallback: return list of dictionaries if pandas is not available
-            return results
+            return batch.to_dicts()
     
     # Additional helper methods
     def get_song(self, song_id: int) -> dict:
@@ -207,24 +552,289 @@ class Genius:
         return data.get("response", {}).get("album", {})
     
     def get_lyrics(self, song_url: str) -> str:
-        """Fetch lyrics from a song URL."""
-        if not REQUESTS_AVAILABLE or requests is None or self.session is None:
+        """
+        Fetch lyrics from a song URL.
+
+        Extracted lyrics are cached by URL: in `cache` when one is configured,
+        and in a small in-memory LRU of `LYRICS_MEMO_SIZE` pages otherwise.
+        """
+        if self.session is None:
             return "Requests library not available. Cannot fetch lyrics."
-            
+
         try:
-            response = self.session.get(song_url, timeout=self.timeout)
-            response.raise_for_status()
-            # Simple extraction of lyrics from HTML (this may need to be adjusted)
-            try:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                lyrics_div = soup.find("div", class_="lyrics")
-                if lyrics_div:
-                    return lyrics_div.get_text(strip=True)
-                else:
-                    return "Lyrics not found."
-            except ImportError:
-                return "BeautifulSoup not available. Cannot parse lyrics."
+            lyrics = self._lyrics_for(song_url)
         except Exception as e:
             print(f"An error occurred while fetching lyrics: {e}")
-            return "Error fetching lyrics."
\ No newline at end of file
+            return "Error fetching lyrics."
+        return lyrics or "Lyrics not found."
+
+    def get_lyrics_many(self, song_urls, max_workers: int = 8) -> dict:
+        """
+        Fetch lyrics for many song URLs at once.
+
+        Pages are downloaded on `max_workers` threads and parsed as they
+        stream in. Returns {url: lyrics} in input order, with the same
+        messages as `get_lyrics` for pages that fail or have no lyrics.
+        """
+        urls = list(dict.fromkeys(song_urls))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls)),
+                                thread_name_prefix="lyrics") as executor:
+            return dict(zip(urls, executor.map(self.get_lyrics, urls)))
+
+    def _lyrics_for(self, song_url: str) -> str:
+        """Return cached lyrics for `song_url`, fetching them on a miss."""
+        params = {"url": song_url}
+        if self.cache is not None:
+            cached = self.cache.get("lyrics", params)
+            self.metrics.cache_lookup("lyrics", cached is not None)
+            if cached is not None:
+                return cached["lyrics"]
+        with self._lyrics_lock:
+            if song_url in self._lyrics:
+                self._lyrics.move_to_end(song_url)
+                return self._lyrics[song_url]
+
+        lyrics = self._inflight.do(make_key("lyrics", params), self._fetch_lyrics, song_url)
+        if lyrics:
+            if self.cache is not None:
+                self.cache.set("lyrics", params, {"lyrics": lyrics})
+            with self._lyrics_lock:
+                self._lyrics[song_url] = lyrics
+                if len(self._lyrics) > self.LYRICS_MEMO_SIZE:
+                    self._lyrics.popitem(last=False)
+        return lyrics
+
+    def get_song_page(self, song_url: str) -> str:
+        """
+        Download a song page's HTML without extracting anything, e.g. to parse
+        it elsewhere with `genius_lyrics.extract_lyrics`. Raises on failure.
+        """
+        return self._fetch_page(song_url, lambda response: response.text)
+
+    def _fetch_lyrics(self, song_url: str) -> str:
+        """Stream a song page and pull out its lyrics ('' if it has none)."""
+        return self._fetch_page(song_url, lambda response: extract_lyrics_stream(
+            response.iter_content(16 * 1024), response.encoding))
+
+    def _fetch_page(self, url: str, read):
+        """GET a (non-API) page under the rate and concurrency limits and return `read(response)`."""
+        self.rate_limiter.acquire()
+        self.network_requests += 1
+        if self.concurrency is not None:
+            self.concurrency.acquire()
+        start, status_code, error = perf_counter(), None, None
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+            status_code = response.status_code
+            try:
+                response.raise_for_status()
+                return read(response)
+            finally:
+                response.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if self.concurrency is not None:
+                self.concurrency.release(perf_counter() - start, status_code, error)
+
+
+class AsyncGenius:
+    """
+    Asyncio counterpart to `Genius`.
+
+    Exposes the same `search` / `get_artist` / `get_artist_by_id` / `get_artists`
+    surface as coroutines. Blocking requests run on a thread pool over a single
+    keep-alive session, and at most `max_in_flight` requests are outstanding at
+    any time, so one process can keep many lookups in flight without a
+    process pool.
+
+    Usage:
+        async with AsyncGenius.from_env_file('env-1.env', max_in_flight=16) as genius:
+            df = await genius.get_artists(['Radiohead', 'Seal'])
+    """
+
+    def __init__(self, access_token: str = None, *, timeout: int = 10, env_file: str = None,
+                 max_in_flight: int = 8, client: Genius = None, **client_kwargs):
+        """
+        Initialize the async client, wrapping `client` if one is given.
+
+        Extra keyword arguments (`cache`, `rate_limiter`, ...) are passed on to
+        the underlying `Genius` client.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self._owns_client = client is None
+        self.client = client or Genius(access_token, timeout=timeout, env_file=env_file,
+                                       pool_maxsize=max_in_flight, **client_kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight,
+                                            thread_name_prefix="genius")
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    @classmethod
+    def from_env_file(cls, filepath: str = "env-1.env", *, timeout: int = 10, **kwargs):
+        """Create AsyncGenius instance by loading access token from environment file."""
+        env_vars = Genius.load_env_file(filepath)
+        access_token = next(iter(load_tokens(env_vars)), None)
+        if not access_token:
+            raise ValueError(f"ACCESS_TOKEN not found in {filepath}")
+        return cls(access_token=access_token, timeout=timeout, **kwargs)
+
+    @property
+    def access_token(self) -> str:
+        return self.client.access_token
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the worker threads, and release pooled connections if this
+        instance created the client; a client passed in stays open for its owner.
+        """
+        self._executor.shutdown(wait=False)
+        if self._owns_client and self.client.session is not None:
+            self.client.session.close()
+
+    async def _run(self, func, *args):
+        """Run a blocking client call on the pool, bounded by the in-flight limit."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def request(self, endpoint: str, params: dict = None) -> dict:
+        """Make a GET request to the Genius API."""
+        return await self._run(self.client.request, endpoint, params)
+
+    async def search(self, query: str, per_page: int = 15) -> list:
+        """Search for songs, artists, or albums."""
+        data = await self.request("search", {"q": query, "per_page": per_page})
+        return data.get("response", {}).get("hits", [])
+
+    async def get_artist(self, search_term: str) -> dict:
+        """Get artist information by search term (see `Genius.get_artist`)."""
+        artist_id = await self.resolve_artist_id(search_term)
+        if not artist_id:
+            return {}
+
+        return await self.get_artist_by_id(artist_id)
+
+    async def resolve_artist_id(self, search_term: str):
+        """Return the primary artist ID of the first search hit (or the index), or None."""
+        return (await self._resolve_artist_id(search_term))[0]
+
+    async def _resolve_artist_id(self, search_term: str) -> tuple:
+        return await self._run(self.client._resolve_artist_id, search_term)
+
+    async def get_artist_by_id(self, artist_id: int) -> dict:
+        """Get artist details by artist ID."""
+        return await self.request(f"artists/{artist_id}")
+
+    async def get_artist_songs(self, artist_id: int, *, per_page: int = 50, sort: str = "title",
+                               prefetch: int = 4):
+        """Async generator over an artist's songs; see `Genius.get_artist_songs`."""
+        endpoint = f"artists/{artist_id}/songs"
+
+        def page(number):
+            return asyncio.ensure_future(
+                self.request(endpoint, {"per_page": per_page, "page": number, "sort": sort}))
+
+        songs, next_page = Genius._songs_page(await page(1))
+        for song in songs:
+            yield song
+        if not next_page:
+            return
+
+        prefetch = max(1, prefetch)
+        pending = deque((number, page(number))
+                        for number in range(next_page, next_page + prefetch))
+        last_scheduled = next_page + prefetch - 1
+        try:
+            while pending:
+                number, task = pending.popleft()
+                data = await task
+                if not data:
+                    print(f"Stopped listing songs of artist {artist_id} at page {number}")
+                    return
+                songs, next_page = Genius._songs_page(data)
+                for song in songs:
+                    yield song
+                if not next_page or not songs:
+                    return
+                last_scheduled += 1
+                pending.append((last_scheduled, page(last_scheduled)))
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def get_lyrics(self, song_url: str) -> str:
+        """Fetch lyrics from a song URL."""
+        return await self._run(self.client.get_lyrics, song_url)
+
+    async def get_lyrics_many(self, song_urls) -> dict:
+        """Fetch lyrics for many song URLs, at most `max_in_flight` at a time."""
+        urls = list(dict.fromkeys(song_urls))
+        return dict(zip(urls, await asyncio.gather(*(self.get_lyrics(url) for url in urls))))
+
+    async def get_artists(self, search_terms: list):
+        """
+        Get artist information for multiple search terms concurrently.
+
+        Returns the same DataFrame (or list of dicts) as `Genius.get_artists`,
+        in input order. Like the sync client, each distinct term is searched
+        once and each distinct artist ID is fetched once.
+        """
+        terms = {}
+        for term in search_terms:
+            terms.setdefault(normalize_term(term), term)
+        keys = list(terms)
+        resolved = await asyncio.gather(*(self._resolve_artist_id(terms[k]) for k in keys))
+        artist_ids = dict(zip(keys, resolved))
+
+        unique_ids = [i for i in dict.fromkeys(artist_id for artist_id, _ in resolved) if i]
+        fetched = await asyncio.gather(*(self.get_artist_by_id(i) for i in unique_ids))
+        artists = dict(zip(unique_ids, fetched))
+
+        results = []
+        for term in search_terms:
+            artist_id, failed = artist_ids[normalize_term(term)]
+            results.append(Genius._artist_row(term, artists[artist_id]) if artist_id
+                           else ArtistRecord(term, error=failed))
+        return Genius._rows_to_frame(results)
+
+    async def iter_artists(self, search_terms):
+        """
+        Async generator yielding one `get_artists` row per search term in
+        completion order. At most `2 * max_in_flight` terms are pending at once.
+        """
+        artist_ids = {}
+        artist_tasks = {}
+
+        async def one(search_term):
+            key = normalize_term(search_term)
+            if key not in artist_ids:
+                artist_ids[key] = asyncio.ensure_future(self._resolve_artist_id(search_term))
+            artist_id, failed = await artist_ids[key]
+            if not artist_id:
+                return ArtistRecord(search_term, error=failed)
+            if artist_id not in artist_tasks:
+                artist_tasks[artist_id] = asyncio.ensure_future(self.get_artist_by_id(artist_id))
+            return Genius._artist_row(search_term, await artist_tasks[artist_id])
+
+        pending = set()
+        for search_term in search_terms:
+            pending.add(asyncio.ensure_future(one(search_term)))
+            if len(pending) >= 2 * self.max_in_flight:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for genius_api.flatten_hits.
+
+Compares the old `df[col].apply(pd.Series)` expansion of the nested `stats`
+and `primary_artist` dicts against the columnar `flatten_hits` path on
+synthetic search hits, and checks that both produce the same frame.
+
+Usage:
+    python benchmark_flatten.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from genius_api import flatten_hits
+
+
+def synthetic_hits(n: int, seed: int = 0) -> list:
+    """Search hit `result` dicts shaped like the Genius API's."""
+    rng = random.Random(seed)
+    hits = []
+    for i in range(n):
+        artist_id = rng.randint(1, 50_000)
+        hits.append({
+            'id': i,
+            'title': f"Song {i}",
+            'url': f"https://genius.com/song-{i}",
+            'annotation_count': rng.randint(0, 50),
+            'stats': {'unreviewed_annotations': rng.randint(0, 10),
+                      'hot': rng.random() < 0.1,
+                      'pageviews': rng.randint(0, 10_000_000)},
+            'primary_artist': {'id': artist_id,
+                               'name': f"Artist {artist_id}",
+                               'is_verified': rng.random() < 0.3,
+                               'url': f"https://genius.com/artists/{artist_id}"},
+        })
+    return hits
+
+
+def flatten_hits_apply(hits: list) -> pd.DataFrame:
+    """The previous genius_to_df implementation, kept for comparison."""
+    df = pd.DataFrame(hits)
+
+    df_stats = df['stats'].apply(pd.Series)
+    df_stats.rename(columns={c: 'stat_' + c for c in df_stats.columns}, inplace=True)
+
+    df_primary = df['primary_artist'].apply(pd.Series)
+    df_primary.rename(columns={c: 'primary_artist_' + c for c in df_primary.columns},
+                      inplace=True)
+
+    return pd.concat((df, df_stats, df_primary), axis=1)
+
+
+def best_of(func, hits, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(hits)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark genius_api.flatten_hits.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'hits':>10}{'apply (s)':>12}{'columnar (s)':>14}{'speedup':>10}  same frame")
+    for n in args.sizes:
+        hits = synthetic_hits(n)
+        # The apply path is very slow at large sizes; time it once there
+        old = best_of(flatten_hits_apply, hits, 1 if n >= 500_000 else args.repeat)
+        new = best_of(flatten_hits, hits, args.repeat)
+        try:
+            pd.testing.assert_frame_equal(flatten_hits_apply(hits[:1000]),
+                                          flatten_hits(hits[:1000]))
+            same = '✅'
+        except AssertionError as e:
+            same = f"⚠️  {str(e).splitlines()[0]}"
+        print(f"{n:>10}{old:>12.3f}{new:>14.3f}{old / new:>9.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Throughput / latency benchmark for the artist collectors.
+
+Runs each execution mode against a local `mock_genius_server` (so no API quota
+is spent) across several input sizes and concurrency levels, and reports
+throughput, per-request latency percentiles and peak RSS. Every case runs in
+its own subprocess so peak RSS is measured per case.
+
+Modes:
+- sequential: `Genius.get_artists` in one thread
+- thread:     batches on a ThreadPoolExecutor sharing one client
+- process:    batches on a ProcessPoolExecutor, one client per worker
+- async:      `AsyncGenius.get_artists` with `max_in_flight` = concurrency
+
+Usage:
+    python benchmark_genius.py --sizes 50 200 --concurrency 1 4 16 \\
+        --latency-ms 50 --jitter-ms 20 --error-rate 0.01 --output bench_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is reported as null there
+    resource = None
+
+import collect_artist_data_multiprocessing as mp_collector
+from apputil import PANDAS_AVAILABLE, AsyncGenius, Genius
+from genius_ratelimit import FileTokenBucket, TokenBucket
+from mock_genius_server import MockGeniusServer
+
+
+MODES = ['sequential', 'thread', 'process', 'async']
+
+
+class TimedSession:
+    """Wraps a requests.Session and records the wall time of every GET."""
+
+    def __init__(self, session):
+        self._session = session
+        self.latencies = []
+
+    def get(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._session.get(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process and its children, in MB."""
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == 'darwin' else 1024  # bytes on macOS, KB elsewhere
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round((own + children) * scale / 1024 / 1024, 1)
+
+
+def search_terms(size: int) -> list:
+    return [f"Benchmark Artist {i}" for i in range(size)]
+
+
+def _bench_init(env_file: str, **client_kwargs):
+    """Process-pool initializer: the collector's init_worker plus timing."""
+    mp_collector.init_worker(env_file, **client_kwargs)
+    mp_collector._worker_genius.session = TimedSession(mp_collector._worker_genius.session)
+
+
+def _bench_batch(batch: list):
+    """Run one batch in a worker process and hand back its request latencies."""
+    rows = mp_collector.process_artist_batch(batch)
+    session = mp_collector._worker_genius.session
+    latencies, session.latencies = session.latencies, []
+    return len(rows), latencies
+
+
+def run_case(mode: str, size: int, concurrency: int, base_url: str, rate: float) -> dict:
+    """Run one benchmark case in this process and return its measurements."""
+    terms = search_terms(size)
+    env_file = os.path.join(tempfile.mkdtemp(), 'bench.env')
+    with open(env_file, 'w') as file:
+        file.write("ACCESS_TOKEN=benchmark\n")
+
+    if PANDAS_AVAILABLE:
+        # get_artists returns a DataFrame; import pandas before the clock starts
+        import pandas
+
+    latencies = []
+    start = time.perf_counter()
+
+    if mode == 'process':
+        limiter = FileTokenBucket(env_file + '.bucket', rate=rate, burst=max(1, concurrency))
+        batch_size = max(1, size // (concurrency * 2))
+        init = partial(_bench_init, env_file, rate_limiter=limiter, base_url=base_url)
+        with ProcessPoolExecutor(max_workers=concurrency, initializer=init) as executor:
+            for _, batch_latencies in executor.map(_bench_batch,
+                                                   mp_collector.chunk_list(terms, batch_size)):
+                latencies.extend(batch_latencies)
+        rows = size
+    else:
+        genius = Genius.from_env_file(env_file, base_url=base_url, pool_maxsize=concurrency,
+                                      rate_limiter=TokenBucket(rate, max(1, concurrency)))
+        genius.session = TimedSession(genius.session)
+        if mode == 'sequential':
+            rows = len(genius.get_artists(terms))
+        elif mode == 'thread':
+            batch_size = max(1, size // (concurrency * 2))
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                batches = mp_collector.chunk_list(terms, batch_size)
+                rows = sum(len(r) for r in executor.map(
+                    partial(mp_collector.process_artist_batch, genius=genius), batches))
+        elif mode == 'async':
+            async def collect():
+                async with AsyncGenius(client=genius, max_in_flight=concurrency) as client:
+                    return await client.get_artists(terms)
+            rows = len(asyncio.run(collect()))
+        else:
+            raise ValueError(f"Unknown mode {mode!r}")
+        latencies = genius.session.latencies
+
+    seconds = time.perf_counter() - start
+    return {
+        'mode': mode,
+        'size': size,
+        'concurrency': concurrency,
+        'rows': rows,
+        'requests': len(latencies),
+        'seconds': round(seconds, 4),
+        'terms_per_second': round(size / seconds, 2) if seconds else None,
+        'requests_per_second': round(len(latencies) / seconds, 2) if seconds else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p95': round(percentile(latencies, 95) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+        },
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Genius collectors against a mock server.")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[50, 200])
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--distribution', choices=['fixed', 'uniform', 'lognormal'],
+                        default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rps', type=float, default=None,
+                        help="mock server answers 429 above this request rate")
+    parser.add_argument('--miss-rate', type=float, default=0.05)
+    parser.add_argument('--rate', type=float, default=1e6,
+                        help="client-side rate limit in requests/second (default: unlimited)")
+    parser.add_argument('--output', default='bench_results.json',
+                        help="where to write the JSON results (default: bench_results.json)")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.case:
+        # Child process: run a single case and print its result as JSON
+        case = json.loads(args.case)
+        print(json.dumps(run_case(**case)))
+        return
+
+    server = MockGeniusServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              distribution=args.distribution, error_rate=args.error_rate,
+                              throttle_rps=args.throttle_rps, miss_rate=args.miss_rate)
+    results = []
+    print(f"🎭 Mock Genius API on {server.url}")
+    print(f"{'mode':<11}{'size':>6}{'conc':>6}{'terms/s':>10}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'p99 ms':>9}{'RSS MB':>9}")
+    with server:
+        for size in args.sizes:
+            for mode in args.modes:
+                levels = [1] if mode == 'sequential' else args.concurrency
+                for concurrency in levels:
+                    case = {'mode': mode, 'size': size, 'concurrency': concurrency,
+                            'base_url': server.url, 'rate': args.rate}
+                    completed = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), '--case', json.dumps(case)],
+                        capture_output=True, text=True)
+                    if completed.returncode != 0:
+                        print(f"❌ {mode} size={size} concurrency={concurrency} failed:\n"
+                              f"{completed.stderr}")
+                        continue
+                    result = json.loads(completed.stdout.strip().splitlines()[-1])
+                    results.append(result)
+                    latency = result['latency_ms']
+                    print(f"{mode:<11}{size:>6}{concurrency:>6}{result['terms_per_second']:>10}"
+                          f"{latency['p50']:>9}{latency['p95']:>9}{latency['p99']:>9}"
+                          f"{result['peak_rss_mb'] or '-':>9}")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'server': {
+            'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms,
+            'distribution': args.distribution, 'error_rate': args.error_rate,
+            'throttle_rps': args.throttle_rps, 'miss_rate': args.miss_rate,
+            'requests': server.requests,
+            'status_counts': {str(k): v for k, v in sorted(server.status_counts.items())},
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"📁 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the project's entry points.
+
+Each module is imported in a fresh interpreter under `python -X importtime`,
+several times, and the best run is reported. That makes the numbers
+comparable to what a CLI cold start or a `spawn`ed worker process pays. The
+heaviest imports of each module are listed, and worker spin-up is timed by
+starting a process pool with the collector's initializer.
+
+Usage:
+    python benchmark_imports.py                      # print a report
+    python benchmark_imports.py --output IMPORT_TIME_REPORT.md
+"""
+
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+
+MODULES = ['apputil', 'genius_api', 'collect_artist_data',
+           'collect_artist_data_multiprocessing', 'app']
+
+
+def import_profile(module: str) -> dict:
+    """
+    Import `module` in a fresh interpreter and return its total import time
+    and the cumulative time of every top-level import it triggered, in ms.
+    """
+    env = dict(os.environ, ACCESS_TOKEN=os.environ.get('ACCESS_TOKEN', 'benchmark'))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               capture_output=True, text=True, env=env,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ''
+        return {'error': error}
+
+    # -X importtime lists each import after everything it imported, with
+    # nesting shown by indentation, so the module's direct imports are the
+    # depth-1 lines just above its own depth-0 line
+    total = 0.0
+    children, span = {}, {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        ms = int(cumulative) / 1000
+        if depth == 1:
+            span[name.strip()] = ms
+        elif depth == 0:
+            if name.strip() == module:
+                total, children = ms, span
+            span = {}
+    return {'total_ms': total, 'imports': children}
+
+
+def best_profile(module: str, repeat: int) -> dict:
+    """Best (lowest total) of `repeat` import profiles."""
+    runs = [import_profile(module) for _ in range(repeat)]
+    ok = [run for run in runs if 'error' not in run]
+    return min(ok, key=lambda run: run['total_ms']) if ok else runs[0]
+
+
+def worker_spinup_ms(workers: int) -> float:
+    """Time to start `workers` spawned processes running the collector's init_worker."""
+    import multiprocessing as mp
+    import collect_artist_data_multiprocessing as mp_collector
+
+    env_file = os.path.join(tempfile.mkdtemp(), 'bench.env')
+    with open(env_file, 'w') as file:
+        file.write("ACCESS_TOKEN=benchmark\n")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                             initializer=partial(mp_collector.init_worker, env_file)) as executor:
+        # One trivial task per worker forces every initializer to finish
+        list(executor.map(abs, range(workers)))
+    return (time.perf_counter() - start) * 1000
+
+
+def render(results: dict, spinup: dict, top: int) -> str:
+    lines = [
+        "# Import-time report",
+        "",
+        f"Generated {datetime.now().isoformat(timespec='seconds')} with "
+        f"`python benchmark_imports.py` on Python {platform.python_version()} "
+        f"({platform.platform()}). Best of several fresh-interpreter runs of "
+        "`python -X importtime -c 'import <module>'`.",
+        "",
+        "| module | import time (ms) | heaviest imports (cumulative ms) |",
+        "|---|---:|---|",
+    ]
+    for module, profile in results.items():
+        if 'error' in profile:
+            lines.append(f"| `{module}` | n/a | {profile['error']} |")
+            continue
+        heaviest = sorted(profile['imports'].items(), key=lambda item: -item[1])[:top]
+        listed = ", ".join(f"`{name}` {ms:.1f}" for name, ms in heaviest)
+        lines.append(f"| `{module}` | {profile['total_ms']:.1f} | {listed} |")
+    if spinup:
+        lines += ["", "| spawned workers | pool start-up (ms) |", "|---:|---:|"]
+        lines += [f"| {n} | {ms:.0f} |" for n, ms in spinup.items()]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time of the project's modules.")
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=4,
+                        help="heaviest imports to list per module (default: 4)")
+    parser.add_argument('--workers', nargs='*', type=int, default=[4],
+                        help="process-pool sizes to time worker spin-up for (default: 4)")
+    parser.add_argument('--output', help="also write the Markdown report to this file")
+    args = parser.parse_args(argv)
+
+    results = {module: best_profile(module, args.repeat) for module in args.modules}
+    spinup = {n: min(worker_spinup_ms(n) for _ in range(3)) for n in args.workers}
+    report = render(results, spinup, args.top)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(report)
+        print(f"📁 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
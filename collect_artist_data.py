@@ -9,10 +9,71 @@ This script:
 3. Saves results to a CSV file
 """
 
-import csv
+import argparse
 import time
 from datetime import datetime
-from apputil import Genius
+from apputil import CircuitOpenError, Genius
+from genius_cache import ResponseCache
+from genius_hedge import HedgePolicy
+from genius_index import ArtistIndex
+from genius_journal import CheckpointJournal
+from genius_metrics import print_summary, write_reports
+from genius_ratelimit import TokenBucket
+from genius_sinks import open_sink
+from genius_retry import RetryPolicy
+from genius_tokens import TokenPool, load_tokens
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Collect artist data from the Genius API.")
+    parser.add_argument('--artists', default='artists_list.txt',
+                        help="file with one artist per line (default: artists_list.txt)")
+    parser.add_argument('--env-file', default='env-1.env',
+                        help="env file containing ACCESS_TOKEN (default: env-1.env)")
+    parser.add_argument('--base-url', default=None,
+                        help="API root to query instead of https://api.genius.com "
+                             "(e.g. a mock_genius_server.py instance)")
+    parser.add_argument('--cache', metavar='PATH', default=None,
+                        help="reuse API responses from this SQLite cache file")
+    parser.add_argument('--cache-ttl', type=float, default=7 * 24 * 60 * 60,
+                        help="seconds before a cached response is refetched (default: 7 days)")
+    parser.add_argument('--negative-ttl', type=float, default=24 * 60 * 60,
+                        help="seconds before a cached 'nothing found' answer (no search hit, "
+                             "no artist) is asked again; failed requests are never cached "
+                             "(default: 1 day)")
+    parser.add_argument('--index', metavar='PATH', default=None,
+                        help="resolve artist IDs from this local name index before searching, "
+                             "and add new results to it")
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help="maximum API requests per second (default: 10)")
+    parser.add_argument('--burst', type=int, default=1,
+                        help="requests allowed back-to-back before pacing starts (default: 1)")
+    parser.add_argument('--token-rate', type=float, default=None,
+                        help="with several access tokens (ACCESS_TOKEN_1, ACCESS_TOKEN_2, ...), "
+                             "requests per second allowed for each one (default: --rate)")
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help="retries for 429/5xx responses and connection errors (default: 3)")
+    parser.add_argument('--hedge', type=float, metavar='PERCENTILE', default=None,
+                        help="send a duplicate of any request slower than this latency "
+                             "percentile of its endpoint (e.g. 95); the first answer wins")
+    parser.add_argument('--hedge-budget', type=float, default=0.05,
+                        help="with --hedge, most duplicates to send, as a fraction of "
+                             "requests (default: 0.05)")
+    parser.add_argument('--journal', default='artist_data_checkpoint.jsonl',
+                        help="checkpoint journal of finished artists (default: artist_data_checkpoint.jsonl)")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip artists already recorded in the journal "
+                             "(artists whose requests failed are looked up again)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help="output file format; parquet and feather are typed, with Int64 "
+                             "ids/followers and a status column (default: csv)")
+    parser.add_argument('--compression', default=None,
+                        help="parquet/feather compression codec, or 'none' (default: zstd for "
+                             "parquet, none for feather so it can be memory-mapped)")
+    parser.add_argument('--row-group-size', type=int, default=10_000,
+                        help="rows per parquet row group / feather batch (default: 10000)")
+    return parser.parse_args(argv)
 
 def load_artists_from_file(filename: str) -> list:
     """Load artist names from a text file, filtering out comments and empty lines."""
@@ -30,74 +91,86 @@ def load_artists_from_file(filename: str) -> list:
         print(f"❌ Error: {filename} not found!")
         return []
 
-def save_to_csv(data, filename: str):
-    """Save the artist data to a CSV file."""
-    if not data:
-        print("❌ No data to save!")
-        return
-    
-    try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            # Get column names from the first row
-            fieldnames = data[0].keys() if isinstance(data[0], dict) else ['search_term', 'artist_name', 'artist_id', 'followers_count']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            if isinstance(data[0], dict):
-                # If data is already in dict format
-                writer.writerows(data)
-            else:
-                # If data is a pandas DataFrame, convert to dict
-                for row in data:
-                    writer.writerow(row)
-            
-        print(f"✅ Data saved to {filename}")
-    except Exception as e:
-        print(f"❌ Error saving to CSV: {e}")
-
-def main():
+def main(argv=None):
     """Main function to orchestrate the data collection process."""
+    args = parse_args(argv)
     print("🎵 Starting Bonus Exercise - Artist Data Collection")
     print("=" * 60)
     
     # Load artists from file
-    artists = load_artists_from_file('artists_list.txt')
+    artists = load_artists_from_file(args.artists)
     if not artists:
         return
     
     print(f"📋 Processing {len(artists)} artists...")
     
     # Initialize Genius API client
+    cache = ResponseCache(args.cache, ttl=args.cache_ttl,
+                          negative_ttl=args.negative_ttl) if args.cache else None
+    index = ArtistIndex(args.index) if args.index else None
+    pool = None
     try:
-        genius = Genius.from_env_file('env-1.env')
+        # Several tokens each get their own rate budget, instead of sharing one
+        tokens = load_tokens(Genius.load_env_file(args.env_file))
+        if len(tokens) > 1:
+            token_rate = args.token_rate or args.rate
+            pool = TokenPool(tokens, rate=token_rate, burst=args.burst)
+        hedge = HedgePolicy(args.hedge, max_extra=args.hedge_budget) if args.hedge else None
+        genius = Genius.from_env_file(args.env_file, cache=cache, index=index,
+                                      rate_limiter=TokenBucket(args.rate, args.burst),
+                                      retry=RetryPolicy(args.max_retries),
+                                      base_url=args.base_url, tokens=pool, hedge=hedge)
         print("✅ Genius API client initialized")
+        if hedge is not None:
+            print(f"🏇 Hedging requests slower than p{args.hedge:g} "
+                  f"(at most {args.hedge_budget * 100:g}% extra)")
+        if pool is not None:
+            print(f"🔑 {len(pool)} access tokens, {token_rate:g} requests/second each")
+        if cache is not None:
+            print(f"🗄️  Using response cache: {args.cache}")
+        if index is not None:
+            print(f"📇 Using artist index: {args.index} ({len(index)} names)")
     except Exception as e:
         print(f"❌ Error initializing Genius client: {e}")
         print("💡 Make sure your env-1.env file exists with ACCESS_TOKEN")
         return
     
+    # Finished artists are journaled as they complete so a crash can be resumed
+    journal = CheckpointJournal(args.journal, resume=args.resume)
+    pending = journal.pending(artists)
+    if args.resume:
+        print(f"⏩ Resuming: {len(artists) - len(pending)} artists already in {args.journal}")
+    
     # Record start time
     start_time = time.time()
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
-        # Use the get_artists method to process all artists
+        # Stream rows from iter_artists (the generator behind get_artists) into
+        # the journal as each artist completes
         print("\n🔄 Fetching artist data from Genius API...")
-        result = genius.get_artists(artists)
+        for done, row in enumerate(genius.iter_artists(pending), start=1):
+            journal.record(row)
+            if done % 10 == 0 or done == len(pending):
+                print(f"📈 Progress: {done}/{len(pending)} artists")
         
         # Generate output filename with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = f'artist_data_{timestamp}.csv'
+        output_file = f'artist_data_{timestamp}.{args.format}'
         
-        # Save to CSV
-        if hasattr(result, 'to_dict'):
-            # If it's a pandas DataFrame
-            data = result.to_dict('records')
-        else:
-            # If it's already a list of dictionaries
-            data = result
-            
-        save_to_csv(data, output_file)
+        # Compact the journal into the final output, in input order
+        written = successful = 0
+        sink_kwargs = {}
+        if args.format != 'csv':
+            sink_kwargs = {'row_group_size': args.row_group_size}
+            if args.compression is not None:
+                sink_kwargs['compression'] = None if args.compression == 'none' else args.compression
+        with open_sink(output_file, args.format, **sink_kwargs) as sink:
+            for row in journal.iter_compact(artists):
+                sink.write(row)
+                written += 1
+                successful += row.get('artist_name', 'N/A') != 'N/A'
+        print(f"✅ Data saved to {output_file}")
         
         # Calculate and display statistics
         end_time = time.time()
@@ -109,16 +182,33 @@ def main():
         print(f"📁 Output file: {output_file}")
         print(f"🎯 Artists processed: {len(artists)}")
         
-        if data:
-            successful = len([row for row in data if row.get('artist_name', 'N/A') != 'N/A'])
+        if written:
             print(f"✅ Successful matches: {successful}")
-            print(f"❌ Failed matches: {len(data) - successful}")
-            print(f"📈 Success rate: {(successful/len(data)*100):.1f}%")
+            print(f"❌ Failed matches: {written - successful}")
+            print(f"📈 Success rate: {(successful/written*100):.1f}%")
+        retry = journal.pending(artists)
+        if retry:
+            print(f"🔁 {len(retry)} artists failed to load; re-run with --resume to try them again")
+        
+        # Where the time went: latency-, throttle- or CPU-bound
+        json_path, prom_path, summary = write_reports(genius.metrics,
+                                                      output_file.rsplit('.', 1)[0], duration)
+        print_summary(summary)
+        if pool is not None:
+            pool.print_stats()
+        print(f"📐 Metrics: {json_path}, {prom_path}")
         
+    except CircuitOpenError as e:
+        print(f"\n🛑 Stopping early, the Genius API looks unavailable: {e}")
+        print(f"💡 Re-run with --resume to continue from {args.journal}")
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted; re-run with --resume to continue from {args.journal}")
     except Exception as e:
         print(f"❌ Error during data collection: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        journal.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
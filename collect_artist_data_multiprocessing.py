@@ -10,14 +10,111 @@ This script:
 4. Saves results to a CSV file with performance metrics
 """
 
-import csv
+import argparse
 import time
 import multiprocessing as mp
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from functools import partial
 import os
-from apputil import Genius
+import socket
+import tempfile
+import threading
+from apputil import CircuitOpenError, Genius, normalize_term
+from genius_cache import ResponseCache
+from genius_concurrency import AdaptiveConcurrency
+from genius_hedge import HedgePolicy
+from genius_index import ArtistIndex
+from genius_journal import CheckpointJournal
+from genius_metrics import print_summary, write_reports
+from genius_queue import WorkQueue
+from genius_ratelimit import FileTokenBucket, TokenBucket
+from genius_records import ArtistBatch, ArtistRecord
+from genius_retry import RetryPolicy
+from genius_sinks import open_sink
+from genius_tokens import TokenPool, load_tokens
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(
+        description="Collect artist data from the Genius API using multiple processes.")
+    parser.add_argument('--artists', default='artists_list.txt',
+                        help="file with one artist per line (default: artists_list.txt)")
+    parser.add_argument('--env-file', default='env-1.env',
+                        help="env file containing ACCESS_TOKEN (default: env-1.env)")
+    parser.add_argument('--base-url', default=None,
+                        help="API root to query instead of https://api.genius.com "
+                             "(e.g. a mock_genius_server.py instance)")
+    parser.add_argument('--cache', metavar='PATH', default=None,
+                        help="reuse API responses from this SQLite cache file")
+    parser.add_argument('--cache-ttl', type=float, default=7 * 24 * 60 * 60,
+                        help="seconds before a cached response is refetched (default: 7 days)")
+    parser.add_argument('--negative-ttl', type=float, default=24 * 60 * 60,
+                        help="seconds before a cached 'nothing found' answer (no search hit, "
+                             "no artist) is asked again; failed requests are never cached "
+                             "(default: 1 day)")
+    parser.add_argument('--index', metavar='PATH', default=None,
+                        help="resolve artist IDs from this local name index before searching, "
+                             "and add new results to it")
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help="maximum API requests per second, across all workers on this "
+                             "machine, or on every machine sharing --bucket-path (default: 10)")
+    parser.add_argument('--burst', type=int, default=1,
+                        help="requests allowed back-to-back before pacing starts (default: 1)")
+    parser.add_argument('--bucket-path', metavar='PATH', default=None,
+                        help="keep the rate-limit bucket in this file (plus one '-token.<n>' "
+                             "file beside it per access token), so runs on every machine that can lock it "
+                             "share --rate and --token-rate (default: a per-run file in the "
+                             "temp directory, which limits this machine only)")
+    parser.add_argument('--token-rate', type=float, default=None,
+                        help="with several access tokens (ACCESS_TOKEN_1, ACCESS_TOKEN_2, ...), "
+                             "requests per second allowed for each one, across all workers "
+                             "(default: --rate)")
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help="retries for 429/5xx responses and connection errors (default: 3)")
+    parser.add_argument('--hedge', type=float, metavar='PERCENTILE', default=None,
+                        help="send a duplicate of any request slower than this latency "
+                             "percentile of its endpoint (e.g. 95); the first answer wins")
+    parser.add_argument('--hedge-budget', type=float, default=0.05,
+                        help="with --hedge, most duplicates to send, as a fraction of "
+                             "requests (default: 0.05)")
+    parser.add_argument('--journal', default='artist_data_multiprocessing_checkpoint.jsonl',
+                        help="checkpoint journal of finished artists "
+                             "(default: artist_data_multiprocessing_checkpoint.jsonl)")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip artists already recorded in the journal "
+                             "(artists whose requests failed are looked up again)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help="output file format; parquet and feather are typed, with Int64 "
+                             "ids/followers and a status column (default: csv)")
+    parser.add_argument('--compression', default=None,
+                        help="parquet/feather compression codec, or 'none' (default: zstd for "
+                             "parquet, none for feather so it can be memory-mapped)")
+    parser.add_argument('--row-group-size', type=int, default=10_000,
+                        help="rows per parquet row group / feather batch (default: 10000)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help="run batches in worker processes or in threads sharing "
+                             "one client (default: process)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of workers (default: min(CPU count, 4))")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="adjust the number of requests in flight from measured latency "
+                             "and 429/5xx responses (AIMD); runs on threads and treats "
+                             "--workers as the upper bound (default bound: 32)")
+    parser.add_argument('--queue', metavar='PATH', default=None,
+                        help="share the work through this SQLite queue file, so workers on "
+                             "several machines can collect one artist list together")
+    parser.add_argument('--role', choices=['coordinator', 'worker', 'both'], default='both',
+                        help="with --queue: enqueue artists and write the output (coordinator), "
+                             "only process queued artists (worker), or both (default: both)")
+    parser.add_argument('--lease-seconds', type=float, default=120.0,
+                        help="with --queue: seconds before a claimed batch that was not "
+                             "completed is handed to another worker (default: 120)")
+    parser.add_argument('--max-attempts', type=int, default=5,
+                        help="with --queue: claims per artist before it is recorded as a "
+                             "miss (default: 5)")
+    return parser.parse_args(argv)
 
 def load_artists_from_file(filename: str) -> list:
     """Load artist names from a text file, filtering out comments and empty lines."""
@@ -35,96 +132,392 @@ def load_artists_from_file(filename: str) -> list:
         print(f"❌ Error: {filename} not found!")
         return []
 
-def process_artist_batch(artist_batch: list, env_file: str = 'env-1.env') -> list:
+# Client owned by this worker process, built once by init_worker
+_worker_genius = None
+
+def init_worker(env_file: str = 'env-1.env', **client_kwargs):
+    """
+    Pool initializer: build this worker's Genius client once, so its session
+    and warm connections are reused for every batch the worker runs.
+    `client_kwargs` (cache, rate_limiter, retry, ...) go to `Genius`; all
+    workers should share the same `rate_limiter`.
     """
-    Process a batch of artists in a single worker process.
-    Each worker gets its own Genius client instance.
+    global _worker_genius
+    _worker_genius = Genius.from_env_file(env_file, **client_kwargs)
+
+def process_artist_batch(artist_batch: list, genius: Genius = None) -> ArtistBatch:
+    """
+    Process a batch of artists with `genius`, or with this worker's client
+    (see `init_worker`) when no client is passed.
+
+    Results come back as a column-wise `ArtistBatch`, which is much cheaper
+    to pickle back to the parent than a list of row dicts.
     """
     try:
-        # Initialize Genius client for this worker process
-        genius = Genius.from_env_file(env_file)
+        genius = genius or _worker_genius
+        if genius is None:
+            raise RuntimeError("worker client not initialized; use init_worker as the pool initializer")
         
-        # Process the batch of artists
-        result = genius.get_artists(artist_batch)
-        
-        # Convert to list of dicts if it's a DataFrame
-        if hasattr(result, 'to_dict'):
-            return result.to_dict('records')
-        else:
-            return result
+        return ArtistBatch(genius.iter_artists(artist_batch))
             
+    except CircuitOpenError:
+        # Let the parent stop the run instead of recording a batch of misses
+        raise
     except Exception as e:
         print(f"❌ Error in worker process: {e}")
-        # Return empty results for failed batch
-        return [{'search_term': artist, 'artist_name': 'N/A', 'artist_id': 'N/A', 'followers_count': 'N/A'} 
-                for artist in artist_batch]
+        # Failed rows, so a resumed run looks these artists up again
+        return ArtistBatch(ArtistRecord(artist, error=True) for artist in artist_batch)
+
+def process_artist_batch_with_metrics(artist_batch: list) -> tuple:
+    """
+    Process-pool task: the batch's rows plus this worker's request metrics
+    since its previous batch, for the parent to merge into its totals.
+    """
+    rows = process_artist_batch(artist_batch)
+    return rows, _worker_genius.metrics.drain()
+
+def _renew_leases(queue: WorkQueue, owner: str, batch: list, done: threading.Event):
+    """Heartbeat: renew the lease on `batch` every third of a lease until `done` is set."""
+    while not done.wait(queue.lease_seconds / 3):
+        queue.renew(owner, batch)
+
+def queue_worker_loop(queue: WorkQueue, batch_size: int, genius: Genius = None,
+                      stop: threading.Event = None, poll_interval: float = 1.0) -> int:
+    """
+    Claim batches from the shared `queue`, look them up and complete them,
+    until every queued artist is done or failed (or `stop` is set).
+
+    A heartbeat thread renews the lease while a batch runs, so only a dead or
+    hung worker loses its batch. Failed lookups are released back to the
+    queue to be tried again, up to its `max_attempts`. While other workers
+    hold the remaining leases the loop keeps polling, so it picks up their
+    batches if their leases expire. Returns the number of artists this loop
+    completed.
+    """
+    genius = genius or _worker_genius
+    owner = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    completed = 0
+    while stop is None or not stop.is_set():
+        batch = queue.claim(owner, batch_size)
+        if not batch:
+            if queue.finished():
+                break
+            time.sleep(poll_interval)
+            continue
+        done = threading.Event()
+        heartbeat = threading.Thread(target=_renew_leases, args=(queue, owner, batch, done),
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            rows = ArtistBatch(genius.iter_artists(batch))
+        except CircuitOpenError:
+            # Hand the batch straight back for a healthier worker or a later run
+            queue.release(owner, batch)
+            raise
+        except Exception as e:
+            print(f"❌ Error in queue worker {owner}: {e}")
+            queue.release(owner, batch)
+            continue
+        finally:
+            done.set()
+            heartbeat.join()
+        queue.release(owner, [row['search_term'] for row in rows if row.error])
+        completed += queue.complete(owner, [row for row in rows if not row.error])
+    return completed
+
+def queue_worker_task(queue: WorkQueue, batch_size: int) -> tuple:
+    """Process-pool task: run `queue_worker_loop` with this worker's client and return its metrics."""
+    completed = queue_worker_loop(queue, batch_size)
+    return completed, _worker_genius.metrics.drain()
 
 def chunk_list(lst: list, chunk_size: int) -> list:
     """Split a list into chunks of specified size."""
     return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
 
-def save_to_csv(data: list, filename: str):
-    """Save the artist data to a CSV file."""
-    if not data:
-        print("❌ No data to save!")
-        return
-    
+def print_concurrency(concurrency: AdaptiveConcurrency):
+    """Print where the adaptive concurrency limit ended up."""
+    stats = concurrency.stats()
+    print(f"🎚️  Concurrency: settled at {stats['limit']} in flight (peak {stats['peak_limit']}, "
+          f"{stats['increases']} increases, {stats['decreases']} decreases)")
+
+def write_output(rows, args) -> tuple:
+    """
+    Stream result rows into a timestamped output file in `args.format`.
+    Returns (output_file, rows written, successful matches).
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_file = f'artist_data_multiprocessing_{timestamp}.{args.format}'
+
+    written = successful = 0
+    sink_kwargs = {}
+    if args.format != 'csv':
+        sink_kwargs = {'row_group_size': args.row_group_size}
+        if args.compression is not None:
+            sink_kwargs['compression'] = None if args.compression == 'none' else args.compression
+    with open_sink(output_file, args.format, **sink_kwargs) as sink:
+        for row in rows:
+            sink.write(row)
+            written += 1
+            successful += row.get('artist_name', 'N/A') != 'N/A'
+    print(f"✅ Data saved to {output_file}")
+    return output_file, written, successful
+
+def run_queue_mode(args, artists: list, shared_genius: Genius, client_kwargs: dict,
+                   num_workers: int, batch_size: int):
+    """
+    Collect through the shared work queue at `args.queue`.
+
+    The coordinator (re)fills the queue and, once every artist is done or
+    failed, writes the output from the results stored in the queue. Workers
+    (`--role worker` on other machines, or local ones with `--role both`)
+    claim, process and complete batches until the queue is finished.
+    """
+    queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+    metrics = shared_genius.metrics
+    start_time = time.time()
+    print(f"📬 Work queue: {args.queue} (role: {args.role}, lease {args.lease_seconds:g}s)")
+
+    if args.role != 'worker':
+        if not args.resume:
+            queue.clear()
+        added = queue.enqueue(artists)
+        print(f"📥 Queued {added} new search terms")
+
+    executor, futures, stop = None, [], threading.Event()
+    if args.role != 'coordinator':
+        if args.executor == 'thread':
+            executor = ThreadPoolExecutor(max_workers=num_workers)
+            futures = [executor.submit(queue_worker_loop, queue, batch_size, shared_genius, stop)
+                       for _ in range(num_workers)]
+        else:
+            executor = ProcessPoolExecutor(max_workers=num_workers,
+                                           initializer=partial(init_worker, args.env_file,
+                                                               **client_kwargs))
+            futures = [executor.submit(queue_worker_task, queue, batch_size)
+                       for _ in range(num_workers)]
+        print(f"👷 Started {num_workers} queue workers ({args.executor} executor)")
+
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['search_term', 'artist_name', 'artist_id', 'followers_count']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            writer.writerows(data)
-            
-        print(f"✅ Data saved to {filename}")
-    except Exception as e:
-        print(f"❌ Error saving to CSV: {e}")
+        # Report progress until our workers stop, or (coordinator only) the queue is finished
+        last_line = None
+        while True:
+            counts = queue.counts()
+            line = (f"📈 Queue: {counts['done']} done, {counts['failed']} failed, "
+                    f"{counts['leased']} leased, {counts['expired']} expired, "
+                    f"{counts['pending']} pending")
+            if line != last_line:
+                print(line)
+                last_line = line
+            if futures and all(future.done() for future in futures):
+                break
+            if not futures and queue.finished():
+                break
+            time.sleep(1.0)
+
+        completed = 0
+        for future in futures:
+            try:
+                result = future.result()
+                if args.executor == 'process':
+                    result, worker_metrics = result
+                    metrics.merge(worker_metrics)
+                completed += result
+            except CircuitOpenError as e:
+                print(f"🛑 A worker stopped, the Genius API looks unavailable: {e}")
+            except Exception as e:
+                print(f"❌ Queue worker failed: {e}")
+        if futures:
+            print(f"👷 Local workers completed {completed} artists")
+        if shared_genius.concurrency is not None:
+            print_concurrency(shared_genius.concurrency)
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted; unfinished leases in {args.queue} expire and are retried")
+        return
+    finally:
+        stop.set()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
 
-def main():
-    """Main function with multiprocessing optimization."""
+    duration = time.time() - start_time
+    if args.role == 'worker':
+        print(f"⏱️  Worker time: {duration:.2f} seconds")
+        print_summary(metrics.summary(duration, num_workers))
+        queue.close()
+        return
+
+    if not queue.finished():
+        print(f"⏸️  Queue not finished yet; re-run with --resume to keep collecting into {args.queue}")
+        queue.close()
+        return
+
+    output_file, written, successful = write_output(queue.iter_results(artists), args)
+    queue.close()
+
+    print("\n" + "=" * 70)
+    print("📊 DISTRIBUTED COLLECTION COMPLETE!")
+    print(f"⏱️  Total time: {duration:.2f} seconds")
+    print(f"🚀 Speed: {len(artists)/duration:.2f} artists/second")
+    print(f"📁 Output file: {output_file}")
+    print(f"🎯 Artists processed: {len(artists)}")
+    if written:
+        print(f"✅ Successful matches: {successful}")
+        print(f"❌ Failed matches: {written - successful}")
+        print(f"📈 Success rate: {(successful/written*100):.1f}%")
+
+    # Only this node's requests are measured; remote workers print their own
+    json_path, prom_path, summary = write_reports(metrics, os.path.splitext(output_file)[0],
+                                                  duration, num_workers)
+    print_summary(summary)
+    print(f"📐 Metrics: {json_path}, {prom_path}")
+
+def main(argv=None):
+    """Main function with multiprocessing (or multithreading) optimization."""
+    args = parse_args(argv)
     print("🎵 Starting Bonus Exercise - Multiprocessing Artist Data Collection")
     print("=" * 70)
     
-    # Load artists from file
-    artists = load_artists_from_file('artists_list.txt')
-    if not artists:
+    # Load artists from file (queue workers take theirs from the queue)
+    queue_worker = args.queue and args.role == 'worker'
+    artists = [] if queue_worker else load_artists_from_file(args.artists)
+    if not artists and not queue_worker:
         return
     
     # Configuration
-    num_workers = min(mp.cpu_count(), 4)  # Limit workers to be respectful to API
+    num_workers = args.workers or min(mp.cpu_count(), 4)  # Limit workers to be respectful to API
     batch_size = max(5, len(artists) // (num_workers * 2))  # Dynamic batch size
+    concurrency = None
+    if args.adaptive:
+        # Threads share one client, so one controller sees every request in flight.
+        # One artist per task lets the controller, not the batching, set the pace.
+        if args.executor != 'thread':
+            print("🧵 --adaptive runs on threads; using the thread executor")
+            args.executor = 'thread'
+        num_workers = args.workers or 32
+        batch_size = 1
+        concurrency = AdaptiveConcurrency(initial=min(4, num_workers), max_limit=num_workers)
+    if args.queue:
+        # Other nodes' workers are unknown here; small leases keep them all busy
+        batch_size = 5
     
-    print(f"📋 Processing {len(artists)} artists...")
-    print(f"⚙️  Workers: {num_workers}")
+    if artists:
+        print(f"📋 Processing {len(artists)} artists...")
+    print(f"⚙️  Workers: {num_workers} ({args.executor} executor)")
+    if concurrency is not None:
+        print(f"🎚️  Adaptive concurrency: starting at {concurrency.limit}, "
+              f"between {concurrency.min_limit} and {concurrency.max_limit} requests in flight")
     print(f"📦 Batch size: {batch_size}")
     
-    # Test API connection first
+    # Workers open the cache file themselves; SQLite arbitrates between them
+    cache = ResponseCache(args.cache, ttl=args.cache_ttl,
+                          negative_ttl=args.negative_ttl) if args.cache else None
+    if cache is not None:
+        print(f"🗄️  Using response cache: {args.cache}")
+    index = ArtistIndex(args.index) if args.index else None
+    if index is not None:
+        print(f"📇 Using artist index: {args.index} ({len(index)} names)")
+    
+    # One token bucket bounds the combined request rate of every worker on
+    # this machine: in memory for threads, in a per-run temp file for
+    # processes. --bucket-path moves it to a file other machines share too;
+    # that file is never reset, since other runs may be using it.
+    bucket_path = args.bucket_path
+    private_buckets = bucket_path is None and args.executor != 'thread'
+    if private_buckets:
+        bucket_path = os.path.join(tempfile.gettempdir(), f'genius-ratelimit-{os.getpid()}.bucket')
+    if bucket_path is None:
+        rate_limiter = TokenBucket(args.rate, args.burst)
+    else:
+        rate_limiter = FileTokenBucket(bucket_path, rate=args.rate, burst=args.burst)
+        if private_buckets:
+            rate_limiter.reset()
+    scope = f"every run sharing {args.bucket_path}" if args.bucket_path else "all workers on this machine"
+    print(f"🚦 Rate limit: {args.rate:g} requests/second (burst {args.burst}) across {scope}")
+    
+    # Several tokens each get their own bucket, so the combined rate grows
+    # with the number of tokens
+    tokens = load_tokens(Genius.load_env_file(args.env_file))
+    pool = None
+    if len(tokens) > 1:
+        token_rate = args.token_rate or args.rate
+        if bucket_path is None:
+            pool = TokenPool(tokens, rate=token_rate, burst=args.burst)
+        else:
+            pool = TokenPool(tokens, rate=token_rate, burst=args.burst,
+                             bucket_path=f'{os.path.splitext(bucket_path)[0]}-token')
+            if private_buckets:
+                pool.reset()
+        print(f"🔑 {len(pool)} access tokens, {token_rate:g} requests/second each")
+    retry = RetryPolicy(args.max_retries)
+    hedge = None
+    if args.hedge:
+        # Each process learns its own latencies; a duplicate needs a thread
+        # and a pooled connection next to the request it races
+        hedge = HedgePolicy(args.hedge, max_extra=args.hedge_budget, max_workers=2 * num_workers)
+        print(f"🏇 Hedging requests slower than p{args.hedge:g} "
+              f"(at most {args.hedge_budget * 100:g}% extra)")
+    
+    # Test API connection first. In thread mode this is the one client every
+    # thread shares, with a connection pool sized to the worker count.
+    client_kwargs = dict(cache=cache, index=index, rate_limiter=rate_limiter, retry=retry,
+                         base_url=args.base_url, tokens=pool, hedge=hedge)
     try:
-        test_genius = Genius.from_env_file('env-1.env')
+        shared_genius = Genius.from_env_file(args.env_file,
+                                             pool_maxsize=num_workers * (2 if hedge else 1),
+                                             concurrency=concurrency, **client_kwargs)
         print("✅ Genius API client test successful")
     except Exception as e:
         print(f"❌ Error initializing Genius client: {e}")
         print("💡 Make sure your env-1.env file exists with ACCESS_TOKEN")
         return
     
+    if args.queue:
+        try:
+            run_queue_mode(args, artists, shared_genius, client_kwargs, num_workers, batch_size)
+        finally:
+            if private_buckets:
+                rate_limiter.reset()
+                if pool is not None:
+                    pool.reset()
+        return
+    
+    # Finished artists are journaled as batches complete so a crash can be resumed.
+    # Each distinct term is searched once; duplicates are filled back in at the end.
+    journal = CheckpointJournal(args.journal, resume=args.resume)
+    unique_artists = journal.pending(artists)
+    if args.resume:
+        print(f"⏩ Resuming: {len(journal)} artists already in {args.journal}")
+    duplicates = len(artists) - len({normalize_term(artist) for artist in artists})
+    if duplicates > 0:
+        print(f"🔁 Skipping {duplicates} duplicate search terms")
+    
     # Split artists into batches
-    artist_batches = chunk_list(artists, batch_size)
+    artist_batches = chunk_list(unique_artists, batch_size)
     print(f"🔄 Created {len(artist_batches)} batches for processing")
     
     # Record start time
     start_time = time.time()
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    all_results = []
     completed_batches = 0
     
+    if args.executor == 'thread':
+        # I/O-bound work: threads share one client and its keep-alive pool
+        executor = ThreadPoolExecutor(max_workers=num_workers)
+        task = partial(process_artist_batch, genius=shared_genius)
+    else:
+        # Each worker process builds its client once, in the initializer
+        executor = ProcessPoolExecutor(max_workers=num_workers,
+                                       initializer=partial(init_worker, args.env_file,
+                                                           **client_kwargs))
+        # Workers send their metrics back with each batch
+        task = process_artist_batch_with_metrics
+    metrics = shared_genius.metrics
+    
     try:
-        # Use ProcessPoolExecutor for multiprocessing
-        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        with executor:
             # Submit all batches
             future_to_batch = {
-                executor.submit(process_artist_batch, batch, 'env-1.env'): batch 
+                executor.submit(task, batch): batch
                 for batch in artist_batches
             }
             
@@ -132,22 +525,28 @@ def main():
             for future in as_completed(future_to_batch):
                 try:
                     batch_result = future.result()
-                    all_results.extend(batch_result)
+                    if args.executor == 'process':
+                        batch_result, worker_metrics = batch_result
+                        metrics.merge(worker_metrics)
+                    journal.record_many(batch_result)
                     completed_batches += 1
                     
                     # Progress update
                     progress = (completed_batches / len(artist_batches)) * 100
                     print(f"📈 Progress: {completed_batches}/{len(artist_batches)} batches ({progress:.1f}%)")
                     
+                except CircuitOpenError as e:
+                    print(f"🛑 Stopping early, the Genius API looks unavailable: {e}")
+                    print(f"💡 Re-run with --resume to continue from {args.journal}")
+                    for pending in future_to_batch:
+                        pending.cancel()
+                    break
                 except Exception as e:
                     print(f"❌ Batch failed: {e}")
         
-        # Generate output filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = f'artist_data_multiprocessing_{timestamp}.csv'
-        
-        # Save to CSV
-        save_to_csv(all_results, output_file)
+        # Compact the journal back to one row per input line, in input order,
+        # streaming it straight into the output file
+        output_file, written, successful = write_output(journal.iter_compact(artists), args)
         
         # Calculate and display statistics
         end_time = time.time()
@@ -160,22 +559,38 @@ def main():
         print(f"📁 Output file: {output_file}")
         print(f"🎯 Artists processed: {len(artists)}")
         print(f"🔧 Workers used: {num_workers}")
+        if concurrency is not None:
+            print_concurrency(concurrency)
         
-        if all_results:
-            successful = len([row for row in all_results if row.get('artist_name', 'N/A') != 'N/A'])
+        if written:
             print(f"✅ Successful matches: {successful}")
-            print(f"❌ Failed matches: {len(all_results) - successful}")
-            print(f"📈 Success rate: {(successful/len(all_results)*100):.1f}%")
+            print(f"❌ Failed matches: {written - successful}")
+            print(f"📈 Success rate: {(successful/written*100):.1f}%")
+        retry = journal.pending(artists)
+        if retry:
+            print(f"🔁 {len(retry)} artists failed to load; re-run with --resume to try them again")
         
-        # Performance comparison note
-        estimated_serial_time = len(artists) * 0.2  # Rough estimate
-        speedup = estimated_serial_time / duration if duration > 0 else 1
-        print(f"⚡ Estimated speedup vs serial: {speedup:.1f}x")
+        # Measured request metrics, merged across workers, instead of a guessed speedup
+        json_path, prom_path, summary = write_reports(metrics, os.path.splitext(output_file)[0],
+                                                      duration, num_workers)
+        print_summary(summary)
+        if pool is not None and args.executor == 'thread':
+            # Worker processes keep their own counts
+            pool.print_stats()
+        print(f"📐 Metrics: {json_path}, {prom_path}")
         
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted; re-run with --resume to continue from {args.journal}")
     except Exception as e:
         print(f"❌ Error during multiprocessing collection: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        journal.close()
+        if private_buckets:
+            rate_limiter.reset()
+            if pool is not None:
+                pool.reset()
 
 if __name__ == "__main__":
     # Ensure proper multiprocessing setup on all platforms
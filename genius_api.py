@@ -1,21 +1,31 @@
 # built-in
-import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from multiprocessing import Pool
 from time import sleep
 
-# user-installed
-import pandas as pd
-from tqdm import tqdm
-from numpy.random import uniform
-from dotenv import load_dotenv
-
-load_dotenv()
+# user-installed packages (requests, pandas, tqdm, numpy, python-dotenv) are
+# imported inside the functions that use them, so importing this module, or
+# starting a Pool worker that unpickles one of its functions, stays cheap
 
 # constants
-ACCESS_TOKEN = os.environ['ACCESS_TOKEN']
 NAME_DEMO = __name__
 
+@lru_cache(maxsize=None)
+def _access_token():
+    """Load .env and read ACCESS_TOKEN, once, on first use."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.environ['ACCESS_TOKEN']
+
+def __getattr__(name):
+    # ACCESS_TOKEN used to be read at import time; it is now read on first access
+    if name == 'ACCESS_TOKEN':
+        return _access_token()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def genius(search_term, per_page=15):
     """
     Collect data from the Genius API by searching for `search_term`.
@@ -34,14 +44,56 @@ def genius(search_term, per_page=15):
     list
         All the hits which match the search criteria.
     """
+    import requests
+
     genius_search_url = f"http://api.genius.com/search?q={search_term}&" + \
-                        f"access_token={ACCESS_TOKEN}&per_page={per_page}"
+                        f"access_token={_access_token()}&per_page={per_page}"
     
     response = requests.get(genius_search_url)
     json_data = response.json()
     
     return json_data['response']['hits']
 
+def _expand_column(records, column, prefix, index):
+    """
+    Expand one nested-dict field of `records` into prefixed columns.
+
+    Builds the frame straight from the list of dicts, which pandas does in a
+    single columnar pass, instead of creating one Series per row.
+    """
+    import pandas as pd
+
+    nested = [r.get(column) for r in records]
+    nested = [value if isinstance(value, dict) else {} for value in nested]
+    expanded = pd.DataFrame.from_records(nested, index=index)
+    return expanded.add_prefix(prefix)
+
+def flatten_hits(hits):
+    """
+    Build the genius_to_df frame from a list of search hit results.
+
+    Keeps every top-level field and adds the nested `stats` and
+    `primary_artist` dicts as `stat_*` and `primary_artist_*` columns.
+
+    Parameters
+    ----------
+    hits : list of dict
+        The `result` dict of each search hit.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per hit.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(hits)
+    frames = [df]
+    for column, prefix in (('stats', 'stat_'), ('primary_artist', 'primary_artist_')):
+        if column in df.columns:
+            frames.append(_expand_column(hits, column, prefix, df.index))
+    return pd.concat(frames, axis=1)
+
 def genius_to_df(search_term, n_results_per_term=10, 
                  verbose=True, savepath=None):
     """
@@ -61,19 +113,7 @@ def genius_to_df(search_term, n_results_per_term=10,
     """
     json_data = genius(search_term, per_page=n_results_per_term)
     hits = [hit['result'] for hit in json_data]
-    df = pd.DataFrame(hits)
-
-    # expand dictionary elements
-    df_stats = df['stats'].apply(pd.Series)
-    df_stats.rename(columns={c:'stat_' + c for c in df_stats.columns},
-                    inplace=True)
-    
-    df_primary = df['primary_artist'].apply(pd.Series)
-    df_primary.rename(columns={c:'primary_artist_' + c 
-                               for c in df_primary.columns},
-                      inplace=True)
-    
-    df = pd.concat((df, df_stats, df_primary), axis=1)
+    df = flatten_hits(hits)
     
     if verbose:
         print(f'PID: {os.getpid()} ... search_term:', search_term)
@@ -86,39 +126,132 @@ def genius_to_df(search_term, n_results_per_term=10,
 
     return df
 
-def genius_to_dfs(search_terms, **kwargs):
+class HitBuffer:
+    """
+    Columnar accumulator for search hit results.
+
+    Each hit is appended straight into per-column lists, with the nested
+    `stats` and `primary_artist` dicts spread into `stat_*` and
+    `primary_artist_*` columns as it arrives. Columns first seen part-way
+    through are back-filled with None, so the buffers always share one
+    schema and `to_frame` builds a single DataFrame with no concat.
+    """
+
+    NESTED = (('stats', 'stat_'), ('primary_artist', 'primary_artist_'))
+
+    def __init__(self):
+        self.n_rows = 0
+        # top-level columns, then each nested group, in first-seen order
+        self._groups = [{} for _ in range(1 + len(self.NESTED))]
+
+    def _put(self, columns, name, value):
+        column = columns.get(name)
+        if column is None:
+            column = columns[name] = [None] * self.n_rows
+        column.append(value)
+
+    def append(self, hit):
+        """Add one hit `result` dict."""
+        top = self._groups[0]
+        for name, value in hit.items():
+            self._put(top, name, value)
+        for columns, (field, prefix) in zip(self._groups[1:], self.NESTED):
+            nested = hit.get(field)
+            if isinstance(nested, dict):
+                for name, value in nested.items():
+                    self._put(columns, prefix + name, value)
+
+        self.n_rows += 1
+        # pad every column this hit didn't have
+        for columns in self._groups:
+            for column in columns.values():
+                if len(column) < self.n_rows:
+                    column.append(None)
+
+    def extend(self, hits):
+        for hit in hits:
+            self.append(hit)
+
+    def to_frame(self):
+        """Build the combined DataFrame in one step."""
+        import pandas as pd
+
+        data = {}
+        for columns in self._groups:
+            data.update(columns)
+        return pd.DataFrame(data, index=pd.RangeIndex(self.n_rows))
+
+def _search_hits(search_term, n_results_per_term=10):
+    """Return the `result` dicts of one search (picklable for process pools)."""
+    return [hit['result'] for hit in genius(search_term, per_page=n_results_per_term)]
+
+def genius_to_dfs(search_terms, workers=1, executor='thread', 
+                  n_results_per_term=10, verbose=True, savepath=None):
     """
     Generate a pandas.DataFrame from multiple calls to the Genius API.
 
+    Hits are fetched concurrently when `workers` > 1, accumulated into
+    columnar buffers with one shared schema, and turned into a single
+    DataFrame once at the end, so runtime and memory grow linearly with
+    the number of terms.
+
     Parameters
     ----------
     search_terms : list of strings
         List of artists (say) to search in Genius.
-    
-    **kwargs : arguments passed to genius_api.genius_to_df
+    workers : int, optional
+        Number of searches to run at once, by default 1
+    executor : {'thread', 'process'}, optional
+        Run searches in a thread pool or a multiprocessing.Pool, by default 'thread'
+    n_results_per_term : int, optional
+        Number of results "per_page" for each search term provided, by default 10
+    verbose : bool, optional
+        Print each search term as its data arrives, by default True
+    savepath : str, optional
+        Directory to save the combined results to as genius-data.csv
 
     Returns
     -------
     pandas.DataFrame
         The final DataFrame containing the results. 
     """
+    if executor not in ('thread', 'process'):
+        raise ValueError("executor must be 'thread' or 'process'")
+    from tqdm import tqdm
+
+    fetch = partial(_search_hits, n_results_per_term=n_results_per_term)
+    buffer = HitBuffer()
+
+    def collect(results):
+        # results arrive in input order; fold each term's hits into the buffer
+        for search_term, hits in tqdm(zip(search_terms, results), total=len(search_terms)):
+            buffer.extend(hits)
+            if verbose:
+                print(f"Data gathered for {search_term}.")
+
+    if workers <= 1:
+        collect(map(fetch, search_terms))
+    elif executor == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            collect(pool.map(fetch, search_terms))
+    else:
+        with Pool(workers) as pool:
+            collect(pool.imap(fetch, search_terms))
+
+    df = buffer.to_frame()
 
-    dfs = []
-
-    # loop through search_terms in question
-    for search_term in tqdm(search_terms):
-        df = genius_to_df(search_term, **kwargs)
-        
-        # add to list of DataFrames
-        dfs.append(df)
+    if savepath:
+        df.to_csv(os.path.join(savepath, 'genius-data.csv'), index=False)
 
-    return pd.concat(dfs)
+    return df
 
 def testing():
     print('Testing 1, 2, 3 ...')
     return None
 
 def job_test(num, mult=2):
+    from numpy.random import uniform
+
     print(f'PID: {os.getpid()} ... num:', num)
     sleep(uniform(0.5, 1.5))
     return num * mult
@@ -0,0 +1,231 @@
+"""
+On-disk response cache for the Genius API client.
+
+Usage:
+    from apputil import Genius
+    from genius_cache import ResponseCache
+
+    cache = ResponseCache('genius_cache.sqlite', ttl={'search': 86400, 'artists': 7 * 86400},
+                          negative_ttl=3600)
+    genius = Genius.from_env_file('env-1.env', cache=cache)
+
+Negative results (a search whose first hit names no artist, an artist
+lookup with no artist) are cached too, under their own, usually shorter,
+`negative_ttl`. Failed requests (transport errors, 429/5xx) are never
+stored, so they are retried on the next run.
+"""
+
+import json
+import sqlite3
+import time
+
+from genius_sqlite import SQLiteStore
+
+
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL = 6 * 60 * 60
+
+
+def normalize_params(params: dict = None) -> dict:
+    """
+    Normalize request params so equivalent queries share a cache key.
+
+    Only the search text `q` is case- and whitespace-folded; every other
+    value (a lyrics `url`, a page number) is kept as it is.
+    """
+    normalized = {}
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        if key == "q" and isinstance(value, str):
+            value = " ".join(value.split()).casefold()
+        normalized[str(key)] = value
+    return normalized
+
+
+def make_key(endpoint: str, params: dict = None) -> str:
+    """Build a cache key from the endpoint plus normalized params."""
+    endpoint = endpoint.strip("/")
+    query = json.dumps(normalize_params(params), sort_keys=True, separators=(",", ":"))
+    return f"{endpoint}?{query}"
+
+
+def is_negative(endpoint: str, payload) -> bool:
+    """True for a successful response that says there is nothing to find."""
+    if not isinstance(payload, dict):
+        return False
+    section = endpoint.strip("/").split("/", 1)[0]
+    response = payload.get("response")
+    if not isinstance(response, dict):
+        return False
+    if section == "search":
+        # Same rule as Genius.resolve_artist_id: the first hit's primary artist
+        hits = response.get("hits") or [{}]
+        return not hits[0].get("result", {}).get("primary_artist", {}).get("id")
+    if section == "artists" and endpoint.strip("/").count("/") == 1:
+        return not response.get("artist")
+    return False
+
+
+class ResponseCache(SQLiteStore):
+    """
+    SQLite-backed cache of decoded API responses.
+
+    - `ttl` is either a number of seconds for every endpoint, or a dict mapping
+      the first path segment of an endpoint ('search', 'artists', ...) to
+      seconds; endpoints missing from the dict use `default_ttl`.
+    - Negative responses (see `is_negative`) expire after `negative_ttl`
+      seconds instead.
+    - Once more than `max_entries` rows (or `max_bytes` of payload) are stored,
+      the least recently used rows are evicted. Sizes are checked every
+      `evict_every` stores rather than on each one, so a process may overshoot
+      by that many rows; the default keeps this to about 1% of `max_entries`.
+    - `hits`, `misses`, `stores` and `evictions` count activity in this process;
+      `negative_hits` and `negative_stores` count the negative entries among them.
+
+    The file can be shared by several processes; SQLite handles the locking.
+    """
+
+    def __init__(self, path: str = "genius_cache.sqlite", *, ttl=None,
+                 default_ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = 100_000, max_bytes: int = None, evict_every: int = None):
+        super().__init__(path)
+        if isinstance(ttl, (int, float)):
+            default_ttl, ttl = ttl, {}
+        self.ttl = dict(ttl or {})
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        if evict_every is None:
+            evict_every = max(1, min(100, max_entries // 100)) if max_entries else 100
+        self.evict_every = evict_every
+        self._unchecked = 0  # stores since the sizes were last checked
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.negative_hits = 0
+        self.negative_stores = 0
+
+    def _create(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " endpoint TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL in seconds for an endpoint."""
+        section = endpoint.strip("/").split("/", 1)[0]
+        return self.ttl.get(endpoint.strip("/"), self.ttl.get(section, self.default_ttl))
+
+    def get(self, endpoint: str, params: dict = None):
+        """Return the cached response, or None on a miss or an expired entry."""
+        key = make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT payload, expires_at FROM responses WHERE key = ?",
+                               (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        payload = json.loads(row[0])
+        if is_negative(endpoint, payload):
+            with self._lock:
+                self.negative_hits += 1
+        return payload
+
+    def set(self, endpoint: str, params: dict, payload, ttl: float = None):
+        """
+        Store a response and evict least recently used entries if over budget.
+        Without an explicit `ttl`, negative responses get `negative_ttl`.
+        """
+        key = make_key(endpoint, params)
+        body = json.dumps(payload, separators=(",", ":"))
+        now = time.time()
+        negative = is_negative(endpoint, payload)
+        if ttl is None:
+            ttl = self.negative_ttl if negative else self.ttl_for(endpoint)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, endpoint, payload, size, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint.strip("/"), body, len(body), now + ttl, now),
+            )
+            self.stores += 1
+            self.negative_stores += negative
+            # Counting rows scans the table, so only do it every `evict_every` stores
+            self._unchecked += 1
+            if self._unchecked >= self.evict_every:
+                self._unchecked = 0
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used rows until the size limits are met."""
+        if self.max_entries is not None:
+            (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_access LIMIT ?)", (excess,))
+                self.evictions += excess
+        if self.max_bytes is not None:
+            (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            while total > self.max_bytes:
+                row = conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access LIMIT 1").fetchone()
+                if row is None:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+                total -= row[1]
+                self.evictions += 1
+
+    def delete(self, endpoint: str, params: dict = None):
+        """Remove a single cached response."""
+        with self._lock:
+            self._connection().execute("DELETE FROM responses WHERE key = ?",
+                                       (make_key(endpoint, params),))
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry and return how many were removed."""
+        with self._lock:
+            cursor = self._connection().execute("DELETE FROM responses WHERE expires_at <= ?",
+                                                (time.time(),))
+            return cursor.rowcount
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'negative_hits': self.negative_hits,
+            'negative_stores': self.negative_stores,
+        }
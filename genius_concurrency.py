@@ -0,0 +1,171 @@
+"""
+Adaptive (AIMD) limit on the number of Genius API requests in flight.
+
+A fixed worker count is only right for one network and one API mood. With a
+`concurrency` controller, `Genius` asks for a slot before every request and
+reports the outcome afterwards. The controller looks at each window of
+completed requests and changes the limit:
+
+- any 429, 5xx or connection error in the window: multiply the limit by
+  `backoff` (congestion)
+- median latency above `latency_tolerance` times the best median seen:
+  multiply by `backoff` as well (queueing somewhere upstream)
+- otherwise, if every slot was in use and throughput did not drop: add one
+
+Every change is logged with the reason, and kept in `decisions`.
+
+Usage:
+    concurrency = AdaptiveConcurrency(initial=4, max_limit=32)
+    genius = Genius.from_env_file('env-1.env', concurrency=concurrency,
+                                  pool_maxsize=32)
+    # ...then call genius from up to 32 threads
+"""
+
+import statistics
+import threading
+import time
+from collections import deque
+
+
+class AdaptiveConcurrency:
+    """
+    Thread-safe AIMD limiter for requests in flight within one process.
+
+    - `acquire()` blocks until a slot is free and returns the time waited
+    - `release(seconds, status, error)` frees the slot and records the outcome
+    - `limit` is the current number of slots, between `min_limit` and `max_limit`
+    - `log` is called with a message for every change (None to stay quiet)
+    """
+
+    def __init__(self, initial: int = 4, *, min_limit: int = 1, max_limit: int = 32,
+                 backoff: float = 0.5, latency_tolerance: float = 2.0,
+                 min_samples: int = 10, baseline_drift: float = 0.02, log=print):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("need 1 <= min_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.min_samples = min_samples
+        self.baseline_drift = baseline_drift
+        self.log = log
+
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self.baseline = None  # best (drifting) window median latency, in seconds
+        self.decisions = deque(maxlen=1000)  # (time, old limit, new limit, reason)
+        self._previous_throughput = None
+        self._just_decreased = False
+        self._cond = threading.Condition()
+        self._new_window(time.monotonic())
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _new_window(self, now: float):
+        self._window_start = now
+        self._latencies = []
+        self._completed = 0
+        self._congested = 0
+        self._peak = self.in_flight
+
+    def acquire(self) -> float:
+        """Block until fewer than `limit` requests are in flight; return seconds waited."""
+        start = time.monotonic()
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+            self._peak = max(self._peak, self.in_flight)
+        return time.monotonic() - start
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now."""
+        with self._cond:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            self._peak = max(self._peak, self.in_flight)
+        return True
+
+    def release(self, seconds: float = None, status: int = None, error=None):
+        """Free a slot and record how the request went."""
+        with self._cond:
+            self.in_flight -= 1
+            self._completed += 1
+            if status == 429 or (status is not None and status >= 500) \
+                    or (status is None and error is not None):
+                self._congested += 1
+            elif seconds is not None and error is None:
+                self._latencies.append(seconds)
+            if self._completed >= max(self.min_samples, self.limit):
+                self._decide(time.monotonic())
+            self._cond.notify_all()
+
+    def _decide(self, now: float):
+        """Close the current window and adjust the limit. Caller holds the lock."""
+        elapsed = max(now - self._window_start, 1e-9)
+        throughput = self._completed / elapsed
+        median = statistics.median(self._latencies) if self._latencies else None
+
+        old = self._limit
+        reason = None
+        if self._just_decreased:
+            # Requests sent before the last decrease are still reporting; back
+            # off at most once per window so one burst doesn't halve it twice
+            pass
+        elif self._congested:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+            reason = f"{self._congested} throttled/failed of {self._completed} requests"
+        elif median is not None and self.baseline is not None \
+                and median > self.baseline * self.latency_tolerance:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+            reason = (f"median latency {median * 1000:.0f} ms > "
+                      f"{self.latency_tolerance:g}x baseline {self.baseline * 1000:.0f} ms")
+        elif self._peak >= self.limit and (self._previous_throughput is None
+                                           or throughput >= 0.9 * self._previous_throughput):
+            self._limit = min(self.max_limit, self._limit + 1)
+            reason = f"all slots busy, {throughput:.1f} req/s"
+
+        if median is not None:
+            # Let the baseline creep up, so a network that got slower for good
+            # doesn't pin the limit at its minimum forever
+            self.baseline = median if self.baseline is None \
+                else min(median, self.baseline * (1 + self.baseline_drift))
+        self._previous_throughput = throughput
+        self._just_decreased = self._limit < old
+        self._new_window(now)
+
+        if int(old) != self.limit:
+            self.decisions.append((time.time(), int(old), self.limit, reason))
+            if self.log is not None:
+                arrow = "⬆️ " if self.limit > old else "⬇️ "
+                self.log(f"🎚️  {arrow} concurrency {int(old)} -> {self.limit}: {reason}")
+
+    def stats(self) -> dict:
+        """Current limit and a count of the changes made so far."""
+        with self._cond:
+            decisions = list(self.decisions)
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'increases': sum(new > old for _, old, new, _ in decisions),
+            'decreases': sum(new < old for _, old, new, _ in decisions),
+            'peak_limit': max([self.limit] + [new for _, _, new, _ in decisions]),
+            'baseline_ms': None if self.baseline is None else self.baseline * 1000,
+        }
+
+    def __getstate__(self):
+        # Each process limits its own requests; copies start from the current limit
+        state = self.__dict__.copy()
+        state['_cond'] = None
+        state['in_flight'] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cond = threading.Condition()
+        self._new_window(time.monotonic())
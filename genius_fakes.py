@@ -0,0 +1,98 @@
+"""
+Offline stand-ins for `requests`, shared by the test suite.
+
+`FakeSession` records every GET and answers it from `respond`, which tests
+override for their scenario; `ScriptedSession` replays a list of responses
+in order. `make_genius` wires a session into a `Genius` client whose rate
+limiter and retry backoff are fast enough for tests.
+
+    class SearchSession(FakeSession):
+        def respond(self, url, params, headers):
+            return FakeResponse({'response': {'hits': []}})
+
+    genius = make_genius(SearchSession())
+"""
+
+import json
+import threading
+
+from apputil import Genius
+from genius_ratelimit import TokenBucket
+from genius_retry import RetryPolicy
+
+
+class FakeResponse:
+    """A `requests.Response` with a JSON `payload`, or a text `body` streamed in small chunks."""
+
+    encoding = 'utf-8'
+
+    def __init__(self, payload=None, status_code: int = 200, headers: dict = None,
+                 body: str = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._payload = payload or {}
+        self.content = (json.dumps(self._payload) if body is None else body).encode('utf-8')
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"{self.status_code} Error")
+
+    def json(self):
+        return self._payload
+
+    def iter_content(self, chunk_size: int = 1):
+        # Tiny chunks, so streaming parsers see tags split across reads
+        for i in range(0, len(self.content), 7):
+            yield self.content[i:i + 7]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Stands in for `requests.Session`: records each GET and answers it with `respond`."""
+
+    def __init__(self):
+        self.calls = []  # (url, params, headers) of every GET, in order
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, headers=None, stream=False):
+        with self._lock:
+            self.calls.append((url, params, headers))
+        return self.respond(url, params, headers)
+
+    def respond(self, url, params, headers):
+        """Echo the request back as the payload; scenarios override this."""
+        return FakeResponse({'response': {'url': url, 'params': params}})
+
+    def close(self):
+        self.closed = True
+
+    def count(self, suffix: str = '') -> int:
+        """Number of GETs whose URL ends with `suffix`."""
+        with self._lock:
+            return sum(url.endswith(suffix) for url, _, _ in self.calls)
+
+
+class ScriptedSession(FakeSession):
+    """Returns the queued responses in order, one per GET."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    def respond(self, url, params, headers):
+        with self._lock:
+            return self.responses.pop(0)
+
+
+def make_genius(session: FakeSession = None, **kwargs) -> Genius:
+    """A `Genius` client on `session`, with a fast rate limiter and retry backoff."""
+    kwargs.setdefault('rate_limiter', TokenBucket(1000, 100))
+    kwargs.setdefault('retry', RetryPolicy(3, backoff_base=0.001))
+    genius = Genius('token', **kwargs)
+    if session is not None:
+        genius.session = session
+    return genius
@@ -0,0 +1,203 @@
+"""
+Hedged requests for the Genius client.
+
+A few slow responses decide how long a batch takes, because every artist
+waits on its requests one after another. With a `hedge` policy, `Genius`
+runs each GET on a small thread pool. If no answer has come back within
+a tracked latency percentile (p95 by default) of that endpoint, it sends
+a duplicate. The first 2xx response wins; the other request keeps running
+and its response is closed when it finishes.
+
+Only idempotent GETs are hedged. Duplicates are capped at `max_extra`
+times the number of requests, so a slow API never gets twice the load.
+
+Usage:
+    hedge = HedgePolicy(percentile=95, max_extra=0.05)
+    genius = Genius.from_env_file('env-1.env', hedge=hedge)
+    genius.get_artists(search_terms)
+    print(hedge.stats())
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _response(result):
+    """The response in an attempt's result, which may be a (response, extra) tuple."""
+    return result[0] if isinstance(result, tuple) else result
+
+
+def _succeeded(result) -> bool:
+    """True if the attempt got a 2xx; a 5xx or 429 is no better than an error."""
+    return 200 <= getattr(_response(result), "status_code", 200) < 300
+
+
+def _discarder(on_discard):
+    """Done-callback for a losing attempt: hand it to `on_discard`, then release its connection."""
+    def discard(future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if on_discard is not None:
+            on_discard(result)
+        close = getattr(_response(result), "close", None)
+        if close is not None:
+            close()
+    return discard
+
+
+class HedgePolicy:
+    """
+    Decides when to send a duplicate request and races the two.
+
+    - `percentile` of the last `window` successful first attempts per
+      endpoint is how long to wait before hedging; nothing is hedged until
+      `min_samples` attempts have been timed
+    - `max_extra` caps duplicates as a fraction of requests (0.05 = 5%)
+    - `max_workers` threads run the attempts; it should be at least twice
+      the number of threads sharing the client
+
+    Latency samples are per process; a pickled copy starts learning afresh.
+    """
+
+    def __init__(self, percentile: float = 95.0, *, max_extra: float = 0.05,
+                 min_samples: int = 20, window: int = 500, max_workers: int = 64):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if max_extra < 0:
+            raise ValueError("max_extra must not be negative")
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.window = window
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._reset()
+
+    def _reset(self):
+        self._latencies = {}   # endpoint -> deque of recent attempt seconds
+        self.requests = 0
+        self.fired = 0         # duplicates sent
+        self.won = 0           # duplicates that answered first
+        self.declined = 0      # hedges skipped because the budget was spent
+
+    def record(self, endpoint: str, seconds: float):
+        """Add the duration of one successful attempt."""
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def delay(self, endpoint: str):
+        """Seconds to wait before hedging a request, or None if not enough is known yet."""
+        with self._lock:
+            samples = sorted(self._latencies.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * self.percentile / 100))]
+
+    def _take_budget(self, admit=None) -> bool:
+        with self._lock:
+            if self.fired + 1 > self.max_extra * self.requests \
+                    or (admit is not None and not admit()):
+                self.declined += 1
+                return False
+            self.fired += 1
+            return True
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="genius-hedge")
+            return self._executor
+
+    def _timed(self, endpoint: str, send):
+        def attempt():
+            start = time.perf_counter()
+            result = send()
+            if _succeeded(result):
+                self.record(endpoint, time.perf_counter() - start)
+            return result
+        return attempt
+
+    def run(self, endpoint: str, send, send_duplicate, on_discard=None, admit=None) -> tuple:
+        """
+        Call `send()`, racing `send_duplicate()` against it once it is slow.
+
+        Returns (result, hedged, duplicate_won). The first 2xx wins; an error
+        or non-2xx response is only returned if the other attempt does no
+        better. The losing request is not interrupted: `on_discard(result)`
+        is called with it when it finishes, and then its response is closed.
+        If given, `admit()` is asked right before a duplicate would be sent
+        and must not block; returning False skips the hedge.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.delay(endpoint)
+        if delay is None:
+            return self._timed(endpoint, send)(), False, False
+
+        pool = self._pool()
+        first = pool.submit(self._timed(endpoint, send))
+        done, _ = wait([first], timeout=delay)
+        if done or not self._take_budget(admit):
+            return first.result(), False, False
+
+        # Only first attempts are timed: a duplicate may have waited for
+        # rate budget, and it only runs when the first one was slow
+        second = pool.submit(send_duplicate)
+        discard = _discarder(on_discard)
+        pending = {first, second}
+        error, fallback = None, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                if not _succeeded(future.result()):
+                    if fallback is None:
+                        fallback = future
+                    else:
+                        discard(future)
+                    continue
+                for loser in pending:
+                    loser.add_done_callback(discard)
+                if fallback is not None:
+                    discard(fallback)
+                duplicate_won = future is second
+                if duplicate_won:
+                    with self._lock:
+                        self.won += 1
+                return future.result(), True, duplicate_won
+        if fallback is not None:
+            return fallback.result(), True, False
+        raise error
+
+    def stats(self) -> dict:
+        """Requests seen, duplicates sent/won/declined, and the current wait per endpoint."""
+        with self._lock:
+            endpoints = list(self._latencies)
+            stats = {'requests': self.requests, 'fired': self.fired, 'won': self.won,
+                     'declined': self.declined}
+        stats['delay_ms'] = {}
+        for endpoint in endpoints:
+            delay = self.delay(endpoint)
+            stats['delay_ms'][endpoint] = None if delay is None else round(delay * 1000, 1)
+        return stats
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_executor'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._reset()
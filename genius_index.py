@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Persistent local index from artist names to Genius artist IDs.
+
+`Genius.resolve_artist_id` spends a /search request just to learn an artist
+ID. With an `ArtistIndex` attached, the client asks the index first and only
+searches on a miss; every successful search teaches the index both the search
+term and the primary artist's name.
+
+Names are compared in a canonical form that is case-folded, accent-stripped,
+punctuation-free, drops 'the' and sorts its tokens, so 'Beyoncé',
+'beyonce' and 'BEYONCE ' share one key, as do 'Beatles, The' and
+'The Beatles'. A term with no exact key still matches a name that differs
+only in how its words are split ('ACDC' and 'AC/DC', 'JayZ' and 'Jay-Z'),
+found through a trigram lookup, as long as the numbers in both agree and
+every such name points to one artist. Anything else, even one letter or
+digit apart ('Artist 11' and 'Artist 1'), is a miss and gets searched.
+
+Usage:
+    index = ArtistIndex('genius_index.sqlite')
+    genius = Genius.from_env_file('env-1.env', index=index)
+
+    # seed it from earlier collector output
+    python genius_index.py artist_data_20240101_120000.csv --index genius_index.sqlite
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+
+from genius_sqlite import SQLiteStore
+
+
+def canonical_name(name: str) -> str:
+    """Case-, accent-, punctuation- and word-order-insensitive form of a name."""
+    text = unicodedata.normalize('NFKD', name.casefold().replace('&', ' and '))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    tokens = re.findall(r'\w+', text)
+    tokens = [t for t in tokens if t != 'the'] or tokens
+    return ' '.join(sorted(tokens))
+
+
+def same_name(key: str, other: str) -> bool:
+    """True if two canonical keys differ at most in where their words split."""
+    numbers = sorted(t for t in key.split() if t.isdigit())
+    other_numbers = sorted(t for t in other.split() if t.isdigit())
+    return numbers == other_numbers and key.replace(' ', '') == other.replace(' ', '')
+
+
+def trigrams(key: str) -> set:
+    """Character trigrams of a canonical key, padded so short names still have some."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ArtistIndex(SQLiteStore):
+    """
+    SQLite-backed map of canonical artist names to artist IDs.
+
+    - `lookup(name)` returns an artist ID or None
+    - `add(name, artist_id)` records a name -> ID pair
+    - a term with no exact key matches only a name that is the `same_name`
+      up to word splits, out of the `candidates` sharing most trigrams
+    - `exact_hits`, `fuzzy_hits` (word-split matches) and `misses` count
+      lookups in this process
+
+    Like `ResponseCache`, the file can be shared by several processes.
+    """
+
+    def __init__(self, path: str = "genius_index.sqlite", *, candidates: int = 20):
+        super().__init__(path)
+        self.candidates = candidates
+
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def _create(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS names ("
+            " key TEXT PRIMARY KEY,"
+            " artist_id INTEGER NOT NULL,"
+            " name TEXT NOT NULL,"
+            " grams INTEGER NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS grams ("
+            " gram TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " PRIMARY KEY (gram, key)) WITHOUT ROWID"
+        )
+
+    def add(self, name: str, artist_id: int, display_name: str = None) -> bool:
+        """Record that `name` means `artist_id`. Returns False for unusable input."""
+        key = canonical_name(name or '')
+        if not key or not artist_id or artist_id == 'N/A':
+            return False
+        grams = trigrams(key)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO names (key, artist_id, name, grams, updated)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, int(artist_id), display_name or name, len(grams), time.time()),
+                )
+                conn.executemany("INSERT OR IGNORE INTO grams (gram, key) VALUES (?, ?)",
+                                 [(gram, key) for gram in grams])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def add_rows(self, rows) -> int:
+        """Learn from `get_artists` rows (search term and artist name); returns pairs added."""
+        added = 0
+        for row in rows:
+            artist_id = row.get('artist_id')
+            if artist_id in (None, '', 'N/A'):
+                continue
+            added += self.add(row.get('search_term'), artist_id, row.get('artist_name'))
+            if row.get('artist_name') not in (None, '', 'N/A'):
+                added += self.add(row['artist_name'], artist_id)
+        return added
+
+    def match(self, name: str):
+        """Return (artist_id, exact) for the name's artist, or None if it isn't known."""
+        key = canonical_name(name or '')
+        if not key:
+            return None
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT artist_id FROM names WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                return row[0], True
+
+            grams = trigrams(key)
+            placeholders = ",".join("?" * len(grams))
+            candidates = conn.execute(
+                "SELECT g.key, n.artist_id, COUNT(*) AS shared"
+                " FROM grams g JOIN names n ON n.key = g.key"
+                f" WHERE g.gram IN ({placeholders})"
+                " GROUP BY g.key ORDER BY shared DESC LIMIT ?",
+                (*grams, self.candidates),
+            ).fetchall()
+
+        # A near miss by spelling is as likely another artist ('Artist 11' vs
+        # 'Artist 1'), so only word splits are forgiven, and only unambiguously
+        artist_ids = {artist_id for other, artist_id, _ in candidates if same_name(key, other)}
+        if len(artist_ids) != 1:
+            return None
+        return artist_ids.pop(), False
+
+    def lookup(self, name: str):
+        """Return the artist ID for `name`, or None if it isn't known."""
+        found = self.match(name)
+        with self._lock:
+            if found is None:
+                self.misses += 1
+            elif found[1]:
+                self.exact_hits += 1
+            else:
+                self.fuzzy_hits += 1
+        return None if found is None else found[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return the lookup counters for this process."""
+        lookups = self.exact_hits + self.fuzzy_hits + self.misses
+        hits = self.exact_hits + self.fuzzy_hits
+        return {
+            'exact_hits': self.exact_hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+
+
+def read_rows(path: str):
+    """Yield rows from a collector CSV output or JSONL checkpoint journal."""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        if path.endswith('.jsonl'):
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+        else:
+            yield from csv.DictReader(file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the local artist index from past results.")
+    parser.add_argument('paths', nargs='+', help="collector CSV outputs or checkpoint journals")
+    parser.add_argument('--index', default='genius_index.sqlite',
+                        help="index file to update (default: genius_index.sqlite)")
+    args = parser.parse_args(argv)
+
+    index = ArtistIndex(args.index)
+    for path in args.paths:
+        added = index.add_rows(read_rows(path))
+        print(f"📇 {path}: {added} names indexed")
+    print(f"✅ {args.index} now holds {len(index)} names")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Append-only checkpoint journal for the artist collection scripts.
+
+Each finished search term is written to the journal as one JSON line the
+moment its result is known, so a crash or Ctrl-C loses at most the terms that
+were still in flight. A resumed run skips every term already in the journal,
+except those whose requests failed (rows with `error` set), which are looked
+up again. The final CSV is produced by compacting the journal back into input
+order.
+"""
+
+import json
+import os
+
+from apputil import normalize_term
+from genius_records import ArtistRecord
+
+
+def _to_json(value):
+    """Convert numpy scalars (from DataFrame rows) into plain Python values."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class CheckpointJournal:
+    """
+    JSON-lines journal of completed `get_artists` rows.
+
+    Only a map from each term to the file offset of its latest line is held
+    in memory; `iter_compact` reads the rows back from disk as plain dicts,
+    so memory stays flat however many artists are journaled.
+
+    Usage:
+        journal = CheckpointJournal('artist_data_checkpoint.jsonl', resume=True)
+        todo = journal.pending(artists)
+        ...
+        journal.record(row)
+        rows = journal.compact(artists)
+    """
+
+    def __init__(self, path: str, *, resume: bool = False):
+        self.path = path
+        self._offsets = {}    # normalized term -> file offset of its latest line
+        self._failed = set()  # normalized terms whose latest line is a failed lookup
+        if resume:
+            self._load()
+        elif os.path.exists(path):
+            # A fresh run starts a fresh journal
+            os.remove(path)
+        self._file = open(path, 'ab')
+
+    def _load(self):
+        """Index completed rows, cutting off a torn final line from a crash."""
+        try:
+            with open(self.path, 'rb') as file:
+                offset = 0
+                for line in file:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self._index(normalize_term(row['search_term']), offset,
+                                bool(row.get('error')))
+                    offset += len(line)
+        except FileNotFoundError:
+            return
+        if offset < os.path.getsize(self.path):
+            # New rows must not be appended onto the end of a half-written one
+            os.truncate(self.path, offset)
+
+    def _index(self, key: str, offset: int, failed: bool):
+        self._offsets[key] = offset
+        if failed:
+            self._failed.add(key)
+        else:
+            self._failed.discard(key)
+
+    def __len__(self) -> int:
+        """Number of finished terms; failed lookups don't count."""
+        return len(self._offsets) - len(self._failed)
+
+    def __contains__(self, search_term: str) -> bool:
+        key = normalize_term(search_term)
+        return key in self._offsets and key not in self._failed
+
+    def pending(self, search_terms: list) -> list:
+        """Return the distinct search terms that are not finished yet, or whose lookup failed."""
+        pending = {}
+        for term in search_terms:
+            if term not in self:
+                pending.setdefault(normalize_term(term), term)
+        return list(pending.values())
+
+    def _append(self, row):
+        record = row if isinstance(row, ArtistRecord) else ArtistRecord.from_dict(row)
+        entry = record.to_dict()
+        if record.error:
+            entry['error'] = True
+        line = json.dumps(entry, ensure_ascii=False, default=_to_json) + '\n'
+        self._index(normalize_term(record.search_term), self._file.tell(), record.error)
+        self._file.write(line.encode('utf-8'))
+
+    def record(self, row):
+        """Append one finished row (dict or ArtistRecord) and flush it to disk."""
+        self._append(row)
+        self._file.flush()
+
+    def record_many(self, rows):
+        """Append several finished rows, syncing once at the end."""
+        for row in rows:
+            self._append(row)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def iter_compact(self, search_terms):
+        """
+        Yield one row per input term, in input order, read back from the
+        journal. Terms with no journal entry are left out; failed lookups
+        are 'N/A' rows with `error` set.
+        """
+        self._file.flush()
+        with open(self.path, 'rb') as file:
+            for term in search_terms:
+                offset = self._offsets.get(normalize_term(term))
+                if offset is not None:
+                    file.seek(offset)
+                    yield dict(json.loads(file.readline()), search_term=term)
+
+    def compact(self, search_terms: list) -> list:
+        """Return `iter_compact(search_terms)` as a list."""
+        return list(self.iter_compact(search_terms))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
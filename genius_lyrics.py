@@ -0,0 +1,129 @@
+"""
+Targeted lyrics extraction from Genius song pages.
+
+`LyricsExtractor` is a streaming `html.parser.HTMLParser`: it is fed the page
+in chunks as they come off the socket, keeps only the text inside lyrics
+containers and never builds a DOM. It understands both page layouts:
+- current pages: one or more `<div data-lyrics-container="true">`
+- older pages:   a single `<div class="lyrics">`
+
+`<br>` becomes a newline and elements marked
+`data-exclude-from-selection="true"` (contributor headers and the like) are
+skipped. Everything before the first container is skipped with a regex scan
+instead of being tokenized, which is most of a song page.
+
+Usage:
+    lyrics = extract_lyrics(html)
+    lyrics = extract_lyrics_stream(response.iter_content(16384), response.encoding)
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+
+# Opening tag of either container layout
+CONTAINER_RE = re.compile(
+    r'<div\b[^>]*?(?:data-lyrics-container="true"|class="(?:[^"]*\s)?lyrics[\s"])')
+# Longest tail kept while looking for a container split across two chunks
+_SCAN_OVERLAP = 512
+
+
+class LyricsExtractor(HTMLParser):
+    """Collects the text of lyrics containers while the page is being fed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.containers = []   # finished containers' text
+        self.legacy = False    # saw the old single `div.lyrics` layout
+        self._parts = None     # text pieces of the open container
+        self._depth = 0        # open <div>s inside the current container
+        self._skip_depth = 0   # open <div>s inside an excluded element
+        self._pending = ''     # unparsed text while still seeking the first container
+
+    def feed(self, data: str):
+        if self._pending is None:
+            return super().feed(data)
+        text = self._pending + data
+        match = CONTAINER_RE.search(text)
+        if match is None:
+            self._pending = text[-_SCAN_OVERLAP:]
+            return
+        self._pending = None
+        super().feed(text[match.start():])
+
+    @property
+    def done(self) -> bool:
+        """True once the old layout's only container has been closed."""
+        return self.legacy and self._parts is None and bool(self.containers)
+
+    def handle_starttag(self, tag, attrs):
+        if self._parts is None:
+            if tag != 'div':
+                return
+            attrs = dict(attrs)
+            if attrs.get('data-lyrics-container') == 'true':
+                self._parts, self._depth = [], 1
+            elif 'lyrics' in (attrs.get('class') or '').split():
+                self._parts, self._depth, self.legacy = [], 1, True
+            return
+
+        if tag == 'div':
+            self._depth += 1
+            if self._skip_depth:
+                self._skip_depth += 1
+            elif dict(attrs).get('data-exclude-from-selection') == 'true':
+                self._skip_depth = 1
+        elif tag == 'br' and not self._skip_depth:
+            self._parts.append('\n')
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> and friends never open an element
+        if self._parts is not None and not self._skip_depth and tag == 'br':
+            self._parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if self._parts is None or tag != 'div':
+            return
+        if self._skip_depth:
+            self._skip_depth -= 1
+        self._depth -= 1
+        if self._depth == 0:
+            self.containers.append(''.join(self._parts))
+            self._parts = None
+
+    def handle_data(self, data):
+        if self._parts is not None and not self._skip_depth:
+            self._parts.append(data)
+
+    def text(self) -> str:
+        """The lyrics found so far, one line per line, or '' if none."""
+        parts = self.containers + ([''.join(self._parts)] if self._parts else [])
+        lines = '\n'.join(parts).splitlines()
+        return '\n'.join(line.strip() for line in lines).strip()
+
+
+def extract_lyrics(html: str) -> str:
+    """Return the lyrics text of a whole song page ('' if there is none)."""
+    extractor = LyricsExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+def extract_lyrics_stream(chunks, encoding: str = None) -> str:
+    """
+    Like `extract_lyrics`, but fed from an iterable of byte chunks (such as
+    `response.iter_content()`), stopping early once an old-layout page's
+    lyrics are complete.
+    """
+    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    extractor = LyricsExtractor()
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done:
+            break
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+    return extractor.text()
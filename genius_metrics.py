@@ -0,0 +1,362 @@
+"""
+Per-request instrumentation for the Genius client.
+
+`Genius` calls its `on_request_start` / `on_request_end` hooks around every
+network attempt and reports cache hits, rate-limit waits and retry backoff.
+`RequestMetrics` is the default listener: it keeps per-endpoint latency
+histograms, counts by status code, retry/cache/hedge counters and bytes received,
+and exports them as Prometheus text or a JSON-friendly summary.
+
+Together the numbers say where a run's time went:
+- mostly network time                     -> latency-bound, add concurrency
+- mostly rate-limit waits and 429 backoff -> throttle-bound, concurrency won't help
+- mostly backoff after 5xx/errors         -> failure-bound, the upstream is unhealthy
+- none of these                           -> CPU-bound in parsing/processing
+
+Usage:
+    genius = Genius(token)
+    genius.get_artists(search_terms)
+    print(genius.metrics.to_prometheus())
+    json.dump(genius.metrics.summary(), file)
+"""
+
+import bisect
+import json
+import threading
+
+
+# Upper bounds in seconds, Prometheus-style; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Group an endpoint by its first path segment ('artists/123' -> 'artists')."""
+    return endpoint.strip("/").split("/", 1)[0]
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with a running sum and count."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in
+        (None if it is past the last finite bucket).
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return None  # beyond the largest bucket
+
+
+class RequestMetrics:
+    """
+    Thread-safe counters fed by the `Genius` request hooks.
+
+    Snapshots from other processes (see `snapshot` / `merge`) can be folded
+    in, so a process pool still produces one set of totals.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.reset()
+
+    def _zero(self):
+        self.latency = {}         # endpoint -> Histogram of attempt wall time
+        self.status_counts = {}   # (endpoint, status) -> count; status 'error' for no response
+        self.bytes_received = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_negative_hits = 0  # hits that were cached "nothing found" answers
+        self.index_hits = 0
+        self.index_misses = 0
+        self.hedges = 0           # requests raced against a duplicate
+        self.hedge_wins = 0       # ...where the duplicate answered first
+        # retry_backoff is sleep after 5xx/connection errors; throttle_backoff
+        # is sleep the API asked for with a 429 or Retry-After
+        self.seconds = {'network': 0.0, 'first_byte': 0.0, 'json_decode': 0.0,
+                        'rate_limit_wait': 0.0, 'throttle_backoff': 0.0, 'retry_backoff': 0.0}
+
+    def reset(self):
+        """Zero every counter except the in-flight gauge."""
+        with self._lock:
+            self._zero()
+
+    # --- hooks -----------------------------------------------------------
+
+    def request_started(self, event: dict):
+        with self._lock:
+            self.in_flight += 1
+            self.seconds['rate_limit_wait'] += event.get('rate_limit_wait', 0.0)
+
+    def request_finished(self, event: dict):
+        endpoint = endpoint_label(event['endpoint'])
+        status = event.get('status') or 'error'
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram(self.buckets)
+            histogram.observe(event['seconds'])
+            key = (endpoint, str(status))
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            self.bytes_received += event.get('bytes', 0)
+            self.seconds['network'] += event['seconds']
+            self.seconds['first_byte'] += event.get('first_byte', 0.0)
+            self.seconds['json_decode'] += event.get('json_decode', 0.0)
+            self.hedges += bool(event.get('hedged'))
+            self.hedge_wins += bool(event.get('hedge_won'))
+
+    def cache_lookup(self, endpoint: str, hit: bool, negative: bool = False):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+                self.cache_negative_hits += negative
+            else:
+                self.cache_misses += 1
+
+    def index_lookup(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.index_hits += 1
+            else:
+                self.index_misses += 1
+
+    def retry_scheduled(self, endpoint: str, delay: float, throttled: bool = False):
+        """Count a retry; `throttled` if the API asked us to slow down (429/Retry-After)."""
+        with self._lock:
+            self.retries += 1
+            self.seconds['throttle_backoff' if throttled else 'retry_backoff'] += delay
+
+    # --- aggregation -----------------------------------------------------
+
+    @property
+    def requests(self) -> int:
+        return sum(self.status_counts.values())
+
+    def _raw(self) -> dict:
+        return {
+            'latency': {k: (h.counts[:], h.sum, h.count) for k, h in self.latency.items()},
+            'status_counts': dict(self.status_counts),
+            'bytes_received': self.bytes_received,
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_negative_hits': self.cache_negative_hits,
+            'index_hits': self.index_hits,
+            'index_misses': self.index_misses,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'seconds': dict(self.seconds),
+        }
+
+    def snapshot(self) -> dict:
+        """Picklable copy of the raw counters, for sending between processes."""
+        with self._lock:
+            return self._raw()
+
+    def merge(self, snapshot: dict):
+        """Add a `snapshot()` from another client or process into these totals."""
+        with self._lock:
+            for endpoint, (counts, total, count) in snapshot['latency'].items():
+                other = Histogram(self.buckets)
+                other.counts, other.sum, other.count = list(counts), total, count
+                self.latency.setdefault(endpoint, Histogram(self.buckets)).merge(other)
+            for key, n in snapshot['status_counts'].items():
+                self.status_counts[key] = self.status_counts.get(key, 0) + n
+            self.bytes_received += snapshot['bytes_received']
+            self.retries += snapshot['retries']
+            self.cache_hits += snapshot['cache_hits']
+            self.cache_misses += snapshot['cache_misses']
+            self.cache_negative_hits += snapshot.get('cache_negative_hits', 0)
+            self.index_hits += snapshot.get('index_hits', 0)
+            self.index_misses += snapshot.get('index_misses', 0)
+            self.hedges += snapshot.get('hedges', 0)
+            self.hedge_wins += snapshot.get('hedge_wins', 0)
+            for name, value in snapshot['seconds'].items():
+                self.seconds[name] = self.seconds.get(name, 0.0) + value
+
+    def drain(self) -> dict:
+        """Return a snapshot and reset, so repeated drains never double count."""
+        with self._lock:
+            snapshot = self._raw()
+            self._zero()
+        return snapshot
+
+    def bottleneck(self, wall_seconds: float, workers: int = 1) -> str:
+        """Name what the run was mostly waiting on: 'latency', 'throttle', 'failure' or 'cpu'."""
+        budget = wall_seconds * max(1, workers)
+        if budget <= 0:
+            return 'cpu'
+        waits = {
+            'latency': self.seconds['network'],
+            'throttle': self.seconds['rate_limit_wait'] + self.seconds['throttle_backoff'],
+            'failure': self.seconds['retry_backoff'],
+        }
+        slowest = max(waits, key=waits.get)
+        return slowest if waits[slowest] >= 0.5 * budget else 'cpu'
+
+    def summary(self, wall_seconds: float = None, workers: int = 1) -> dict:
+        """JSON-friendly totals, per-endpoint latency estimates and time breakdown."""
+        with self._lock:
+            endpoints = {}
+            for endpoint, histogram in sorted(self.latency.items()):
+                endpoints[endpoint] = {
+                    'requests': histogram.count,
+                    'mean_ms': round(histogram.sum / histogram.count * 1000, 2),
+                    'p50_ms_le': _ms(histogram.quantile(0.50)),
+                    'p95_ms_le': _ms(histogram.quantile(0.95)),
+                    'p99_ms_le': _ms(histogram.quantile(0.99)),
+                    'status_counts': {status: n for (ep, status), n
+                                      in sorted(self.status_counts.items()) if ep == endpoint},
+                }
+            lookups = self.cache_hits + self.cache_misses
+            index_lookups = self.index_hits + self.index_misses
+            summary = {
+                'requests': sum(self.status_counts.values()),
+                'retries': self.retries,
+                'bytes_received': self.bytes_received,
+                'cache': {'hits': self.cache_hits, 'misses': self.cache_misses,
+                          'negative_hits': self.cache_negative_hits,
+                          'hit_rate': self.cache_hits / lookups if lookups else 0.0},
+                'index': {'hits': self.index_hits, 'misses': self.index_misses,
+                          'hit_rate': self.index_hits / index_lookups if index_lookups else 0.0},
+                'hedges': {'fired': self.hedges, 'won': self.hedge_wins},
+                'seconds': {name: round(value, 4) for name, value in self.seconds.items()},
+                'endpoints': endpoints,
+                # pNN_ms_le is None past this bound
+                'last_bucket_ms': _ms(self.buckets[-1]),
+            }
+        if wall_seconds is not None:
+            summary['wall_seconds'] = round(wall_seconds, 4)
+            summary['workers'] = workers
+            summary['bottleneck'] = self.bottleneck(wall_seconds, workers)
+        return summary
+
+    def to_prometheus(self, prefix: str = 'genius') -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        with self._lock:
+            metric('request_duration_seconds', 'histogram',
+                   "Wall time of each HTTP attempt, by endpoint.")
+            for endpoint, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                bounds = [str(b) for b in histogram.buckets] + ['+Inf']
+                for bound, n in zip(bounds, histogram.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_request_duration_seconds_bucket'
+                                 f'{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_request_duration_seconds_sum'
+                             f'{{endpoint="{endpoint}"}} {histogram.sum}')
+                lines.append(f'{prefix}_request_duration_seconds_count'
+                             f'{{endpoint="{endpoint}"}} {histogram.count}')
+
+            metric('requests_total', 'counter', "HTTP attempts by endpoint and status code.")
+            for (endpoint, status), n in sorted(self.status_counts.items()):
+                lines.append(f'{prefix}_requests_total'
+                             f'{{endpoint="{endpoint}",status="{status}"}} {n}')
+
+            metric('response_bytes_total', 'counter', "Response body bytes received.")
+            lines.append(f"{prefix}_response_bytes_total {self.bytes_received}")
+            metric('retries_total', 'counter', "Attempts retried after a transient failure.")
+            lines.append(f"{prefix}_retries_total {self.retries}")
+            metric('cache_lookups_total', 'counter', "Response cache lookups by result.")
+            lines.append(f'{prefix}_cache_lookups_total{{result="hit"}} {self.cache_hits}')
+            lines.append(f'{prefix}_cache_lookups_total{{result="miss"}} {self.cache_misses}')
+            metric('cache_negative_hits_total', 'counter',
+                   "Cache hits that were stored 'nothing found' responses.")
+            lines.append(f"{prefix}_cache_negative_hits_total {self.cache_negative_hits}")
+            metric('index_lookups_total', 'counter', "Local artist index lookups by result.")
+            lines.append(f'{prefix}_index_lookups_total{{result="hit"}} {self.index_hits}')
+            lines.append(f'{prefix}_index_lookups_total{{result="miss"}} {self.index_misses}')
+            metric('hedged_requests_total', 'counter',
+                   "Requests raced against a duplicate, by which attempt answered first.")
+            lines.append(f'{prefix}_hedged_requests_total{{winner="first"}} '
+                         f'{self.hedges - self.hedge_wins}')
+            lines.append(f'{prefix}_hedged_requests_total{{winner="duplicate"}} {self.hedge_wins}')
+            metric('time_seconds_total', 'counter',
+                   "Seconds spent per phase, summed over threads.")
+            for name, value in sorted(self.seconds.items()):
+                lines.append(f'{prefix}_time_seconds_total{{phase="{name}"}} {value}')
+            metric('requests_in_flight', 'gauge', "HTTP attempts currently running.")
+            lines.append(f"{prefix}_requests_in_flight {self.in_flight}")
+        return "\n".join(lines) + "\n"
+
+
+def write_reports(metrics: RequestMetrics, basepath: str, wall_seconds: float,
+                  workers: int = 1) -> tuple:
+    """
+    Write `<basepath>_metrics.json` (the summary) and `<basepath>_metrics.prom`
+    (Prometheus text) and return both paths along with the summary.
+    """
+    summary = metrics.summary(wall_seconds, workers)
+    json_path, prom_path = f"{basepath}_metrics.json", f"{basepath}_metrics.prom"
+    with open(json_path, 'w', encoding='utf-8') as file:
+        json.dump(summary, file, indent=2)
+    with open(prom_path, 'w', encoding='utf-8') as file:
+        file.write(metrics.to_prometheus())
+    return json_path, prom_path, summary
+
+
+def print_summary(summary: dict):
+    """Print the headline numbers of a `RequestMetrics.summary()`."""
+    seconds = summary['seconds']
+    print(f"🌐 HTTP attempts: {summary['requests']} ({summary['retries']} retried), "
+          f"{summary['bytes_received'] / 1024:.1f} KiB received")
+    for endpoint, stats in summary['endpoints'].items():
+        statuses = ", ".join(f"{status}: {n}" for status, n in stats['status_counts'].items())
+        p95 = (f"<= {stats['p95_ms_le']}" if stats['p95_ms_le'] is not None
+               else f"> {summary['last_bucket_ms']}")
+        print(f"   /{endpoint}: mean {stats['mean_ms']} ms, p95 {p95} ms ({statuses})")
+    print(f"⏳ Time in network {seconds['network']:.2f}s, rate-limit waits "
+          f"{seconds['rate_limit_wait']:.2f}s, 429 backoff "
+          f"{seconds.get('throttle_backoff', 0.0):.2f}s, error backoff "
+          f"{seconds['retry_backoff']:.2f}s, JSON decode {seconds['json_decode']:.2f}s")
+    cache = summary['cache']
+    if cache['hits'] + cache['misses']:
+        print(f"🗄️  Cache: {cache['hits']} hits ({cache['negative_hits']} known misses), "
+              f"{cache['misses']} misses ({cache['hit_rate']*100:.1f}% hit rate)")
+    index = summary['index']
+    if index['hits'] + index['misses']:
+        print(f"📇 Artist index: {index['hits']} resolved locally, {index['misses']} searched "
+              f"({index['hit_rate']*100:.1f}% hit rate)")
+    hedges = summary.get('hedges', {})
+    if hedges.get('fired'):
+        print(f"🏇 Hedged requests: {hedges['fired']} duplicates sent "
+              f"({hedges['fired'] / max(1, summary['requests']) * 100:.1f}% extra), "
+              f"{hedges['won']} answered first")
+    if 'bottleneck' in summary:
+        print(f"🔎 Mostly {summary['bottleneck']}-bound")
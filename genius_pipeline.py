@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Staged, concurrent ingest pipeline: search -> artist -> songs -> lyrics.
+
+Each `Stage` has its own worker count and a bounded input queue. Stages run
+side by side, with items flowing between them as soon as they are ready. A
+full queue blocks the stage in front of it (backpressure), so a slow stage
+holds back its producers instead of letting memory grow. Throughput is then
+set by the slowest stage rather than by the sum of all of them.
+
+Stages run on threads by default, which suits the network calls of the
+blocking `Genius` client. A stage with `processes=True` hands each item to a
+process pool instead, for CPU-bound work such as parsing lyrics pages.
+
+Usage:
+    genius = Genius.from_env_file('env-1.env', pool_maxsize=32)
+    pipeline = Pipeline(ingest_stages(genius, parse_processes=2))
+    for song in pipeline.run(['Radiohead', 'Seal']):
+        print(song['artist_name'], song['title'], len(song['lyrics']))
+    pipeline.print_stats()
+
+    # or from the command line, writing one JSON line per song
+    python genius_pipeline.py --artists artists_list.txt --out songs.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from genius_lyrics import extract_lyrics
+from genius_records import MISSING
+
+
+_DONE = object()  # end-of-stream marker passed from one stage to the next
+_POLL = 0.1       # seconds between checks for a cancelled run while blocked
+
+
+class Stage:
+    """
+    One step of a `Pipeline`.
+
+    - `func(item)` returns the item to pass on, or None to drop it; with
+      `fan_out=True` it returns (or yields) any number of items instead
+    - `workers` items are processed at once
+    - `queue_size` bounds the stage's input queue (default: the pipeline's)
+    - `processes=True` runs `func` in a process pool; it and its items
+      must then pickle, so use a module-level function
+    """
+
+    def __init__(self, name: str, func, *, workers: int = 4, fan_out: bool = False,
+                 processes: bool = False, queue_size: int = None):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.fan_out = fan_out
+        self.processes = processes
+        self.queue_size = queue_size
+
+
+class _StageState:
+    """Runtime counters and queue for one stage of one run."""
+
+    def __init__(self, stage: Stage, queue_size: int):
+        self.stage = stage
+        self.inbox = queue.Queue(maxsize=stage.queue_size or queue_size)
+        self.lock = threading.Lock()
+        self.finished_workers = 0
+        self.pool = None
+        self.received = 0
+        self.emitted = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0.0       # seconds spent inside func, summed over workers
+        self.blocked = 0.0    # seconds spent waiting for room downstream
+        self.peak_queue = 0
+
+    def stats(self, wall_seconds: float) -> dict:
+        stage = self.stage
+        return {
+            'stage': stage.name,
+            'workers': stage.workers,
+            'kind': 'process' if stage.processes else 'thread',
+            'in': self.received,
+            'out': self.emitted,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'busy_seconds': self.busy,
+            'blocked_seconds': self.blocked,
+            'peak_queue': self.peak_queue,
+            # share of the stage's worker time spent working; ~1.0 marks the bottleneck
+            'utilization': self.busy / (stage.workers * wall_seconds) if wall_seconds else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Runs items through a list of `Stage`s concurrently.
+
+    `run(items)` is a generator of the last stage's output, in completion
+    order. Stopping early (closing the generator) cancels the rest of the
+    run. `stats()` describes the last run, stage by stage.
+    """
+
+    def __init__(self, stages, *, queue_size: int = 64):
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self._states = []
+        self._wall = 0.0
+
+    def _put(self, target: queue.Queue, item, stop: threading.Event) -> bool:
+        """Block until `item` fits in `target`; False if the run was cancelled."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                return source.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _worker(self, index: int, outbox: queue.Queue, stop: threading.Event):
+        state = self._states[index]
+        stage = state.stage
+        downstream = self._states[index + 1].stage.workers if index + 1 < len(self._states) else 1
+        try:
+            while True:
+                item = self._get(state.inbox, stop)
+                if item is _DONE:
+                    break
+                with state.lock:
+                    state.received += 1
+                    state.peak_queue = max(state.peak_queue, state.inbox.qsize() + 1)
+
+                start = time.perf_counter()
+                try:
+                    if state.pool is not None:
+                        result = state.pool.submit(stage.func, item).result()
+                    else:
+                        result = stage.func(item)
+                    outputs = result if stage.fan_out else ([] if result is None else [result])
+                    sent = 0
+                    for output in outputs:
+                        # Time spent blocked downstream isn't this stage's work
+                        busy = time.perf_counter() - start
+                        put_start = time.perf_counter()
+                        if not self._put(outbox, output, stop):
+                            return
+                        blocked = time.perf_counter() - put_start
+                        start = time.perf_counter()
+                        with state.lock:
+                            state.busy += busy
+                            state.blocked += blocked
+                            state.emitted += 1
+                        sent += 1
+                except Exception as e:
+                    print(f"❌ {stage.name} failed: {e}")
+                    with state.lock:
+                        state.errors += 1
+                    continue
+                finally:
+                    with state.lock:
+                        state.busy += time.perf_counter() - start
+                if sent == 0:
+                    with state.lock:
+                        state.dropped += 1
+        finally:
+            # The last worker out tells every worker of the next stage to stop
+            with state.lock:
+                state.finished_workers += 1
+                last = state.finished_workers == stage.workers
+            if last:
+                for _ in range(downstream):
+                    self._put(outbox, _DONE, stop)
+
+    def run(self, items):
+        """Feed `items` in and yield the pipeline's output as it is produced."""
+        self._states = [_StageState(stage, self.queue_size) for stage in self.stages]
+        output = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        threads = []
+        start = time.perf_counter()
+
+        def feed():
+            first = self._states[0]
+            try:
+                for item in items:
+                    if not self._put(first.inbox, item, stop):
+                        return
+            finally:
+                for _ in range(first.stage.workers):
+                    self._put(first.inbox, _DONE, stop)
+
+        try:
+            for index, state in enumerate(self._states):
+                if state.stage.processes:
+                    # spawn, because forking a process that is running threads is unsafe
+                    state.pool = ProcessPoolExecutor(max_workers=state.stage.workers,
+                                                     mp_context=mp.get_context('spawn'))
+                outbox = self._states[index + 1].inbox if index + 1 < len(self._states) else output
+                for n in range(state.stage.workers):
+                    thread = threading.Thread(target=self._worker, args=(index, outbox, stop),
+                                              name=f"{state.stage.name}-{n}", daemon=True)
+                    thread.start()
+                    threads.append(thread)
+            feeder = threading.Thread(target=feed, name="feed", daemon=True)
+            feeder.start()
+            threads.append(feeder)
+
+            while True:
+                item = self._get(output, stop)
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            for state in self._states:
+                if state.pool is not None:
+                    state.pool.shutdown(cancel_futures=True)
+            self._wall = time.perf_counter() - start
+
+    def stats(self) -> list:
+        """Per-stage counts, busy/blocked time and utilization for the last run."""
+        return [state.stats(self._wall) for state in self._states]
+
+    def bottleneck(self) -> str:
+        """Name of the stage whose workers were busiest in the last run."""
+        stats = self.stats()
+        return max(stats, key=lambda s: s['utilization'])['stage'] if stats else None
+
+    def print_stats(self):
+        """Print the per-stage table for the last run."""
+        print(f"⏱️  Pipeline time: {self._wall:.2f} seconds")
+        for s in self.stats():
+            print(f"   {s['stage']:<8} {s['workers']:>3} {s['kind']:<7} in {s['in']:>6}  "
+                  f"out {s['out']:>6}  dropped {s['dropped']:>5}  errors {s['errors']:>4}  "
+                  f"busy {s['utilization']:>4.0%}  peak queue {s['peak_queue']}")
+        print(f"🐢 Slowest stage: {self.bottleneck()}")
+
+
+def parse_lyrics(item: dict) -> dict:
+    """Process-pool stage: replace a song item's page `html` with its `lyrics`."""
+    item = dict(item)
+    item['lyrics'] = extract_lyrics(item.pop('html')) or "Lyrics not found."
+    return item
+
+
+def ingest_stages(genius, *, search_workers: int = 4, artist_workers: int = 4,
+                  songs_workers: int = 2, lyrics_workers: int = 8, parse_processes: int = 0,
+                  max_songs: int = None, prefetch: int = 2) -> list:
+    """
+    Stages that turn search terms into one dict per song, with lyrics.
+
+    - search: term -> artist ID (misses are dropped)
+    - artist: artist details; each artist is passed on once, however many
+      terms name it
+    - songs: fans out to the artist's songs (`get_artist_songs`), at most
+      `max_songs` per artist; each song already carries its page URL
+    - lyrics: `genius.get_lyrics` on threads, or with `parse_processes` a
+      'page' stage downloading HTML on threads and a 'parse' stage
+      extracting lyrics in that many processes
+    """
+    seen_artists = set()
+    seen_lock = threading.Lock()
+
+    def search(term):
+        artist_id = genius.resolve_artist_id(term)
+        return {'search_term': term, 'artist_id': artist_id} if artist_id else None
+
+    def artist(item):
+        with seen_lock:
+            if item['artist_id'] in seen_artists:
+                return None
+            seen_artists.add(item['artist_id'])
+        details = genius.get_artist_by_id(item['artist_id']).get('response', {}).get('artist', {})
+        return dict(item, artist_name=details.get('name', MISSING),
+                    followers_count=details.get('followers_count', MISSING))
+
+    def songs(item):
+        for song in islice(genius.get_artist_songs(item['artist_id'], prefetch=prefetch),
+                           max_songs):
+            yield dict(item, song_id=song.get('id'), title=song.get('title'),
+                       url=song.get('url'))
+
+    def lyrics(item):
+        return dict(item, lyrics=genius.get_lyrics(item['url']))
+
+    def page(item):
+        return dict(item, html=genius.get_song_page(item['url']))
+
+    stages = [
+        Stage('search', search, workers=search_workers),
+        Stage('artist', artist, workers=artist_workers),
+        Stage('songs', songs, workers=songs_workers, fan_out=True),
+    ]
+    if parse_processes:
+        stages += [Stage('page', page, workers=lyrics_workers),
+                   Stage('parse', parse_lyrics, workers=parse_processes, processes=True)]
+    else:
+        stages.append(Stage('lyrics', lyrics, workers=lyrics_workers))
+    return stages
+
+
+def main(argv=None):
+    from apputil import Genius
+    from genius_ratelimit import TokenBucket
+
+    parser = argparse.ArgumentParser(
+        description="Ingest artists' songs and lyrics through a staged concurrent pipeline.")
+    parser.add_argument('--artists', default='artists_list.txt',
+                        help="file with one artist per line (default: artists_list.txt)")
+    parser.add_argument('--env-file', default='env-1.env',
+                        help="env file containing ACCESS_TOKEN (default: env-1.env)")
+    parser.add_argument('--base-url', default=None,
+                        help="API root to query instead of https://api.genius.com")
+    parser.add_argument('--out', default='songs.jsonl',
+                        help="JSON lines output, one song per line (default: songs.jsonl)")
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help="maximum requests per second, across all stages (default: 10)")
+    parser.add_argument('--burst', type=int, default=5,
+                        help="requests allowed back-to-back (default: 5)")
+    parser.add_argument('--max-songs', type=int, default=None,
+                        help="songs per artist to ingest (default: all)")
+    parser.add_argument('--search-workers', type=int, default=4)
+    parser.add_argument('--artist-workers', type=int, default=4)
+    parser.add_argument('--songs-workers', type=int, default=2)
+    parser.add_argument('--lyrics-workers', type=int, default=8)
+    parser.add_argument('--parse-processes', type=int, default=0,
+                        help="parse lyrics pages in this many processes instead of on the "
+                             "download threads (default: 0)")
+    parser.add_argument('--queue-size', type=int, default=64,
+                        help="items buffered in front of each stage (default: 64)")
+    args = parser.parse_args(argv)
+
+    with open(args.artists, 'r', encoding='utf-8') as file:
+        artists = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+
+    workers = (args.search_workers + args.artist_workers
+               + args.songs_workers * 2 + args.lyrics_workers)
+    genius = Genius.from_env_file(args.env_file, base_url=args.base_url, pool_maxsize=workers,
+                                  rate_limiter=TokenBucket(args.rate, args.burst))
+    pipeline = Pipeline(ingest_stages(genius, search_workers=args.search_workers,
+                                      artist_workers=args.artist_workers,
+                                      songs_workers=args.songs_workers,
+                                      lyrics_workers=args.lyrics_workers,
+                                      parse_processes=args.parse_processes,
+                                      max_songs=args.max_songs),
+                        queue_size=args.queue_size)
+
+    print(f"🎵 Ingesting {len(artists)} artists into {args.out}")
+    written = 0
+    try:
+        with open(args.out, 'w', encoding='utf-8') as out:
+            for song in pipeline.run(artists):
+                out.write(json.dumps(song, ensure_ascii=False) + "\n")
+                written += 1
+                if written % 500 == 0:
+                    print(f"📈 {written} songs")
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted")
+    print(f"✅ Wrote {written} songs to {os.path.abspath(args.out)}")
+    pipeline.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Shared work queue for collecting artists on several machines at once.
+
+The queue is a SQLite file that every node can open, for example on a shared
+volume. A coordinator enqueues the search terms. Workers on any host then
+`claim` small batches under a lease, look them up, and `complete` them with
+their result rows, calling `renew` while a batch runs. A lease that is not
+renewed or completed in time (the worker died, hung or lost its network)
+expires and the items are handed out again, up to `max_attempts` times, so a
+lost node only delays its last batch.
+
+Results live in the queue itself, so the coordinator can write the output
+file whenever every item is done and a restarted coordinator loses nothing.
+
+SQLite relies on the file system's locks; use a local disk or a network file
+system with working POSIX locks (not every NFS/SMB setup has them).
+
+Usage:
+    queue = WorkQueue('/shared/artists.queue.sqlite')
+    queue.enqueue(artists)                        # coordinator
+    batch = queue.claim('host-a:1234', 10)        # worker
+    queue.complete('host-a:1234', rows)
+"""
+
+import json
+import sqlite3
+import time
+from collections import Counter
+
+from apputil import normalize_term
+from genius_records import ArtistRecord
+from genius_sqlite import SQLiteStore
+
+
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+class WorkQueue(SQLiteStore):
+    """
+    SQLite-backed queue of search terms with expiring leases.
+
+    - `lease_seconds`: how long a claimed batch stays with its worker
+    - `max_attempts`: claims per term before it is marked failed
+    """
+
+    busy_timeout = 60  # every node writes here, so allow for longer waits
+
+    def __init__(self, path: str, *, lease_seconds: float = 120.0, max_attempts: int = 5):
+        super().__init__(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _create(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " key TEXT PRIMARY KEY,"
+            " term TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " state TEXT NOT NULL,"
+            " owner TEXT,"
+            " lease_expires REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " result TEXT,"
+            " updated REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS items_claim ON items (state, position)")
+        conn.execute("CREATE INDEX IF NOT EXISTS items_position ON items (position)")
+
+    def _write(self, func):
+        """Run `func(conn)` in one write transaction, taking the lock up front."""
+        with self._lock:
+            conn = self._connection()
+            # IMMEDIATE takes the write lock now, so two nodes can't claim the same rows
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def enqueue(self, search_terms) -> int:
+        """Add the distinct terms not already queued; returns how many were added."""
+        now = time.time()
+
+        def add(conn):
+            start = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM items").fetchone()[0]
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items (key, term, position, state, updated)"
+                " VALUES (?, ?, ?, ?, ?)",
+                ((normalize_term(term), term, start + i, PENDING, now)
+                 for i, term in enumerate(search_terms)),
+            )
+            return conn.total_changes - before
+
+        return self._write(add)
+
+    def claim(self, owner: str, limit: int) -> list:
+        """
+        Lease up to `limit` terms to `owner`, taking pending terms first and
+        then terms whose lease has expired. Returns the claimed search terms.
+        """
+        now = time.time()
+
+        def take(conn):
+            # Released or abandoned items that have used up their attempts are given up on
+            conn.execute(
+                "UPDATE items SET state = ?, owner = NULL, updated = ?"
+                " WHERE (state = ? OR (state = ? AND lease_expires < ?)) AND attempts >= ?",
+                (FAILED, now, PENDING, LEASED, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT key, term FROM items"
+                " WHERE state = ? OR (state = ? AND lease_expires < ?)"
+                " ORDER BY state = ? DESC, position LIMIT ?",
+                (PENDING, LEASED, now, PENDING, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE items SET state = ?, owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated = ? WHERE key = ?",
+                [(LEASED, owner, now + self.lease_seconds, now, key) for key, _ in rows],
+            )
+            return [term for _, term in rows]
+
+        return self._write(take)
+
+    def renew(self, owner: str, search_terms) -> int:
+        """Extend `owner`'s leases on these terms; returns how many it still held."""
+        expires = time.time() + self.lease_seconds
+
+        def extend(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE items SET lease_expires = ? WHERE key = ? AND owner = ? AND state = ?",
+                [(expires, normalize_term(term), owner, LEASED) for term in search_terms],
+            )
+            return conn.total_changes - before
+
+        return self._write(extend)
+
+    def complete(self, owner: str, rows) -> int:
+        """
+        Store result rows (dicts or ArtistRecords). A term is accepted even if
+        its lease has expired, unless another worker finished it first.
+        """
+        now = time.time()
+
+        def store(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE items SET state = ?, owner = ?, result = ?, updated = ?"
+                " WHERE key = ? AND state != ?",
+                [(DONE, owner, json.dumps(dict(row), ensure_ascii=False), now,
+                  normalize_term(row['search_term']), DONE) for row in rows],
+            )
+            return conn.total_changes - before
+
+        return self._write(store)
+
+    def release(self, owner: str, search_terms) -> int:
+        """Hand `owner`'s leased terms straight back, e.g. when it is shutting down."""
+        now = time.time()
+
+        def give_back(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE items SET state = ?, owner = NULL, lease_expires = NULL, updated = ?"
+                " WHERE key = ? AND owner = ? AND state = ?",
+                [(PENDING, now, normalize_term(term), owner, LEASED) for term in search_terms],
+            )
+            return conn.total_changes - before
+
+        return self._write(give_back)
+
+    def counts(self) -> dict:
+        """Number of terms in each state, with expired leases shown as 'expired'."""
+        now = time.time()
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT CASE WHEN state = ? AND lease_expires < ? THEN 'expired' ELSE state END,"
+                " COUNT(*) FROM items GROUP BY 1",
+                (LEASED, now),
+            ).fetchall()
+        counts = {PENDING: 0, LEASED: 0, 'expired': 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def finished(self) -> bool:
+        """True once there are terms and every one is done or failed."""
+        counts = self.counts()
+        total = sum(counts.values())
+        return total > 0 and counts[DONE] + counts[FAILED] == total
+
+    def _finished(self, page_size: int = 500):
+        """Yield (key, record) for done and failed terms in queue order, a page at a time."""
+        position = -1
+        while True:
+            # The lock is held per page, never while the caller has a row
+            with self._lock:
+                rows = self._connection().execute(
+                    "SELECT position, key, term, result FROM items"
+                    " WHERE position > ? AND state IN (?, ?) ORDER BY position LIMIT ?",
+                    (position, DONE, FAILED, page_size),
+                ).fetchall()
+            for _, key, term, result in rows:
+                yield key, (ArtistRecord.from_dict(json.loads(result)) if result
+                            else ArtistRecord(term, error=True))
+            if len(rows) < page_size:
+                return
+            position = rows[-1][0]
+
+    def results(self) -> dict:
+        """Map each normalized term to its result record (failed terms as failed lookups)."""
+        return dict(self._finished())
+
+    def iter_results(self, search_terms):
+        """
+        Yield one row per input term, in input order, for terms with a result.
+
+        Records are streamed in queue order, which is the input order when the
+        queue was filled from these terms; only records for terms that come
+        up again later (repeats, or a reordered list) are held in memory.
+        """
+        search_terms = list(search_terms)
+        keys = [normalize_term(term) for term in search_terms]
+        remaining = Counter(keys)
+        held = {}
+        finished = self._finished()
+        for term, key in zip(search_terms, keys):
+            record = held.get(key)
+            while record is None:
+                found = next(finished, None)
+                if found is None:
+                    break
+                if found[0] == key:
+                    record = found[1]
+                elif found[0] in remaining:
+                    held[found[0]] = found[1]
+            remaining[key] -= 1
+            if remaining[key]:
+                held[key] = record
+            else:
+                held.pop(key, None)
+                del remaining[key]
+            if record is not None:
+                row = dict(record, search_term=term)
+                if record.error:
+                    row['error'] = True
+                yield row
+
+    def clear(self):
+        """Remove every item."""
+        self._write(lambda conn: conn.execute("DELETE FROM items"))
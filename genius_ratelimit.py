@@ -0,0 +1,150 @@
+"""
+Token-bucket rate limiters for the Genius API client.
+
+`Genius` calls `rate_limiter.acquire()` before every request that goes to the
+network. Any object with that method can be plugged in.
+
+- `TokenBucket` paces the threads of a single process.
+- `FileTokenBucket` keeps the bucket in a small lock-protected file, so every
+  process pointed at the same path (e.g. `ProcessPoolExecutor` workers) shares
+  one combined budget. Processes on several machines can share it too, if the
+  path is on a file system with working locks and the machines' clocks agree.
+
+Usage:
+    limiter = FileTokenBucket('/tmp/genius.bucket', rate=10, burst=5)
+    genius = Genius.from_env_file('env-1.env', rate_limiter=limiter)
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: fall back to msvcrt byte-range locks
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for one process.
+
+    Allows `rate` requests per second on average and bursts of up to `burst`
+    back-to-back requests. Callers reserve a token and then sleep until it is
+    due, so waiting threads are served in arrival order.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float, now: float, available: float, updated: float):
+        """Refill, take `tokens` and return (new balance, seconds to wait)."""
+        elapsed = max(0.0, now - updated)
+        available = min(self.burst, available + elapsed * self.rate) - tokens
+        wait = -available / self.rate if available < 0 else 0.0
+        return available, wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until `tokens` may be spent and return the time spent waiting."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._reserve(tokens, now, self._tokens, self._updated)
+            self._updated = now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        # monotonic clocks are per process; start the copy with a fresh bucket
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket shared by every process that uses the same `path`.
+
+    The bucket state (token balance and last update time) lives in `path` and
+    is updated under an exclusive file lock. Instances pickle by path, so they
+    can be handed to worker processes directly.
+    """
+
+    _STATE = struct.Struct("<dd")
+
+    def __init__(self, path: str = None, rate: float = DEFAULT_RATE,
+                 burst: int = DEFAULT_BURST):
+        super().__init__(rate, burst)
+        self.path = path or os.path.join(tempfile.gettempdir(), "genius-ratelimit.bucket")
+
+    def _locked(self, handle):
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, self._STATE.size)
+
+    def _unlock(self, handle):
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, self._STATE.size)
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until `tokens` may be spent and return the time spent waiting."""
+        # The thread lock keeps threads of this process from sharing the handle
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+b") as handle:
+                self._locked(handle)
+                try:
+                    raw = handle.read(self._STATE.size)
+                    now = time.time()
+                    if len(raw) == self._STATE.size:
+                        available, updated = self._STATE.unpack(raw)
+                    else:
+                        available, updated = float(self.burst), now
+                    available, wait = self._reserve(tokens, now, available, updated)
+                    handle.seek(0)
+                    handle.write(self._STATE.pack(available, now))
+                    handle.flush()
+                finally:
+                    self._unlock(handle)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def reset(self):
+        """Forget any previous state so the bucket starts full."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __setstate__(self, state):
+        # Shared state lives in the file; only the thread lock needs rebuilding
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,158 @@
+"""
+Compact row types for `get_artists` results.
+
+`ArtistRecord` is one row with `__slots__` instead of a per-row dict, and
+`ArtistBatch` stores many rows as one list per column (struct of arrays).
+Batches are what the multiprocessing collector sends back from its workers:
+they pickle to a fraction of the size of a list of dicts and turn into a
+DataFrame or CSV without building any per-row dicts.
+
+Both keep the dict-style access the rest of the code uses (`row['artist_id']`,
+`row.get('artist_name')`, `dict(row)`), so sinks, the journal and callers
+that expect dict rows keep working.
+"""
+
+import csv
+
+
+FIELDS = ('search_term', 'artist_name', 'artist_id', 'followers_count')
+MISSING = 'N/A'
+
+
+class ArtistRecord:
+    """
+    One `get_artists` row; misses hold 'N/A' like the dict rows did.
+
+    `error` marks a miss caused by a failed request (as opposed to a search
+    that found no artist). It is not an output column, but it travels with
+    the row so the journal and work queue can try the term again.
+    """
+
+    __slots__ = FIELDS + ('error',)
+
+    def __init__(self, search_term: str, artist_name=MISSING, artist_id=MISSING,
+                 followers_count=MISSING, error: bool = False):
+        self.search_term = search_term
+        self.artist_name = artist_name
+        self.artist_id = artist_id
+        self.followers_count = followers_count
+        self.error = error
+
+    @classmethod
+    def from_response(cls, search_term: str, response_data: dict) -> "ArtistRecord":
+        """
+        Build a record from a `get_artist` / `artists/{id}` response. An
+        empty response means the request failed, so the row is an error.
+        """
+        if not response_data:
+            return cls(search_term, error=True)
+        artist = response_data.get('response', {}).get('artist', {})
+        if not artist:
+            return cls(search_term)
+        return cls(search_term, artist.get('name', MISSING), artist.get('id', MISSING),
+                   artist.get('followers_count', MISSING))
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "ArtistRecord":
+        return cls(*(row.get(name, MISSING) for name in FIELDS), error=bool(row.get('error')))
+
+    @property
+    def found(self) -> bool:
+        return self.artist_id != MISSING
+
+    def with_term(self, search_term: str) -> "ArtistRecord":
+        """The same artist under another search term."""
+        return ArtistRecord(search_term, self.artist_name, self.artist_id, self.followers_count,
+                            self.error)
+
+    def as_tuple(self) -> tuple:
+        return (self.search_term, self.artist_name, self.artist_id, self.followers_count)
+
+    def to_dict(self) -> dict:
+        return dict(zip(FIELDS, self.as_tuple()))
+
+    # Mapping-style access, so code written for dict rows works unchanged
+    def keys(self):
+        return FIELDS
+
+    def __getitem__(self, name: str):
+        if name not in FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default=None):
+        return getattr(self, name, default) if name in self.__slots__ else default
+
+    def __eq__(self, other):
+        if isinstance(other, ArtistRecord):
+            return self.as_tuple() == other.as_tuple()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(FIELDS, self.as_tuple()))
+        return f"ArtistRecord({fields}{', error=True' if self.error else ''})"
+
+    def __reduce__(self):
+        # A bare tuple of values instead of the default slots-state dict
+        return (ArtistRecord, self.as_tuple() + (self.error,))
+
+
+class ArtistBatch:
+    """
+    Many `get_artists` rows stored column-wise.
+
+    Iterating yields `ArtistRecord`s; `to_frame` and `to_csv` read the
+    columns directly. Error flags are kept beside the columns in `errors`.
+    """
+
+    __slots__ = ('columns', 'errors')
+
+    def __init__(self, rows=()):
+        self.columns = {name: [] for name in FIELDS}
+        self.errors = []
+        self.extend(rows)
+
+    def append(self, row):
+        """Add an `ArtistRecord` or a dict row."""
+        for name, column in self.columns.items():
+            column.append(row[name])
+        self.errors.append(bool(row.get('error')))
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self.columns['search_term'])
+
+    def __iter__(self):
+        return (ArtistRecord(*values, error=error)
+                for values, error in zip(zip(*self.columns.values()), self.errors))
+
+    def __getitem__(self, index: int) -> ArtistRecord:
+        return ArtistRecord(*(column[index] for column in self.columns.values()),
+                            error=self.errors[index])
+
+    def to_dicts(self) -> list:
+        return [record.to_dict() for record in self]
+
+    def to_frame(self):
+        """Build a DataFrame straight from the columns."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=list(FIELDS))
+
+    def to_csv(self, path: str):
+        """Write the batch as CSV with the usual header."""
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(FIELDS)
+            writer.writerows(zip(*self.columns.values()))
+
+    def __getstate__(self):
+        return self.columns, self.errors
+
+    def __setstate__(self, state):
+        self.columns, self.errors = state
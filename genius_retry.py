@@ -0,0 +1,158 @@
+"""
+Retry policy and circuit breaker for the Genius API client.
+
+`Genius.request` retries transient failures (connection errors, timeouts,
+429 and 5xx responses) with jittered exponential backoff, honouring any
+`Retry-After` header. A `CircuitBreaker` counts consecutive upstream failures
+and, once the API is clearly down, makes further requests fail fast with
+`CircuitOpenError` instead of each one waiting out its own timeout.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is refused because the circuit breaker is open."""
+
+
+def parse_retry_after(value) -> float:
+    """Return the delay in seconds requested by a Retry-After header, or None."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    - `max_retries` retries per request, with a delay of
+      `backoff_base * 2 ** attempt` seconds (capped at `backoff_max`) and full
+      jitter, unless the server sent a Retry-After header.
+    - `budget`, if set, caps the total number of retries this policy grants
+      over its lifetime, so a bad run can't multiply its request volume.
+    """
+
+    def __init__(self, max_retries: int = 3, *, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, retry_after_max: float = 120.0,
+                 statuses=RETRY_STATUSES, budget: int = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.statuses = frozenset(statuses)
+        self.budget = budget
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def is_retryable(self, status_code: int = None) -> bool:
+        """Connection errors (no status) and the configured statuses are retryable."""
+        return status_code is None or status_code in self.statuses
+
+    def next_delay(self, attempt: int, retry_after=None) -> float:
+        """
+        Return how long to sleep before retry number `attempt + 1`, or None
+        if no retries are left.
+        """
+        if attempt >= self.max_retries:
+            return None
+        with self._lock:
+            if self.budget is not None and self.retries >= self.budget:
+                return None
+            self.retries += 1
+
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.retry_after_max)
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open circuit breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    `before_request` raises `CircuitOpenError` for `reset_timeout` seconds.
+    It then lets a single probe request through; success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Genius API circuit is open after {self.failures} consecutive "
+                        f"failures; retrying in {remaining:.0f}s")
+                self.state = self.HALF_OPEN
+            if self._probing:
+                raise CircuitOpenError("Genius API circuit is half-open; a probe is in flight")
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
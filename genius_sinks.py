@@ -0,0 +1,265 @@
+"""
+Streaming output sinks for artist rows.
+
+A sink accepts rows one at a time and gets them onto disk as they arrive,
+instead of collecting everything into a list or DataFrame first. Peak memory
+therefore stays flat no matter how long the artist list is.
+
+Parquet and Feather output is typed: `artist_id` and `followers_count` are
+stored as nullable int64 and misses get a `status` column instead of 'N/A'
+strings, so the files load back without re-parsing or re-inferring types.
+
+Usage:
+    with open_sink('artists.csv') as sink:
+        for row in genius.iter_artists(search_terms):
+            sink.write(row)
+
+    df = load_artists('artists.parquet')  # Int64 ids, no 'N/A' strings
+"""
+
+import csv
+import importlib.util
+import os
+
+# pyarrow is only needed for Parquet/Feather output and is imported by the
+# first sink or reader that uses it; CSV output works without it
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+pa = None
+ipc = None
+pq = None
+
+
+def _load_pyarrow():
+    """Import pyarrow into this module on first use."""
+    global pa, ipc, pq
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet/Feather output (pip install pyarrow)")
+    if pa is None:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+        pa, ipc, pq = pyarrow, pyarrow.ipc, pyarrow.parquet
+
+
+FIELDNAMES = ['search_term', 'artist_name', 'artist_id', 'followers_count']
+
+# Values of the typed `status` column
+STATUS_OK = 'ok'
+STATUS_NOT_FOUND = 'not_found'
+STATUS_ERROR = 'error'    # the lookup failed; a resumed run tries it again
+STATUSES = [STATUS_OK, STATUS_NOT_FOUND, STATUS_ERROR]
+
+MISSING = 'N/A'
+
+
+def artist_schema():
+    """Arrow schema of the typed artist table."""
+    _load_pyarrow()
+    return pa.schema([
+        ('search_term', pa.string()),
+        ('artist_name', pa.string()),
+        ('artist_id', pa.int64()),
+        ('followers_count', pa.int64()),
+        ('status', pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+
+def typed_row(row: dict) -> dict:
+    """
+    Turn a get_artists row into its typed form: 'N/A' placeholders become
+    None and a `status` says whether the artist was found (or the lookup failed).
+    """
+    typed = {name: (None if row.get(name) == MISSING else row.get(name))
+             for name in FIELDNAMES}
+    typed['status'] = row.get('status') or (
+        STATUS_ERROR if row.get('error')
+        else STATUS_NOT_FOUND if typed['artist_id'] is None else STATUS_OK)
+    return typed
+
+
+class CsvSink:
+    """Write rows to a CSV file, flushing every `flush_every` rows."""
+
+    def __init__(self, path: str, fieldnames: list = None, *, flush_every: int = 1):
+        self.path = path
+        self.rows_written = 0
+        self.flush_every = max(1, flush_every)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames or FIELDNAMES,
+                                      extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, row: dict):
+        self._writer.writerow(row)
+        self.rows_written += 1
+        if self.rows_written % self.flush_every == 0:
+            self._file.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _ArrowSink:
+    """
+    Buffer rows into columns and write them out one batch at a time.
+
+    Rows are buffered until `row_group_size` have arrived, then written out as
+    one row group (Parquet) or record batch (Feather), so at most one batch is
+    held in memory. With the default fieldnames the typed artist schema is
+    used; custom fieldnames fall back to inferring each column's type.
+    """
+
+    def __init__(self, path: str, fieldnames: list = None, *, row_group_size: int = 10_000,
+                 compression: str = 'zstd'):
+        _load_pyarrow()
+        self.path = path
+        self.typed = fieldnames is None
+        self.schema = artist_schema() if self.typed else None
+        self.fieldnames = self.schema.names if self.typed else fieldnames
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.rows_written = 0
+        self._buffer = {name: [] for name in self.fieldnames}
+        self._buffered = 0
+        self._writer = None
+
+    def _table(self):
+        """Build a pyarrow Table from the buffered columns."""
+        if self.typed:
+            columns = dict(self._buffer)
+            # One fixed dictionary for every batch; Feather files can't replace it
+            indices = pa.array([STATUSES.index(s) for s in columns['status']], pa.int8())
+            columns['status'] = pa.DictionaryArray.from_arrays(indices, pa.array(STATUSES))
+            return pa.table(columns, schema=self.schema)
+        columns = {}
+        for name, values in self._buffer.items():
+            # Mixed placeholders like 'N/A' in numeric columns are kept as text
+            try:
+                columns[name] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                columns[name] = pa.array([None if v is None else str(v) for v in values])
+        return pa.table(columns)
+
+    def _open_writer(self, schema):
+        raise NotImplementedError
+
+    def flush(self):
+        """Write the buffered rows out as one row group."""
+        if not self._buffered:
+            return
+        table = self._table()
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = self._open_writer(table.schema)
+        elif table.schema != self.schema:
+            table = table.cast(self.schema)
+        self._writer.write_table(table)
+        self._buffer = {name: [] for name in self.fieldnames}
+        self._buffered = 0
+
+    def write(self, row: dict):
+        if self.typed:
+            row = typed_row(row)
+        for name in self.fieldnames:
+            self._buffer[name].append(row.get(name))
+        self._buffered += 1
+        self.rows_written += 1
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        self.flush()
+        if self._writer is None and self.typed:
+            # No rows at all: still leave a valid, empty file behind
+            self._writer = self._open_writer(self.schema)
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetSink(_ArrowSink):
+    """Write rows to a Parquet file one row group at a time."""
+
+    def _open_writer(self, schema):
+        return pq.ParquetWriter(self.path, schema, compression=self.compression)
+
+
+class FeatherSink(_ArrowSink):
+    """
+    Write rows to a Feather (Arrow IPC) file one record batch at a time.
+
+    Uncompressed by default, so `read_artist_table` can memory-map the file
+    and load it zero-copy; `compression` may also be 'zstd' or 'lz4', which
+    makes files smaller but every read decompress them.
+    """
+
+    def __init__(self, path: str, fieldnames: list = None, *, row_group_size: int = 10_000,
+                 compression: str = None):
+        super().__init__(path, fieldnames, row_group_size=row_group_size,
+                         compression=compression)
+
+    def _open_writer(self, schema):
+        options = ipc.IpcWriteOptions(compression=self.compression)
+        return ipc.new_file(self.path, schema, options=options)
+
+
+SINKS = {'csv': CsvSink, 'parquet': ParquetSink, 'feather': FeatherSink}
+
+
+def open_sink(path: str, fmt: str = None, **kwargs):
+    """Open a sink for `path`, picking the format from `fmt` or the file extension."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+    try:
+        sink_cls = SINKS[fmt]
+    except KeyError:
+        raise ValueError(f"Unsupported output format {fmt!r}; choose from {sorted(SINKS)}")
+    return sink_cls(path, **kwargs)
+
+
+def read_artist_table(path: str, fmt: str = None):
+    """
+    Read a Parquet or Feather file written by a sink as a pyarrow Table.
+
+    Both formats are memory-mapped. An uncompressed Feather table's columns
+    point straight into the mapping, which stays open for as long as the
+    table (or any column of it) is alive; compressed files are decoded into
+    memory as they are read.
+    """
+    _load_pyarrow()
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt == 'parquet':
+        return pq.read_table(path, memory_map=True)
+    if fmt == 'feather':
+        # Not closed here: the table's buffers keep the mapping alive
+        return ipc.open_file(pa.memory_map(path)).read_all()
+    raise ValueError(f"Unsupported typed format {fmt!r}; choose 'parquet' or 'feather'")
+
+
+def load_artists(path: str, fmt: str = None):
+    """
+    Load a typed artist file into a DataFrame with nullable dtypes
+    (Int64 ids and follower counts, categorical status).
+    """
+    import pandas as pd
+
+    table = read_artist_table(path, fmt)
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
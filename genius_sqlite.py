@@ -0,0 +1,70 @@
+"""
+Shared SQLite plumbing for the Genius on-disk stores.
+
+`ResponseCache`, `ArtistIndex` and `WorkQueue` each keep their state in one
+SQLite file that several threads and processes may open at once. They
+subclass `SQLiteStore`, which owns the connection; a subclass only creates
+its tables in `_create`.
+
+Usage:
+    class NoteStore(SQLiteStore):
+        def _create(self, conn):
+            conn.execute("CREATE TABLE IF NOT EXISTS notes (text TEXT)")
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """
+    Base class for an object backed by the SQLite file at `path`.
+
+    Each process opens its own connection on first use, in WAL mode, and
+    reopens it after a fork. `_lock` serializes the threads sharing it.
+    Pickled copies carry only their settings and open the file themselves.
+    """
+
+    busy_timeout = 30  # seconds to wait for another process's write lock
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _create(self, conn: sqlite3.Connection):
+        """Create the tables and indexes this store needs, if missing."""
+        raise NotImplementedError
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open (or reopen after a fork) the SQLite connection."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                   check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._create(conn)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def __getstate__(self):
+        # Connections and locks don't pickle; workers reopen the file themselves.
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,198 @@
+"""
+Pool of Genius access tokens, each with its own rate budget.
+
+One token's quota caps every client that uses it. A `TokenPool` spreads
+requests over several tokens in turn, each with its own rate limiter, so
+the combined rate grows with the number of tokens. A token is taken out of
+rotation when the API stops accepting it:
+
+- 429: the token rests for its `Retry-After` (or `cooldown` seconds)
+- 401: the token is disabled for the rest of the run
+
+When every token is resting, `acquire` waits for the first to come back;
+when every token is disabled it raises `NoUsableTokenError`.
+
+Tokens come from an env file as `ACCESS_TOKEN` and/or `ACCESS_TOKEN_1`,
+`ACCESS_TOKEN_2`, ...:
+
+    pool = TokenPool.from_env_file('env-1.env', rate=10, burst=2)
+    genius = Genius.from_env_file('env-1.env', tokens=pool)
+"""
+
+import re
+import threading
+import time
+
+from genius_ratelimit import FileTokenBucket, TokenBucket
+from genius_retry import CircuitOpenError, parse_retry_after
+
+
+TOKEN_KEY_RE = re.compile(r"^ACCESS_TOKEN(?:_(\d+))?$")
+
+
+class NoUsableTokenError(CircuitOpenError):
+    """Raised when every token in the pool has been rejected with 401."""
+
+
+def load_tokens(env_vars: dict) -> list:
+    """Distinct tokens from ACCESS_TOKEN and ACCESS_TOKEN_<n> keys, in numeric order."""
+    numbered = []
+    for key, value in env_vars.items():
+        match = TOKEN_KEY_RE.match(key)
+        if match and value:
+            numbered.append((int(match.group(1) or 0), value))
+    return list(dict.fromkeys(value for _, value in sorted(numbered)))
+
+
+def mask(token: str) -> str:
+    """Printable stand-in for a token: its last four characters."""
+    return f"…{token[-4:]}" if len(token) > 4 else "…"
+
+
+class _TokenState:
+    def __init__(self, token: str, limiter):
+        self.token = token
+        self.limiter = limiter
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.resting_until = 0.0   # time.monotonic() before which the token is skipped
+        self.disabled = False
+
+
+class TokenPool:
+    """
+    Round-robin over access tokens, skipping throttled and rejected ones.
+
+    - `limiters` gives each token its own rate limiter (same order as
+      `tokens`); by default each gets a `TokenBucket(rate, burst)`, or with
+      `bucket_path` a `FileTokenBucket` at `<bucket_path>.<n>`
+    - `acquire()` returns (token, seconds waited) once that token's limiter
+      allows a request
+    - `report(token, status, retry_after)` feeds back each response's status
+
+    Rest and disable state is per process; pass `FileTokenBucket` limiters
+    to share each token's rate budget between processes.
+    """
+
+    def __init__(self, tokens, *, limiters=None, rate: float = 10.0, burst: int = 1,
+                 bucket_path: str = None, cooldown: float = 60.0):
+        tokens = list(dict.fromkeys(tokens))
+        if not tokens:
+            raise ValueError("a token pool needs at least one token")
+        if limiters is None and bucket_path is not None:
+            limiters = [FileTokenBucket(f"{bucket_path}.{n}", rate, burst)
+                        for n in range(len(tokens))]
+        elif limiters is None:
+            limiters = [TokenBucket(rate, burst) for _ in tokens]
+        if len(limiters) != len(tokens):
+            raise ValueError("need one limiter per token")
+        self.cooldown = cooldown
+        self._states = [_TokenState(token, limiter) for token, limiter in zip(tokens, limiters)]
+        self._by_token = {state.token: state for state in self._states}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env_file(cls, filepath: str = "env-1.env", **kwargs):
+        """Build a pool from the ACCESS_TOKEN / ACCESS_TOKEN_<n> entries of an env file."""
+        from apputil import Genius
+
+        tokens = load_tokens(Genius.load_env_file(filepath))
+        if not tokens:
+            raise ValueError(f"no ACCESS_TOKEN or ACCESS_TOKEN_<n> found in {filepath}")
+        return cls(tokens, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def tokens(self) -> list:
+        return [state.token for state in self._states]
+
+    def _pick(self, now: float):
+        """Next usable token in turn, or the number of seconds until one is usable."""
+        count = len(self._states)
+        soonest = None
+        for offset in range(count):
+            state = self._states[(self._next + offset) % count]
+            if state.disabled:
+                continue
+            if state.resting_until <= now:
+                self._next = (self._next + offset + 1) % count
+                return state
+            wait = state.resting_until - now
+            soonest = wait if soonest is None else min(soonest, wait)
+        if soonest is None:
+            raise NoUsableTokenError(f"all {count} access tokens were rejected (401)")
+        return soonest
+
+    def acquire(self) -> tuple:
+        """Block until a token may send a request; return (token, seconds waited)."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                picked = self._pick(time.monotonic())
+                if isinstance(picked, _TokenState):
+                    picked.requests += 1
+                    break
+            time.sleep(picked)
+            waited += picked
+        return picked.token, waited + (picked.limiter.acquire() or 0.0)
+
+    def report(self, token: str, status: int = None, retry_after=None):
+        """Record the response status a token got; 429 rests it, 401 disables it."""
+        state = self._by_token.get(token)
+        if state is None:
+            return
+        with self._lock:
+            if status == 429:
+                state.throttled += 1
+                rest = parse_retry_after(retry_after)
+                state.resting_until = time.monotonic() + (self.cooldown if rest is None else rest)
+            elif status == 401:
+                state.rejected += 1
+                state.disabled = True
+
+    def usable(self) -> int:
+        """Number of tokens that could send a request right now."""
+        now = time.monotonic()
+        with self._lock:
+            return sum(not s.disabled and s.resting_until <= now for s in self._states)
+
+    def stats(self) -> list:
+        """Per-token counts and state, with tokens masked."""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'token': mask(s.token),
+                'requests': s.requests,
+                'throttled': s.throttled,
+                'rejected': s.rejected,
+                'state': 'disabled' if s.disabled
+                         else 'resting' if s.resting_until > now else 'active',
+            } for s in self._states]
+
+    def print_stats(self):
+        """Print one line per token."""
+        for s in self.stats():
+            print(f"🔑 {s['token']}: {s['requests']} requests, {s['throttled']} throttled, "
+                  f"{s['rejected']} rejected ({s['state']})")
+
+    def reset(self):
+        """Reset file-backed limiters so each token starts with a full bucket."""
+        for state in self._states:
+            if hasattr(state.limiter, 'reset'):
+                state.limiter.reset()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        # monotonic clocks are per process; a copy starts with every token rested
+        for token_state in self._states:
+            token_state.resting_until = 0.0
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Genius API, for benchmarks and offline testing.
+
+Serves the endpoints the client uses:
+- GET /search?q=...&per_page=...
+- GET /artists/{id}
+- GET /artists/{id}/songs?page=...&per_page=...  (see `artist_song_count`)
+- GET /lyrics/{song_id}, an HTML song page; song `url`s point here
+
+Responses are deterministic per search term, and the server can be told to
+add latency, fail a fraction of requests with 5xx, and throttle with 429 +
+Retry-After once a request rate is exceeded.
+
+Usage:
+    with MockGeniusServer(latency_ms=40, error_rate=0.01) as server:
+        genius = Genius('token', base_url=server.url)
+        genius.get_artists(['Radiohead', 'Seal'])
+
+    # or standalone
+    python mock_genius_server.py --port 8765 --latency-ms 40
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def term_artist_id(search_term: str, miss_rate: float = 0.0):
+    """Stable fake artist ID for a search term, or None for a simulated miss."""
+    key = " ".join(search_term.split()).casefold()
+    digest = zlib.crc32(key.encode('utf-8'))
+    if (digest % 1000) / 1000 < miss_rate:
+        return None
+    return digest % 1_000_000 + 1
+
+
+def artist_song_count(artist_id: int) -> int:
+    """Stable fake catalog size for an artist: 0 to 1499 songs."""
+    return artist_id * 7919 % 1500
+
+
+def song_page(song_id: int) -> str:
+    """A song page shaped like genius.com's: lots of markup around a few lyrics containers."""
+    verses = "".join(
+        f'<div data-lyrics-container="true">[Verse {v}]<br/>'
+        + "<br/>".join(f"Line {n} of song {song_id}" for n in range(8))
+        + '<div data-exclude-from-selection="true">Embed</div></div>'
+        for v in range(1, 4))
+    filler = '<script>window.__PRELOADED_STATE__ = "' + "x" * 20_000 + '";</script>'
+    return (f"<!DOCTYPE html><html><head><title>Song {song_id}</title>{filler}</head>"
+            f"<body><main><h1>Song {song_id}</h1>{verses}</main>{filler}</body></html>")
+
+
+class LatencyModel:
+    """
+    Draws response delays in seconds.
+
+    `distribution` is 'fixed', 'uniform' (mean ± jitter) or 'lognormal'
+    (median `latency_ms`, `jitter_ms` controls the spread, giving a long tail).
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 distribution: str = 'lognormal', seed: int = None):
+        if distribution not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution {distribution!r}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.distribution == 'fixed' or self.jitter_ms <= 0:
+                ms = self.latency_ms
+            elif self.distribution == 'uniform':
+                ms = self._random.uniform(self.latency_ms - self.jitter_ms,
+                                          self.latency_ms + self.jitter_ms)
+            else:
+                sigma = self.jitter_ms / self.latency_ms
+                ms = self.latency_ms * self._random.lognormvariate(0, sigma)
+        return max(0.0, ms) / 1000
+
+
+class MockGeniusServer:
+    """
+    Threaded HTTP server mimicking the Genius API.
+
+    - `latency_ms` / `jitter_ms` / `distribution`: see `LatencyModel`
+    - `error_rate`: fraction of requests answered with a 502
+    - `throttle_rps`: above this many requests per second, answer 429 with
+      a Retry-After header; with `per_token=True` the budget applies to each
+      bearer token separately, like a real per-credential quota
+    - `revoked_tokens`: bearer tokens answered with 401
+    - `miss_rate`: fraction of search terms that return no hits
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, *,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 distribution: str = 'lognormal', error_rate: float = 0.0,
+                 throttle_rps: float = None, retry_after: float = 1.0,
+                 miss_rate: float = 0.0, seed: int = None, per_token: bool = False,
+                 revoked_tokens=()):
+        self.latency = LatencyModel(latency_ms, jitter_ms, distribution, seed)
+        self.error_rate = error_rate
+        self.throttle_rps = throttle_rps
+        self.retry_after = retry_after
+        self.per_token = per_token
+        self.revoked_tokens = set(revoked_tokens)
+        self.token_counts = {}  # bearer token -> requests
+        self.miss_rate = miss_rate
+        self._random = random.Random(seed)
+
+        self.requests = 0
+        self.status_counts = {}
+        self._lock = threading.Lock()
+        self._windows = {}  # token (or None when shared) -> [window start, count]
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Send headers and body in one segment; otherwise Nagle plus
+            # delayed ACKs add ~40ms to every keep-alive response
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                auth = self.headers.get('Authorization', '')
+                token = auth[len('Bearer '):] if auth.startswith('Bearer ') else None
+                status, body, headers = server.handle(self.path, token)
+                if isinstance(body, str):
+                    payload, content_type = body.encode('utf-8'), 'text/html; charset=utf-8'
+                else:
+                    payload, content_type = json.dumps(body).encode('utf-8'), 'application/json'
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _throttled(self, token: str = None) -> bool:
+        """Count the request in a one-second window and report if over budget."""
+        if self.throttle_rps is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(token if self.per_token else None, [now, 0])
+            if now - window[0] >= 1.0:
+                window[0], window[1] = now, 0
+            window[1] += 1
+            return window[1] > self.throttle_rps
+
+    def handle(self, path: str, token: str = None):
+        """Return (status, JSON body, extra headers) for a request path."""
+        time.sleep(self.latency.sample())
+        status, body, headers = self._route(path, token)
+        with self._lock:
+            self.requests += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.token_counts[token] = self.token_counts.get(token, 0) + 1
+        return status, body, headers
+
+    def _route(self, path: str, token: str = None):
+        if token in self.revoked_tokens:
+            return 401, {'meta': {'status': 401, 'message': 'invalid token'}}, {}
+        if self._throttled(token):
+            return 429, {'meta': {'status': 429}}, {'Retry-After': str(self.retry_after)}
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+        if failed:
+            return 502, {'meta': {'status': 502}}, {}
+
+        parsed = urlparse(path)
+        parts = [p for p in parsed.path.split('/') if p]
+        query = parse_qs(parsed.query)
+
+        if parts == ['search']:
+            term = query.get('q', [''])[0]
+            artist_id = term_artist_id(term, self.miss_rate)
+            hits = []
+            if artist_id is not None:
+                hits.append({'type': 'song', 'result': {
+                    'id': artist_id * 10,
+                    'title': f"{term} song",
+                    'primary_artist': {'id': artist_id, 'name': term},
+                }})
+            return 200, {'meta': {'status': 200}, 'response': {'hits': hits}}, {}
+
+        if len(parts) == 2 and parts[0] == 'artists' and parts[1].isdigit():
+            artist_id = int(parts[1])
+            artist = {'id': artist_id, 'name': f"Artist {artist_id}",
+                      'followers_count': artist_id % 10_000}
+            return 200, {'meta': {'status': 200}, 'response': {'artist': artist}}, {}
+
+        if len(parts) == 3 and parts[0] == 'artists' and parts[1].isdigit() \
+                and parts[2] == 'songs':
+            artist_id = int(parts[1])
+            page = max(1, int(query.get('page', ['1'])[0]))
+            per_page = min(50, max(1, int(query.get('per_page', ['20'])[0])))
+            total = artist_song_count(artist_id)
+            first = (page - 1) * per_page
+            songs = [{'id': artist_id * 10_000 + i, 'title': f"Song {i}",
+                      'url': f"{self.url}/lyrics/{artist_id * 10_000 + i}",
+                      'primary_artist': {'id': artist_id, 'name': f"Artist {artist_id}"}}
+                     for i in range(first, min(first + per_page, total))]
+            next_page = page + 1 if first + per_page < total else None
+            return 200, {'meta': {'status': 200},
+                         'response': {'songs': songs, 'next_page': next_page}}, {}
+
+        if len(parts) == 2 and parts[0] == 'lyrics' and parts[1].isdigit():
+            return 200, song_page(int(parts[1])), {}
+
+        return 404, {'meta': {'status': 404, 'message': 'Not found'}}, {}
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock Genius API server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--distribution', choices=['fixed', 'uniform', 'lognormal'],
+                        default='lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rps', type=float, default=None)
+    parser.add_argument('--per-token', action='store_true',
+                        help="apply --throttle-rps to each bearer token separately")
+    parser.add_argument('--revoked-token', action='append', default=[],
+                        help="answer requests with this bearer token with 401 (repeatable)")
+    parser.add_argument('--miss-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    server = MockGeniusServer(args.host, args.port, latency_ms=args.latency_ms,
+                              jitter_ms=args.jitter_ms, distribution=args.distribution,
+                              error_rate=args.error_rate, throttle_rps=args.throttle_rps,
+                              per_token=args.per_token, revoked_tokens=args.revoked_token,
+                              miss_rate=args.miss_rate)
+    print(f"🎭 Mock Genius API listening on {server.url} (Ctrl-C to stop)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
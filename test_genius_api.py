@@ -0,0 +1,91 @@
+# Offline tests for building search-hit DataFrames in genius_api
+import multiprocessing
+import os
+import tempfile
+import time
+
+import pandas as pd
+import pytest
+
+import genius_api
+from genius_api import HitBuffer, flatten_hits, genius_to_dfs
+
+
+HITS = [
+    {'id': 1, 'title': 'Song A', 'url': 'https://genius.com/a',
+     'stats': {'pageviews': 10, 'hot': False},
+     'primary_artist': {'id': 7, 'name': 'Seal', 'meta': {'verified': True}}},
+    {'id': 2, 'title': 'Song B',
+     'stats': {'hot': True, 'unreviewed_annotations': 3},
+     'primary_artist': {'id': 9, 'name': 'U2', 'url': 'https://genius.com/artists/U2'}},
+    {'id': 3, 'title': 'Song C', 'lyrics_state': 'complete',
+     'stats': {'pageviews': 5, 'extra': {'nested': [1, 2]}},
+     'primary_artist': {'id': 7}},
+]
+
+
+def baseline_flatten(hits):
+    """The original genius_to_df layout: one Series per row, then concat."""
+    df = pd.DataFrame(hits)
+    df_stats = df['stats'].apply(pd.Series)
+    df_stats.rename(columns={c: 'stat_' + c for c in df_stats.columns}, inplace=True)
+    df_primary = df['primary_artist'].apply(pd.Series)
+    df_primary.rename(columns={c: 'primary_artist_' + c for c in df_primary.columns},
+                      inplace=True)
+    return pd.concat((df, df_stats, df_primary), axis=1)
+
+
+def fake_genius(search_term, per_page=15):
+    """Stands in for genius_api.genius: later terms answer sooner, so threads finish out of order."""
+    n = int(search_term.split()[-1])
+    time.sleep(0.01 * (5 - n % 5))
+    return [{'result': dict(hit, id=f"{n}-{hit['id']}")} for hit in HITS[:n % 3 + 1]]
+
+
+def test_flatten_hits_matches_the_baseline_layout():
+    # Same columns, order and values; the baseline's per-row Series only
+    # turned whole-number columns such as primary_artist_id into floats
+    pd.testing.assert_frame_equal(flatten_hits(HITS), baseline_flatten(HITS), check_dtype=False)
+
+
+def test_hit_buffer_matches_flatten_hits():
+    buffer = HitBuffer()
+    buffer.extend(HITS)
+    expected = flatten_hits(HITS)
+    frame = buffer.to_frame()
+    # Same columns in the same order; missing values are None rather than NaN
+    assert list(frame.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(frame.fillna(float('nan')), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('executor, workers', [
+    ('thread', 2), ('thread', 4),
+    pytest.param('process', 2, marks=pytest.mark.skipif(
+        multiprocessing.get_start_method() != 'fork',
+        reason="workers only see the patched search when forked")),
+])
+def test_result_does_not_depend_on_workers(monkeypatch, executor, workers):
+    monkeypatch.setattr(genius_api, 'genius', fake_genius)
+    terms = [f"term {n}" for n in range(10)]
+    expected = genius_to_dfs(terms, verbose=False)
+    assert len(expected) == sum(n % 3 + 1 for n in range(10))
+    assert list(expected['id'][:3]) == ['0-1', '1-1', '1-2']
+
+    frame = genius_to_dfs(terms, workers=workers, executor=executor, verbose=False)
+    pd.testing.assert_frame_equal(frame, expected)
+
+
+def test_savepath_writes_one_combined_csv(monkeypatch):
+    monkeypatch.setattr(genius_api, 'genius', fake_genius)
+    savepath = tempfile.mkdtemp()
+    frame = genius_to_dfs(['term 1', 'term 2'], verbose=False, savepath=savepath)
+
+    assert os.listdir(savepath) == ['genius-data.csv']
+    saved = pd.read_csv(os.path.join(savepath, 'genius-data.csv'))
+    assert list(saved.columns) == list(frame.columns)
+    assert list(saved['id']) == ['1-1', '1-2', '2-1', '2-2', '2-3']
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        genius_to_dfs(['term 1'], executor='fiber')
@@ -0,0 +1,100 @@
+# Offline tests for the asyncio client AsyncGenius
+import asyncio
+import time
+
+from apputil import AsyncGenius
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_retry import RetryPolicy
+
+
+class ArtistSession(FakeSession):
+    """
+    Every term is its own artist, named after it; a search for a longer term
+    answers sooner. Searches for the terms in `down` fail. Tracks the peak
+    number of GETs in flight.
+    """
+
+    def __init__(self, down=()):
+        super().__init__()
+        self.down = set(down)
+        self.ids = {}
+        self.in_flight = self.peak = 0
+
+    def respond(self, url, params, headers):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if url.endswith('/search'):
+                term = params['q']
+                time.sleep(0.05 / len(term))
+                if term in self.down:
+                    raise ConnectionError("boom")
+                with self._lock:
+                    artist_id = self.ids.setdefault(term.lower(), len(self.ids) + 1)
+                return FakeResponse({'response': {'hits': [
+                    {'result': {'primary_artist': {'id': artist_id}}}]}})
+            time.sleep(0.01)
+            artist_id = int(url.rsplit('/', 1)[-1])
+            name = next(term for term, i in self.ids.items() if i == artist_id)
+            return FakeResponse({'response': {'artist': {'id': artist_id, 'name': name,
+                                                         'followers_count': artist_id}}})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def make_async(session, max_in_flight=4):
+    return AsyncGenius(client=make_genius(session, retry=RetryPolicy(0)),
+                       max_in_flight=max_in_flight)
+
+
+def test_get_artists_keeps_input_order_and_dedupes():
+    session = ArtistSession()
+    terms = ['a', 'Seal', 'abcdefgh', 'SEAL', 'xyz']
+
+    async def main():
+        async with make_async(session) as genius:
+            return await genius.get_artists(terms)
+
+    frame = asyncio.run(main())
+    assert list(frame['search_term']) == terms
+    assert list(frame['artist_name']) == ['a', 'seal', 'abcdefgh', 'seal', 'xyz']
+    assert session.count('/search') == 4 and len(session.calls) == 8
+
+
+def test_requests_in_flight_are_capped():
+    session = ArtistSession()
+
+    async def main():
+        async with make_async(session, max_in_flight=3) as genius:
+            await asyncio.gather(*(genius.request(f"artists/{n}") for n in range(12)))
+
+    session.ids = {f"artist {n}": n for n in range(12)}
+    asyncio.run(main())
+    assert session.peak == 3 and len(session.calls) == 12
+
+
+def test_failed_lookup_is_an_error_row_and_the_rest_complete():
+    session = ArtistSession(down={'U2'})
+
+    async def main():
+        async with make_async(session) as genius:
+            return [row async for row in genius.iter_artists(['Seal', 'U2', 'zz'])]
+
+    rows = {row['search_term']: row for row in asyncio.run(main())}
+    assert rows['U2'].error and rows['U2']['artist_name'] == 'N/A'
+    assert not rows['Seal'].error and rows['Seal']['artist_name'] == 'seal'
+    assert rows['zz']['artist_name'] == 'zz'
+
+
+def test_close_leaves_a_passed_in_client_open():
+    session = ArtistSession()
+    make_async(session).close()
+    assert not session.closed
+
+    genius = AsyncGenius('token')
+    genius.client.session = session
+    genius.close()
+    assert session.closed
+
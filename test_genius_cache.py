@@ -0,0 +1,113 @@
+# Offline tests for the on-disk response cache (no network or ACCESS_TOKEN needed)
+import os
+import tempfile
+import time
+
+from genius_cache import ResponseCache, is_negative, make_key
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_retry import RetryPolicy
+
+
+def make_cache(**kwargs):
+    path = os.path.join(tempfile.mkdtemp(), 'cache.sqlite')
+    return ResponseCache(path, **kwargs)
+
+
+def test_key_normalizes_params():
+    assert make_key('search', {'q': ' The  Beatles', 'per_page': 15}) == \
+        make_key('/search', {'per_page': 15, 'q': 'the beatles'})
+    assert make_key('search', {'q': 'Seal'}) != make_key('search', {'q': 'U2'})
+    # Only the search text is folded; URLs are case-sensitive
+    assert make_key('lyrics', {'url': 'https://genius.com/Seal-kiss'}) != \
+        make_key('lyrics', {'url': 'https://genius.com/seal-kiss'})
+
+
+def test_request_served_from_cache():
+    cache = make_cache()
+    genius = make_genius(FakeSession(), cache=cache)
+
+    first = genius.request('artists/1')
+    second = genius.request('artists/1')
+
+    assert first == second
+    assert len(genius.session.calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_per_endpoint_ttl_expires():
+    cache = make_cache(ttl={'search': 0.05}, default_ttl=60)
+    cache.set('search', {'q': 'seal'}, {'hits': []})
+    cache.set('artists/1', None, {'artist': 1})
+    time.sleep(0.1)
+
+    assert cache.get('search', {'q': 'seal'}) is None
+    assert cache.get('artists/1') == {'artist': 1}
+
+
+def test_lru_eviction():
+    cache = make_cache(max_entries=2)
+    cache.set('artists/1', None, 1)
+    cache.set('artists/2', None, 2)
+    time.sleep(0.01)
+    cache.get('artists/1')  # touch 1 so 2 becomes least recently used
+    cache.set('artists/3', None, 3)
+
+    assert len(cache) == 2
+    assert cache.get('artists/2') is None
+    assert cache.get('artists/1') == 1
+    assert cache.evictions == 1
+
+
+def test_sizes_are_checked_every_few_stores():
+    cache = make_cache(max_entries=5, evict_every=3)
+    for n in range(7):
+        cache.set(f'artists/{n}', None, n)
+    # Checked after the 3rd and 6th store, so the 7th is over budget for now
+    assert len(cache) == 6
+    cache.set('artists/7', None, 7)
+    cache.set('artists/8', None, 8)
+    assert len(cache) == 5 and cache.evictions == 4
+
+
+class SearchSession(FakeSession):
+    """Finds nothing for any search, or fails every request when `down`."""
+
+    down = False
+
+    def respond(self, url, params, headers):
+        if self.down:
+            raise ConnectionError("network unreachable")
+        return FakeResponse({'response': {'hits': []}})
+
+
+def test_known_misses_use_the_negative_ttl():
+    cache = make_cache(ttl=60, negative_ttl=0.05)
+    genius = make_genius(SearchSession(), cache=cache, retry=RetryPolicy(0))
+
+    assert genius.resolve_artist_id('zz') is None
+    assert genius.resolve_artist_id('zz') is None
+    assert len(genius.session.calls) == 1
+    assert cache.stats()['negative_hits'] == 1 and genius.metrics.cache_negative_hits == 1
+
+    time.sleep(0.1)
+    genius.resolve_artist_id('zz')
+    assert len(genius.session.calls) == 2
+
+
+def test_transport_errors_are_not_cached():
+    cache = make_cache()
+    genius = make_genius(SearchSession(), cache=cache, retry=RetryPolicy(0))
+    genius.session.down = True
+
+    assert genius.resolve_artist_id('zz') is None
+    genius.session.down = False
+    genius.resolve_artist_id('zz')
+    assert len(genius.session.calls) == 2 and cache.stores == 1
+
+
+def test_hits_without_an_artist_are_negative():
+    assert is_negative('search', {'response': {'hits': [{'result': {'primary_artist': {}}}]}})
+    assert not is_negative('search', {'response': {'hits': [
+        {'result': {'primary_artist': {'id': 7}}}]}})
+    assert not is_negative('search', {})  # not a successful response at all
+
@@ -0,0 +1,82 @@
+# Offline tests for request coalescing and term dedupe in Genius
+import threading
+import time
+
+import pytest
+
+from apputil import SingleFlight, normalize_term
+from genius_fakes import FakeResponse, FakeSession, make_genius
+
+
+class CatalogSession(FakeSession):
+    """Searches answer with the artist ID in `ids`; each GET takes `seconds`."""
+
+    def __init__(self, ids=None, seconds=0.0):
+        super().__init__()
+        self.ids = ids or {}
+        self.seconds = seconds
+
+    def respond(self, url, params, headers):
+        time.sleep(self.seconds)
+        if url.endswith('/search'):
+            artist_id = self.ids.get(params['q'].strip().lower())
+            hits = [{'result': {'primary_artist': {'id': artist_id}}}] if artist_id else []
+            return FakeResponse({'response': {'hits': hits}})
+        artist_id = int(url.rsplit('/', 1)[-1])
+        return FakeResponse({'response': {'artist': {'id': artist_id, 'name': f"#{artist_id}",
+                                                     'followers_count': 0}}})
+
+
+def run_together(count, func):
+    """Call `func()` from `count` threads released at the same moment; returns the results."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        results[i] = func()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_concurrent_requests_share_one_call():
+    genius = make_genius(CatalogSession(seconds=0.1))
+    results = run_together(8, lambda: genius.request('artists/7'))
+    assert len(genius.session.calls) == 1
+    assert all(result == results[0] for result in results)
+    assert results[0]['response']['artist']['id'] == 7
+    assert genius._inflight.shared == 7
+
+
+def test_single_flight_shares_errors_and_forgets_finished_calls():
+    flight = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ConnectionError("boom")
+
+    def attempt():
+        with pytest.raises(ConnectionError):
+            flight.do('key', fail)
+
+    run_together(4, attempt)
+    assert len(calls) == 1
+    assert flight.do('key', lambda: 'again') == 'again'
+
+
+def test_repeated_terms_are_searched_once_in_input_order():
+    session = CatalogSession({'seal': 7, 'u2': 9, 'queen b': 42, 'beyonce': 42})
+    terms = ['Seal', 'U2', ' seal', 'SEAL', 'Queen B', 'Beyonce', 'U2', 'zz', 'ZZ']
+    frame = make_genius(session).get_artists(terms)
+
+    assert list(frame['search_term']) == terms
+    assert list(frame['artist_id']) == [7, 9, 7, 7, 42, 42, 9, 'N/A', 'N/A']
+    assert session.count('/search') == len({normalize_term(term) for term in terms}) == 5
+    assert session.count('artists/7') == session.count('artists/42') == 1
@@ -0,0 +1,54 @@
+# Offline tests for the adaptive (AIMD) concurrency limiter
+from genius_concurrency import AdaptiveConcurrency
+
+
+def run_window(concurrency, seconds=0.02, status=200, count=None):
+    """Fill every slot, then complete a full window of requests."""
+    count = count or max(concurrency.min_samples, concurrency.limit)
+    for _ in range(count):
+        concurrency.acquire()
+        concurrency.release(seconds, status)
+
+
+def saturate(concurrency):
+    # Hold every slot once so the window counts as limit-bound
+    for _ in range(concurrency.limit):
+        concurrency.acquire()
+    for _ in range(concurrency.limit):
+        concurrency.release(0.02, 200)
+
+
+def test_increases_additively_while_slots_are_busy():
+    concurrency = AdaptiveConcurrency(initial=2, max_limit=4, min_samples=2, log=None)
+    for _ in range(5):
+        saturate(concurrency)
+    assert concurrency.limit == 4
+    assert concurrency.stats()['increases'] == 2
+
+
+def test_does_not_grow_when_slots_sit_idle():
+    concurrency = AdaptiveConcurrency(initial=4, min_samples=5, log=None)
+    run_window(concurrency)  # one request at a time never reaches the limit
+    run_window(concurrency)
+    assert concurrency.limit == 4
+
+
+def test_throttling_halves_the_limit_once_per_window():
+    messages = []
+    concurrency = AdaptiveConcurrency(initial=8, min_samples=4, log=messages.append)
+    run_window(concurrency, status=429)
+    assert concurrency.limit == 4
+    run_window(concurrency, status=503)  # stragglers from before the cut
+    assert concurrency.limit == 4
+    run_window(concurrency, status=503)
+    assert concurrency.limit == 2
+    assert len(messages) == 2 and 'throttled' in messages[0]
+
+
+def test_latency_rise_backs_off():
+    concurrency = AdaptiveConcurrency(initial=8, min_samples=4, log=None)
+    run_window(concurrency, seconds=0.01)
+    run_window(concurrency, seconds=0.05)
+    assert concurrency.limit == 4
+    assert 'latency' in concurrency.decisions[-1][3]
+
@@ -0,0 +1,144 @@
+# Offline tests for hedging slow requests with a duplicate
+import pickle
+import time
+
+from genius_concurrency import AdaptiveConcurrency
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_hedge import HedgePolicy
+from genius_retry import RetryPolicy
+from genius_tokens import TokenPool
+
+
+class SlowSession(FakeSession):
+    """Answers instantly, except calls numbered in `slow` which take `stall` seconds."""
+
+    def __init__(self, slow=(), stall=0.5):
+        super().__init__()
+        self.slow = set(slow)
+        self.stall = stall
+        self.responses = []
+
+    def respond(self, url, params, headers):
+        with self._lock:
+            call = len(self.responses) + 1
+            response = FakeResponse({'response': {'call': call}})
+            self.responses.append(response)
+        if call in self.slow:
+            time.sleep(self.stall)
+        return response
+
+
+def test_delay_is_the_percentile_once_warmed_up():
+    hedge = HedgePolicy(90, min_samples=10)
+    for n in range(9):
+        hedge.record('search', n / 100)
+    assert hedge.delay('search') is None
+    hedge.record('search', 0.09)
+    assert hedge.delay('search') == 0.09 and hedge.delay('artists') is None
+
+
+def test_slow_request_is_hedged_and_duplicate_wins():
+    session = SlowSession(slow={21})
+    genius = make_genius(session, retry=RetryPolicy(0),
+                         hedge=HedgePolicy(95, min_samples=20, max_extra=0.5))
+    for n in range(20):
+        genius.request(f"artists/{n}")
+
+    start = time.perf_counter()
+    data = genius.request("artists/20")
+    assert time.perf_counter() - start < 0.25
+    assert data == {'response': {'call': 22}}
+    assert genius.hedge.stats()['fired'] == 1 and genius.hedge.stats()['won'] == 1
+    summary = genius.metrics.summary()
+    assert summary['hedges'] == {'fired': 1, 'won': 1} and summary['requests'] == 21
+    # The slow loser is closed once it finally answers
+    time.sleep(0.6)
+    assert session.responses[20].closed
+
+
+def after(seconds, status):
+    """An attempt that answers `status` after `seconds`."""
+    def send():
+        time.sleep(seconds)
+        return FakeResponse(status_code=status)
+    return send
+
+
+def test_only_successful_attempts_are_timed():
+    hedge = HedgePolicy(95, min_samples=1)
+    hedge.run('search', after(0, 503), after(0, 200))
+    assert hedge.delay('search') is None
+    hedge.run('search', after(0, 200), after(0, 200))
+    assert hedge.delay('search') is not None
+
+
+def test_failed_first_attempt_does_not_beat_a_good_duplicate():
+    hedge = HedgePolicy(50, min_samples=1, max_extra=1.0)
+    hedge.record('search', 0.01)
+    hedge.requests = 10
+    response, hedged, duplicate_won = hedge.run('search', after(0.03, 503), after(0.08, 200))
+    assert response.status_code == 200 and hedged and duplicate_won
+
+    # With no good answer at all, a failed response is returned for the retry policy
+    response, _, duplicate_won = hedge.run('search', after(0.03, 503), after(0.05, 502))
+    assert response.status_code == 503 and not duplicate_won
+
+
+class ThrottledSession(FakeSession):
+    """Answers 200, except that once `throttled` is set that token is slow and gets 429."""
+
+    throttled = None
+
+    def respond(self, url, params, headers):
+        token = headers['Authorization'].split()[-1]
+        if token == self.throttled:
+            time.sleep(0.1)
+            return FakeResponse(status_code=429, headers={'Retry-After': '30'})
+        return FakeResponse({'response': {'token': token}})
+
+
+def test_losing_duplicate_still_reports_its_token():
+    session = ThrottledSession()
+    genius = make_genius(session, tokens=TokenPool(['t1', 't2'], rate=1000, burst=100),
+                         retry=RetryPolicy(0),
+                         hedge=HedgePolicy(95, min_samples=20, max_extra=0.5))
+    for n in range(20):
+        genius.request(f"artists/{n}")
+
+    session.throttled = 't1'
+    assert genius.request("artists/20") == {'response': {'token': 't2'}}
+    time.sleep(0.2)
+    assert [s['state'] for s in genius.tokens.stats()] == ['resting', 'active']
+
+
+def test_duplicate_needs_a_free_concurrency_slot():
+    for limit, fired in [(1, 0), (2, 1)]:
+        concurrency = AdaptiveConcurrency(limit, min_limit=limit, max_limit=limit, log=None)
+        genius = make_genius(SlowSession(slow={21}, stall=0.2), retry=RetryPolicy(0),
+                             concurrency=concurrency,
+                             hedge=HedgePolicy(95, min_samples=20, max_extra=0.5))
+        for n in range(21):
+            genius.request(f"artists/{n}")
+        assert genius.hedge.stats()['fired'] == fired
+        # The duplicate gives its slot back, even when it loses
+        time.sleep(0.3)
+        assert concurrency.in_flight == 0
+
+
+def test_budget_caps_duplicates():
+    session = SlowSession(slow=range(21, 100), stall=0.02)
+    genius = make_genius(session, retry=RetryPolicy(0),
+                         hedge=HedgePolicy(50, min_samples=20, max_extra=0.1))
+    for n in range(60):
+        genius.request(f"artists/{n}")
+    stats = genius.hedge.stats()
+    assert 0 < stats['fired'] <= 0.1 * stats['requests']
+    assert stats['declined'] > 0
+
+
+def test_pickled_policy_starts_afresh():
+    hedge = HedgePolicy(95, min_samples=1)
+    hedge.record('search', 0.1)
+    copy = pickle.loads(pickle.dumps(hedge))
+    assert copy.delay('search') is None and copy.percentile == 95
+
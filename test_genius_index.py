@@ -0,0 +1,59 @@
+# Offline tests for the local artist-name index and its use in Genius
+import os
+import tempfile
+
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_index import ArtistIndex, canonical_name
+
+
+class SearchSession(FakeSession):
+    """Answers every /search with one hit for artist 42."""
+
+    def respond(self, url, params, headers):
+        return FakeResponse({'response': {'hits': [{'result': {
+            'primary_artist': {'id': 42, 'name': 'Beyoncé'}}}]}})
+
+
+def make_index():
+    return ArtistIndex(os.path.join(tempfile.mkdtemp(), 'index.sqlite'))
+
+
+def test_canonical_name_ignores_case_accents_and_order():
+    assert canonical_name('Beyoncé') == canonical_name(' BEYONCE ')
+    assert canonical_name('The Beatles') == canonical_name('Beatles, The')
+    assert canonical_name('Simon & Garfunkel') == canonical_name('simon and garfunkel')
+
+
+def test_only_word_splits_are_forgiven():
+    index = make_index()
+    index.add('AC/DC', 4)
+    index.add('Seal', 8)
+    assert index.lookup('ACDC') == 4
+    assert index.lookup('Seals') is None
+    assert index.stats()['fuzzy_hits'] == 1 and index.stats()['misses'] == 1
+
+
+def test_names_a_letter_or_digit_apart_are_misses():
+    index = make_index()
+    for artist_id, name in enumerate(['Artist 1', 'Artist 2', 'Blink-182', 'Lil Baby',
+                                      'Kings of Leon', 'Mac Miller'], start=1):
+        index.add(name, artist_id)
+    for name in ['Artist 11', 'Artist 22', 'Artist 33', 'Blink-1822', 'Blink 18 2',
+                 'Lil Babyy', 'Kings of Leo', 'Mac Millers']:
+        assert index.match(name) is None, name
+    assert index.lookup('blink 182') == 3
+
+    # Once both are known, each resolves to its own artist
+    index.add('Artist 11', 11)
+    assert index.lookup('Artist 11') == 11 and index.lookup('Artist 1') == 1
+
+
+def test_index_answers_before_search():
+    genius = make_genius(SearchSession(), index=make_index())
+
+    assert genius.resolve_artist_id('Queen B') == 42
+    # Both the search term and the artist's own name were learned
+    assert genius.resolve_artist_id('queen b') == 42
+    assert genius.resolve_artist_id('beyonce') == 42
+    assert genius.session.count('/search') == 1
+
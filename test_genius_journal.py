@@ -0,0 +1,99 @@
+# Offline tests for the checkpoint journal used by the collection scripts
+import os
+import tempfile
+
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_journal import CheckpointJournal
+from genius_retry import RetryPolicy
+
+
+def row(term, name='N/A'):
+    return {'search_term': term, 'artist_name': name, 'artist_id': 'N/A',
+            'followers_count': 'N/A'}
+
+
+def test_resume_skips_finished_terms():
+    path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    with CheckpointJournal(path) as journal:
+        journal.record(row('Seal', 'Seal'))
+
+    with CheckpointJournal(path, resume=True) as journal:
+        assert journal.pending(['seal', 'U2', 'u2 ']) == ['U2']
+
+
+def test_torn_last_line_is_ignored():
+    path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    with CheckpointJournal(path) as journal:
+        journal.record(row('Seal'))
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('{"search_term": "U2", "artist_na')
+
+    with CheckpointJournal(path, resume=True) as journal:
+        assert len(journal) == 1
+        journal.record(row('U2', 'U2'))
+
+    # The torn line was cut off, so the row written after it reads back
+    with CheckpointJournal(path, resume=True) as journal:
+        assert [r['artist_name'] for r in journal.compact(['Seal', 'U2'])] == ['N/A', 'U2']
+
+
+def test_compact_restores_input_order_and_duplicates():
+    path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    with CheckpointJournal(path) as journal:
+        journal.record_many([row('U2', 'U2'), row('Seal', 'Seal')])
+        rows = journal.compact(['Seal', 'U2', 'seal'])
+
+    assert [r['search_term'] for r in rows] == ['Seal', 'U2', 'seal']
+    assert rows[2]['artist_name'] == 'Seal'
+
+
+def test_fresh_run_truncates_journal():
+    path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    with CheckpointJournal(path) as journal:
+        journal.record(row('Seal'))
+    with CheckpointJournal(path) as journal:
+        assert len(journal) == 0 and journal.pending(['Seal']) == ['Seal']
+
+
+class FlakySession(FakeSession):
+    """Fails every request for the terms in `down`; otherwise Seal is artist 7."""
+
+    def __init__(self, down=()):
+        super().__init__()
+        self.down = set(down)
+
+    @property
+    def searches(self):
+        with self._lock:
+            return [params['q'] for url, params, _ in self.calls if url.endswith('/search')]
+
+    def respond(self, url, params, headers):
+        if url.endswith('/search'):
+            if params['q'] in self.down:
+                raise ConnectionError("boom")
+            hits = [{'result': {'primary_artist': {'id': 7}}}] if params['q'] == 'Seal' else []
+            return FakeResponse({'response': {'hits': hits}})
+        return FakeResponse({'response': {'artist': {'id': 7, 'name': 'Seal',
+                                                     'followers_count': 250}}})
+
+
+def collect(path, terms, session, resume=False):
+    genius = make_genius(session, retry=RetryPolicy(0))
+    with CheckpointJournal(path, resume=resume) as journal:
+        for result in genius.iter_artists(journal.pending(terms)):
+            journal.record(result)
+        return journal.compact(terms)
+
+
+def test_failed_lookup_is_fetched_again_on_resume():
+    path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    terms = ['Seal', 'zz']
+    rows = collect(path, terms, FlakySession(down={'Seal'}))
+    assert rows[0]['artist_name'] == 'N/A' and rows[0]['error']
+    assert 'error' not in rows[1]  # a genuine miss is finished
+
+    session = FlakySession()
+    rows = collect(path, terms, session, resume=True)
+    assert session.searches == ['Seal']
+    assert rows[0]['artist_id'] == 7 and 'error' not in rows[0]
+
@@ -0,0 +1,40 @@
+# Offline tests for lyrics extraction and Genius.get_lyrics_many
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_lyrics import extract_lyrics, extract_lyrics_stream
+
+
+PAGE = ('<html><head><title>Song Lyrics</title></head><body><div class="header">menu</div>'
+        '<div data-lyrics-container="true"><div data-exclude-from-selection="true">'
+        '<div>3 Contributors</div>Song Lyrics</div>[Verse 1]<br>Hello &amp; '
+        '<a href="#"><span>good</span>bye</a><br/>Line two</div>'
+        '<div class="ad">ad</div>'
+        '<div data-lyrics-container="true">[Chorus]<br>Na na</div></body></html>')
+
+
+class PageSession(FakeSession):
+    def respond(self, url, params, headers):
+        return FakeResponse(body=PAGE)
+
+
+def test_containers_are_joined_and_headers_skipped():
+    assert extract_lyrics(PAGE) == "[Verse 1]\nHello & goodbye\nLine two\n[Chorus]\nNa na"
+
+
+def test_legacy_layout_stops_early():
+    page = '<div class="lyrics"><p>One<br>Two</p></div>' + '<p>rest</p>' * 100
+    chunks = (page[i:i + 5].encode() for i in range(0, len(page), 5))
+    assert extract_lyrics_stream(chunks) == "One\nTwo"
+    assert extract_lyrics('<p>no lyrics here</p>') == ''
+
+
+def test_get_lyrics_many_fetches_each_url_once():
+    genius = make_genius(PageSession())
+    urls = [f"https://genius.com/song-{i}" for i in range(5)]
+
+    lyrics = genius.get_lyrics_many(urls + urls[:2], max_workers=3)
+    assert list(lyrics) == urls
+    assert lyrics[urls[0]].startswith("[Verse 1]")
+
+    genius.get_lyrics(urls[1])
+    assert len(genius.session.calls) == 5
+
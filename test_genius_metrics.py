@@ -0,0 +1,77 @@
+# Offline tests for the request hooks and metrics export on Genius
+from genius_fakes import FakeResponse, ScriptedSession, make_genius
+from genius_metrics import RequestMetrics, print_summary
+
+
+def test_hooks_see_every_attempt():
+    genius = make_genius(ScriptedSession([FakeResponse(status_code=502),
+                                          FakeResponse({'response': {}})]))
+    started, ended = [], []
+    genius.on_request_start.append(started.append)
+    genius.on_request_end.append(ended.append)
+
+    genius.request('artists/1')
+    assert [e['attempt'] for e in started] == [0, 1]
+    assert [e['status'] for e in ended] == [502, 200]
+    assert ended[0]['error'] is not None and ended[1]['error'] is None
+
+
+def test_counts_by_endpoint_and_status():
+    payload = {'response': {'artist': {'id': 1}}}
+    genius = make_genius(ScriptedSession([FakeResponse(status_code=429), FakeResponse(payload),
+                                          FakeResponse(status_code=404)]))
+    genius.request('artists/1')
+    genius.request('artists/2')
+
+    summary = genius.metrics.summary(wall_seconds=1.0)
+    assert summary['requests'] == 3 and summary['retries'] == 1
+    assert summary['endpoints']['artists']['status_counts'] == {'200': 1, '404': 1, '429': 1}
+    assert summary['bytes_received'] > 0
+    assert genius.metrics.in_flight == 0
+
+
+def test_merged_snapshots_render_as_prometheus():
+    totals = RequestMetrics()
+    for _ in range(2):
+        worker = RequestMetrics()
+        worker.request_started({'endpoint': 'search'})
+        worker.request_finished({'endpoint': 'search', 'status': 200, 'seconds': 0.02})
+        totals.merge(worker.drain())
+
+    text = totals.to_prometheus()
+    assert 'genius_requests_total{endpoint="search",status="200"} 2' in text
+    assert 'genius_request_duration_seconds_bucket{endpoint="search",le="+Inf"} 2' in text
+
+
+
+def test_429_backoff_is_throttle_and_5xx_backoff_is_failure():
+    metrics = RequestMetrics()
+    metrics.retry_scheduled('search', 6.0, throttled=True)
+    assert metrics.bottleneck(wall_seconds=10.0, workers=1) == 'throttle'
+
+    metrics = RequestMetrics()
+    metrics.retry_scheduled('search', 6.0)
+    assert metrics.seconds['throttle_backoff'] == 0.0
+    assert metrics.bottleneck(wall_seconds=10.0, workers=1) == 'failure'
+
+
+def test_retry_after_sleep_counts_as_throttle():
+    genius = make_genius(ScriptedSession([
+        FakeResponse(status_code=429, headers={'Retry-After': '0.05'}),
+        FakeResponse(status_code=503), FakeResponse({'response': {}})]))
+    genius.request('artists/1')
+    assert genius.metrics.retries == 2
+    assert genius.metrics.seconds['throttle_backoff'] == 0.05
+    assert 0.0 < genius.metrics.seconds['retry_backoff'] < 0.05
+
+
+def test_p95_past_the_last_bucket_prints_as_a_lower_bound(capsys):
+    metrics = RequestMetrics(buckets=(0.01, 0.1))
+    metrics.request_started({'endpoint': 'search'})
+    metrics.request_finished({'endpoint': 'search', 'status': 200, 'seconds': 2.0})
+    summary = metrics.summary(wall_seconds=1.0)
+    assert summary['endpoints']['search']['p95_ms_le'] is None
+    assert summary['last_bucket_ms'] == 100.0
+
+    print_summary(summary)
+    assert 'p95 > 100.0 ms' in capsys.readouterr().out
@@ -0,0 +1,69 @@
+# Offline tests for the staged concurrent pipeline engine
+import threading
+import time
+
+from genius_pipeline import Pipeline, Stage, parse_lyrics
+
+
+def test_items_flow_through_every_stage():
+    pipeline = Pipeline([
+        Stage('double', lambda n: n * 2, workers=3),
+        Stage('split', lambda n: [n, n + 1], workers=2, fan_out=True),
+        Stage('odd', lambda n: n if n % 2 else None, workers=2),
+    ])
+    assert sorted(pipeline.run(range(10))) == [n * 2 + 1 for n in range(10)]
+    stats = {s['stage']: s for s in pipeline.stats()}
+    assert stats['split']['out'] == 20 and stats['odd']['dropped'] == 10
+
+
+def test_errors_are_counted_and_skipped():
+    def fragile(n):
+        if n == 3:
+            raise ValueError("bad item")
+        return n
+
+    pipeline = Pipeline([Stage('fragile', fragile, workers=2)])
+    assert sorted(pipeline.run(range(5))) == [0, 1, 2, 4]
+    assert pipeline.stats()[0]['errors'] == 1
+
+
+def test_stages_overlap_so_time_follows_the_slowest_stage():
+    def slow(seconds):
+        return lambda n: time.sleep(seconds) or n
+
+    pipeline = Pipeline([Stage('a', slow(0.02), workers=2), Stage('b', slow(0.02), workers=2),
+                         Stage('c', slow(0.02), workers=2)])
+    start = time.perf_counter()
+    assert len(list(pipeline.run(range(20)))) == 20
+    # Serially this is 20 * 3 * 0.02 / 2 = 0.6s; overlapped it is about a third
+    assert time.perf_counter() - start < 0.45
+
+
+def test_full_queues_hold_back_the_producer():
+    fed = []
+    release = threading.Event()
+
+    def source():
+        for n in range(100):
+            fed.append(n)
+            yield n
+
+    pipeline = Pipeline([Stage('wait', lambda n: release.wait() and n, workers=1)],
+                        queue_size=4)
+    run = pipeline.run(source())
+    waiter = threading.Thread(target=lambda: list(run))
+    waiter.start()
+    time.sleep(0.3)
+    # one item in the worker, four queued, one blocked in the feeder
+    assert len(fed) <= 6
+    release.set()
+    waiter.join()
+    assert len(fed) == 100
+
+
+def test_process_stage_parses_lyrics():
+    html = '<div data-lyrics-container="true">Hello<br/>world</div>'
+    pipeline = Pipeline([Stage('parse', parse_lyrics, workers=1, processes=True)])
+    [song] = list(pipeline.run([{'title': 'Hi', 'html': html}]))
+    assert song == {'title': 'Hi', 'lyrics': 'Hello\nworld'}
+
@@ -0,0 +1,131 @@
+# Offline tests for the shared SQLite work queue used by distributed collection
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from collect_artist_data_multiprocessing import queue_worker_loop
+from genius_queue import WorkQueue
+from genius_records import ArtistRecord
+
+
+def make_queue(**kwargs):
+    return WorkQueue(os.path.join(tempfile.mkdtemp(), 'queue.sqlite'), **kwargs)
+
+
+def test_claims_do_not_overlap_and_complete_finishes():
+    queue = make_queue()
+    assert queue.enqueue(['Drake', 'Seal', 'drake ', 'Adele']) == 3
+
+    first = queue.claim('a', 2)
+    second = queue.claim('b', 2)
+    assert first == ['Drake', 'Seal'] and second == ['Adele']
+    assert queue.claim('c', 2) == []
+
+    queue.complete('a', [ArtistRecord('Drake', 'Drake', 1, 10), ArtistRecord('Seal')])
+    queue.complete('b', [ArtistRecord('Adele', 'Adele', 3, 30)])
+    assert queue.finished()
+    assert queue.counts()['done'] == 3
+
+
+def test_expired_lease_is_reclaimed_then_failed():
+    queue = make_queue(lease_seconds=0.05, max_attempts=2)
+    queue.enqueue(['Seal'])
+    assert queue.claim('a', 1) == ['Seal']
+    time.sleep(0.1)
+    assert queue.counts()['expired'] == 1
+    assert queue.claim('b', 1) == ['Seal']
+    time.sleep(0.1)
+    # Two claims used up the attempts, so the term is given up on
+    assert queue.claim('c', 1) == []
+    assert queue.finished() and queue.counts()['failed'] == 1
+
+
+def test_late_completion_does_not_overwrite_a_finished_term():
+    queue = make_queue(lease_seconds=0.05)
+    queue.enqueue(['Seal'])
+    queue.claim('slow', 1)
+    time.sleep(0.1)
+    queue.claim('fast', 1)
+    assert queue.complete('fast', [ArtistRecord('Seal', 'Seal', 7, 250)]) == 1
+    assert queue.complete('slow', [ArtistRecord('Seal')]) == 0
+    assert queue.results()['seal']['artist_id'] == 7
+
+
+def test_results_follow_input_order_and_survive_pickling():
+    queue = make_queue(max_attempts=1)
+    queue.enqueue(['Seal', 'zz'])
+    queue = pickle.loads(pickle.dumps(queue))
+    queue.claim('a', 2)
+    queue.complete('a', [ArtistRecord('Seal', 'Seal', 7, 250)])
+    queue.release('a', ['zz'])
+    queue.claim('a', 2)
+
+    rows = list(queue.iter_results(['zz', 'SEAL', 'Seal']))
+    assert [row['search_term'] for row in rows] == ['zz', 'SEAL', 'Seal']
+    assert rows[0]['artist_name'] == 'N/A' and rows[1]['artist_id'] == 7
+
+
+def test_results_stream_page_by_page_and_repeat_duplicates(monkeypatch):
+    queue = make_queue()
+    terms = ['Seal', 'U2', 'seal', 'Adele', 'Drake', 'Sia', 'u2 ']
+    queue.enqueue(terms)
+    claimed = queue.claim('a', 10)
+    queue.complete('a', [ArtistRecord(term, term, n, 10) for n, term in enumerate(claimed)])
+
+    pages = []
+    finished, connection = queue._finished, queue._connection
+    monkeypatch.setattr(queue, '_finished', lambda: finished(page_size=2))
+    monkeypatch.setattr(queue, '_connection', lambda: pages.append(1) or connection())
+    stream = queue.iter_results(terms)
+    first = next(stream)
+    # The first row comes out after reading one page, not the whole queue
+    assert first['artist_id'] == 0 and len(pages) == 1
+
+    rows = [first] + list(stream)
+    assert len(pages) == 3
+    assert [row['search_term'] for row in rows] == terms
+    assert [row['artist_id'] for row in rows] == [0, 1, 0, 2, 3, 4, 1]
+
+
+class SlowGenius:
+    """Takes `seconds` per artist; the terms in `down` fail until `down` is cleared."""
+
+    def __init__(self, seconds=0.0, down=()):
+        self.seconds = seconds
+        self.down = set(down)
+        self.looked_up = []
+
+    def iter_artists(self, search_terms):
+        for term in search_terms:
+            time.sleep(self.seconds)
+            self.looked_up.append(term)
+            if term in self.down:
+                yield ArtistRecord(term, error=True)
+            else:
+                yield ArtistRecord(term, term, 1, 10)
+
+
+def test_worker_keeps_its_lease_while_a_long_batch_runs():
+    queue = make_queue(lease_seconds=0.1)
+    queue.enqueue(['Seal', 'U2', 'Adele'])
+    genius = SlowGenius(seconds=0.1)
+    worker = threading.Thread(target=queue_worker_loop, args=(queue, 3, genius))
+    worker.start()
+    time.sleep(0.2)
+    # The batch has run past its first lease, yet nobody else can claim it
+    assert queue.claim('other', 3) == []
+    worker.join()
+    assert queue.counts()['done'] == 3 and genius.looked_up == ['Seal', 'U2', 'Adele']
+
+
+def test_failed_lookups_go_back_to_the_queue():
+    queue = make_queue(max_attempts=2)
+    queue.enqueue(['Seal', 'U2'])
+    genius = SlowGenius(down={'U2'})
+    assert queue_worker_loop(queue, 2, genius, poll_interval=0) == 1
+    assert genius.looked_up == ['Seal', 'U2', 'U2']
+
+    rows = list(queue.iter_results(['Seal', 'U2']))
+    assert rows[0]['artist_id'] == 1 and rows[1]['error']
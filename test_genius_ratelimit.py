@@ -0,0 +1,29 @@
+# Offline tests for the token-bucket rate limiters
+import os
+import tempfile
+import time
+
+from genius_ratelimit import FileTokenBucket, TokenBucket
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        assert bucket.acquire() == 0
+    for _ in range(10):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    # 10 requests beyond the burst at 50/s should take about 0.2 seconds
+    assert 0.15 <= elapsed < 0.5
+
+
+def test_file_bucket_is_shared_between_instances():
+    path = os.path.join(tempfile.mkdtemp(), 'shared.bucket')
+    first = FileTokenBucket(path, rate=20, burst=1)
+    second = FileTokenBucket(path, rate=20, burst=1)
+
+    assert first.acquire() == 0
+    # The second instance sees the token the first one spent
+    assert second.acquire() > 0
+
@@ -0,0 +1,51 @@
+# Offline tests for the compact ArtistRecord / ArtistBatch row types
+import os
+import pickle
+import tempfile
+
+from genius_records import ArtistBatch, ArtistRecord
+
+
+def test_record_behaves_like_a_row_dict():
+    record = ArtistRecord.from_response('seal', {'response': {'artist': {
+        'id': 7, 'name': 'Seal', 'followers_count': 250}}})
+    assert record['artist_name'] == 'Seal' and record.get('nope', 'x') == 'x'
+    assert dict(record, search_term='Seal')['search_term'] == 'Seal'
+    assert record == {'search_term': 'seal', 'artist_name': 'Seal', 'artist_id': 7,
+                      'followers_count': 250}
+    assert not ArtistRecord.from_response('nobody', {}).found
+
+
+def test_error_flag_survives_batches_and_pickling():
+    failed = ArtistRecord.from_response('zz', {})
+    missing = ArtistRecord.from_response('nobody', {'response': {}})
+    assert failed.error and not missing.error and 'error' not in dict(failed)
+    batch = pickle.loads(pickle.dumps(ArtistBatch([failed, missing])))
+    assert [record.error for record in batch] == [True, False]
+    assert pickle.loads(pickle.dumps(failed.with_term('ZZ'))).error
+
+
+def test_batch_round_trips_through_pickle_and_csv():
+    batch = ArtistBatch([ArtistRecord('Seal', 'Seal', 7, 250), ArtistRecord('zz')])
+    clone = pickle.loads(pickle.dumps(batch))
+    assert list(clone) == list(batch) and len(clone) == 2
+
+    path = os.path.join(tempfile.mkdtemp(), 'artists.csv')
+    batch.to_csv(path)
+    with open(path, encoding='utf-8') as file:
+        assert file.read().splitlines() == [
+            'search_term,artist_name,artist_id,followers_count', 'Seal,Seal,7,250',
+            'zz,N/A,N/A,N/A']
+
+
+def test_batch_pickles_smaller_than_dicts():
+    records = [ArtistRecord(f"Artist {i}", f"Name {i}", i, i % 100) for i in range(1000)]
+    as_dicts = pickle.dumps([r.to_dict() for r in records])
+    assert len(pickle.dumps(ArtistBatch(records))) < len(as_dicts)
+
+
+def test_batch_to_frame_keeps_column_order():
+    frame = ArtistBatch([ArtistRecord('Seal', 'Seal', 7, 250)]).to_frame()
+    assert list(frame.columns) == ['search_term', 'artist_name', 'artist_id', 'followers_count']
+    assert frame.loc[0, 'artist_id'] == 7
+
@@ -0,0 +1,49 @@
+# Offline tests for retry/backoff and the circuit breaker in Genius.request
+import pytest
+
+from genius_fakes import FakeResponse, ScriptedSession, make_genius
+from genius_retry import CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+
+
+def scripted(*statuses, **kwargs):
+    """A client whose session answers with `statuses` in order."""
+    return make_genius(ScriptedSession(FakeResponse(status_code=status) for status in statuses),
+                       **kwargs)
+
+
+def test_transient_errors_are_retried():
+    genius = make_genius(ScriptedSession([
+        FakeResponse(status_code=502),
+        FakeResponse(status_code=429, headers={'Retry-After': '0'}),
+        FakeResponse({'response': {'ok': True}})]))
+    assert genius.request('artists/1') == {'response': {'ok': True}}
+    assert len(genius.session.calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    genius = scripted(404)
+    assert genius.request('artists/1') == {}
+    assert len(genius.session.calls) == 1
+
+
+def test_retry_budget_is_shared():
+    genius = scripted(503, 503, 503, retry=RetryPolicy(5, backoff_base=0.001, budget=1))
+    assert genius.request('artists/1') == {}
+    assert len(genius.session.calls) == 2
+
+
+def test_breaker_fails_fast_when_upstream_is_down():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    genius = scripted(500, 500, retry=RetryPolicy(0), breaker=breaker)
+    genius.request('artists/1')
+    genius.request('artists/2')
+    with pytest.raises(CircuitOpenError):
+        genius.request('artists/3')
+    assert len(genius.session.calls) == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after(None) is None
+
@@ -0,0 +1,58 @@
+# Offline tests for the typed Parquet/Feather output sinks
+import os
+import tempfile
+
+import pytest
+
+from genius_sinks import PYARROW_AVAILABLE, load_artists, open_sink, read_artist_table, typed_row
+
+pytestmark = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+
+
+ROWS = [
+    {'search_term': 'Seal', 'artist_name': 'Seal', 'artist_id': 1, 'followers_count': 250},
+    {'search_term': 'Nobody', 'artist_name': 'N/A', 'artist_id': 'N/A', 'followers_count': 'N/A'},
+    {'search_term': 'U2', 'artist_name': 'U2', 'artist_id': 2, 'followers_count': 9000},
+]
+
+
+def test_typed_row_replaces_placeholders_with_status():
+    assert typed_row(ROWS[0])['status'] == 'ok'
+    missing = typed_row(ROWS[1])
+    assert missing['artist_id'] is None and missing['status'] == 'not_found'
+
+
+def test_typed_round_trip():
+    for fmt in ('parquet', 'feather'):
+        path = os.path.join(tempfile.mkdtemp(), f'artists.{fmt}')
+        # Row groups of two force a second write with the same schema
+        with open_sink(path, row_group_size=2) as sink:
+            sink.write_many(ROWS)
+
+        df = load_artists(path)
+        assert str(df['artist_id'].dtype) == 'Int64'
+        assert str(df['followers_count'].dtype) == 'Int64'
+        assert df['artist_id'].isna().tolist() == [False, True, False]
+        assert df['status'].astype(str).tolist() == ['ok', 'not_found', 'ok']
+
+
+def test_feather_is_uncompressed_and_read_zero_copy():
+    import pyarrow as pa
+
+    path = os.path.join(tempfile.mkdtemp(), 'artists.feather')
+    with open_sink(path) as sink:
+        sink.write_many(ROWS * 1000)
+
+    before = pa.total_allocated_bytes()
+    table = read_artist_table(path)
+    # The columns point into the memory map instead of freshly allocated memory
+    assert pa.total_allocated_bytes() - before < 1000
+    assert table.column('search_term')[2].as_py() == 'U2' and table.num_rows == 3000
+
+
+def test_empty_typed_file_is_readable():
+    path = os.path.join(tempfile.mkdtemp(), 'artists.parquet')
+    with open_sink(path):
+        pass
+    assert len(load_artists(path)) == 0
+
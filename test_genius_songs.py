@@ -0,0 +1,50 @@
+# Offline tests for paging through an artist's songs with get_artist_songs
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_retry import RetryPolicy
+
+
+class CatalogSession(FakeSession):
+    """Serves `total` songs for every artist, `per_page` at a time."""
+
+    def __init__(self, total, fail_page=None):
+        super().__init__()
+        self.total = total
+        self.fail_page = fail_page
+
+    @property
+    def pages(self):
+        with self._lock:
+            return [params['page'] for _, params, _ in self.calls]
+
+    def respond(self, url, params, headers):
+        page, per_page = params['page'], params['per_page']
+        if page == self.fail_page:
+            raise ConnectionError("boom")
+        first = (page - 1) * per_page
+        songs = [{'id': i} for i in range(first, min(first + per_page, self.total))]
+        next_page = page + 1 if first + per_page < self.total else None
+        return FakeResponse({'response': {'songs': songs, 'next_page': next_page}})
+
+
+def test_songs_stream_in_order_across_prefetched_pages():
+    session = CatalogSession(total=230)
+    genius = make_genius(session, retry=RetryPolicy(0))
+    songs = list(genius.get_artist_songs(1, per_page=20, prefetch=4))
+    assert [song['id'] for song in songs] == list(range(230))
+    # 12 real pages, plus at most `prefetch` speculative ones past the end
+    assert set(range(1, 13)) <= set(session.pages) and max(session.pages) <= 16
+
+
+def test_single_page_catalog_does_not_prefetch():
+    session = CatalogSession(total=5)
+    genius = make_genius(session, retry=RetryPolicy(0))
+    assert len(list(genius.get_artist_songs(1))) == 5
+    assert session.pages == [1]
+
+
+def test_failed_page_stops_the_stream():
+    session = CatalogSession(total=100, fail_page=3)
+    genius = make_genius(session, retry=RetryPolicy(0))
+    songs = list(genius.get_artist_songs(1, per_page=20, prefetch=2))
+    assert [song['id'] for song in songs] == list(range(40))
+
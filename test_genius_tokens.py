@@ -0,0 +1,80 @@
+# Offline tests for spreading requests over several access tokens
+from genius_fakes import FakeResponse, FakeSession, make_genius
+from genius_retry import RetryPolicy
+from genius_tokens import NoUsableTokenError, TokenPool, load_tokens
+
+
+class TokenSession(FakeSession):
+    """Answers each token with the status in `statuses` (default 200)."""
+
+    def __init__(self, statuses=None):
+        super().__init__()
+        self.statuses = statuses or {}
+
+    @property
+    def seen(self):
+        """Tokens in the order they were sent."""
+        with self._lock:
+            return [headers['Authorization'].split()[-1] for _, _, headers in self.calls]
+
+    def respond(self, url, params, headers):
+        token = headers['Authorization'].split()[-1]
+        status = self.statuses.get(token, 200)
+        return FakeResponse({'response': {'token': token}}, status,
+                            {'Retry-After': '30'} if status == 429 else None)
+
+
+def pooled_genius(session, tokens):
+    return make_genius(session, tokens=TokenPool(tokens, rate=1000, burst=100),
+                       retry=RetryPolicy(0))
+
+
+def test_load_tokens_orders_numbered_keys():
+    env = {'ACCESS_TOKEN_10': 'j', 'ACCESS_TOKEN_2': 'b', 'OTHER': 'x',
+           'ACCESS_TOKEN': 'a', 'ACCESS_TOKEN_1': 'a', 'ACCESS_TOKEN_3': ''}
+    assert load_tokens(env) == ['a', 'b', 'j']
+
+
+def test_requests_rotate_over_tokens():
+    session = TokenSession()
+    genius = pooled_genius(session, ['t1', 't2', 't3'])
+    for n in range(6):
+        genius.request(f"artists/{n}")
+    assert session.seen == ['t1', 't2', 't3'] * 2
+    assert [s['requests'] for s in genius.tokens.stats()] == [2, 2, 2]
+
+
+def test_throttled_token_rests_and_request_moves_on():
+    session = TokenSession({'t1': 429})
+    genius = pooled_genius(session, ['t1', 't2'])
+    assert genius.request("artists/1") == {'response': {'token': 't2'}}
+    assert genius.request("artists/2") == {'response': {'token': 't2'}}
+    # t1 rests for its Retry-After, so it was asked only once
+    assert session.seen == ['t1', 't2', 't2']
+    assert [s['state'] for s in genius.tokens.stats()] == ['resting', 'active']
+
+
+def test_all_tokens_rejected_raises():
+    session = TokenSession({'t1': 401, 't2': 401})
+    genius = pooled_genius(session, ['t1', 't2'])
+    assert genius.request("artists/1") == {}
+    try:
+        genius.request("artists/2")
+    except NoUsableTokenError:
+        pass
+    else:
+        raise AssertionError("expected NoUsableTokenError")
+    assert session.seen == ['t1', 't2']
+
+
+
+def test_moving_to_another_token_does_not_spend_retries():
+    session = TokenSession({'t1': 429, 't2': 429, 't3': 503})
+    genius = make_genius(session, tokens=TokenPool(['t1', 't2', 't3'], rate=1000, burst=100),
+                         retry=RetryPolicy(1, backoff_base=0.001))
+    # t3 recovers after its first 503
+    genius.on_request_end.append(
+        lambda event: event['status'] == 503 and session.statuses.pop('t3'))
+    assert genius.request("artists/1") == {'response': {'token': 't3'}}
+    # Two failovers, then the one retry the policy allows
+    assert session.seen == ['t1', 't2', 't3', 't3']